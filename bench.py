@@ -0,0 +1,511 @@
+import argparse
+import contextlib
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import insert
+
+import db_connection
+from database import Database, FollowerFollowing
+from db_tools import hot_queries
+from fake_webdriver import FakeWebDriver
+from store_followers import _latency_summary, _persist_orm, _persist_sql, store_followers
+
+
+DIFF_ENGINES = {"orm": _persist_orm, "sql": _persist_sql}
+SCRAPE_COLLECTORS = ["script", "observer", "network", "dom"]
+
+
+def _seed_followers(db: Database, target_id: int, size: int, seen_at: datetime, batch_size: int = 50000):
+    rows = []
+    conn = db.session.connection()
+    for i in range(size):
+        rows.append({
+            "target_id": target_id,
+            "follower_following_username": f"user{i}",
+            "is_follower": True,
+            "added_at": seen_at,
+            "first_seen_run_at": seen_at,
+            "last_seen_run_at": seen_at,
+            "is_lost": False,
+        })
+        if len(rows) >= batch_size:
+            conn.execute(insert(FollowerFollowing.__table__), rows)
+            rows = []
+    if rows:
+        conn.execute(insert(FollowerFollowing.__table__), rows)
+    db.session.commit()
+
+
+def bench_diff(sizes, engines, churn: float, workdir: Path, trace_memory: bool) -> list:
+    """
+    Times one membership diff per (size, engine) on a fresh DB seeded with `size`
+    active followers, where the scrape drops and adds `churn` of the list.
+    """
+    results = []
+    prev_run = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    run_started_at = prev_run + timedelta(hours=1)
+    for size in sizes:
+        changed = max(1, int(size * churn))
+        current_items = {f"user{i}" for i in range(changed, size)}
+        current_items.update(f"new{i}" for i in range(changed))
+        for engine in engines:
+            db_path = workdir / f"bench_diff_{engine}_{size}.db"
+            if db_path.exists():
+                db_path.unlink()
+            db = Database(str(db_path))
+            try:
+                target = db.get_or_create_target("bench_target")
+                _seed_followers(db, target.id, size, prev_run)
+                if trace_memory:
+                    tracemalloc.start()
+                started = time.perf_counter()
+                diff = db.write(lambda: DIFF_ENGINES[engine](
+                    db,
+                    target_id=target.id,
+                    list_type="followers",
+                    current_items=current_items,
+                    run_started_at=run_started_at,
+                    prev_run_started_at=prev_run,
+                    expected_total=len(current_items),
+                    now_utc=run_started_at,
+                ))
+                elapsed = time.perf_counter() - started
+                peak = None
+                if trace_memory:
+                    peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+            finally:
+                db.close()
+                db.engine.dispose()
+            results.append({
+                "size": size,
+                "engine": engine,
+                "seconds": elapsed,
+                "peak_bytes": peak,
+                **diff,
+            })
+            db_path.unlink(missing_ok=True)
+    return results
+
+
+def bench_scrape(sizes, collectors, engines, churn: float, page_size: int, window: int, latency_ms: float,
+                 workdir: Path) -> list:
+    """
+    Runs store_followers() end to end over FakeWebDriver: N rows revealed page by
+    page as the modal scrolls, against a DB seeded with the previous scrape. Pacing
+    waits are zeroed, so the timings are the Python side (harvest, dedupe, diff)
+    plus `latency_ms` per WebDriver command. `diff_op` is the persist call alone;
+    the ORM engine flushes at commit, so its writes land in `other` with harvesting.
+    """
+    results = []
+    prev_run = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    run_started_at = prev_run + timedelta(hours=1)
+    overrides = {
+        "SCRAPE_PACING": "adaptive",
+        "SCRAPE_POLL_INTERVAL_SECONDS": "0",
+        "SCRAPE_BACKOFF_BASE_SECONDS": "0",
+        "SCRAPE_BACKOFF_MAX_SECONDS": "0",
+        "SCRAPE_EARLY_EXIT": "true",
+    }
+    previous_env = {key: os.environ.get(key) for key in [*overrides, "SCRAPE_COLLECTOR", "SCRAPE_DIFF_ENGINE",
+                                                            "SCRAPE_MAX_ITERATIONS"]}
+    os.environ.update(overrides)
+    try:
+        for size in sizes:
+            changed = max(1, int(size * churn))
+            usernames = [f"user{i}" for i in range(changed, size)] + [f"new{i}" for i in range(changed)]
+            os.environ["SCRAPE_MAX_ITERATIONS"] = str(size // max(page_size, 1) + 50)
+            for collector in collectors:
+                for engine in engines:
+                    os.environ["SCRAPE_COLLECTOR"] = collector
+                    os.environ["SCRAPE_DIFF_ENGINE"] = engine
+                    db_path = workdir / f"bench_scrape_{collector}_{engine}_{size}.db"
+                    db_path.unlink(missing_ok=True)
+                    db = Database(str(db_path))
+                    try:
+                        target = db.get_or_create_target("bench_target")
+                        _seed_followers(db, target.id, size, prev_run)
+                        driver = FakeWebDriver(usernames, page_size=page_size, window=window, latency_ms=latency_ms)
+                        stats = {}
+                        started = time.perf_counter()
+                        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                            collected = store_followers(
+                                driver,
+                                db=db,
+                                target=target,
+                                list_type="followers",
+                                run_started_at=run_started_at,
+                                prev_run_started_at=prev_run,
+                                expected_total=len(usernames),
+                                stats=stats,
+                            )
+                        elapsed = time.perf_counter() - started
+                    finally:
+                        db.close()
+                        db.engine.dispose()
+                    diff = stats.get("diff") or {}
+                    diff_seconds = float(diff.get("seconds") or 0.0)
+                    results.append({
+                        "size": size,
+                        "collector": stats.get("collector", collector),
+                        "engine": engine,
+                        "seconds": elapsed,
+                        "other_seconds": elapsed - diff_seconds,
+                        "diff_op_seconds": diff_seconds,
+                        "collected": len(collected),
+                        "iterations": stats.get("iterations"),
+                        "webdriver_calls": stats.get("webdriver_calls"),
+                        "new": diff.get("new"),
+                        "lost": diff.get("lost"),
+                    })
+                    db_path.unlink(missing_ok=True)
+    finally:
+        for key, value in previous_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    return results
+
+
+def _concurrency_reader(db_path: str, deadline: float, reader_timeout: float, results):
+    """Reader process: replays the dashboard hot queries on fresh read-only connections until `deadline`."""
+    samples = []
+    errors = 0
+    first_error = None
+    queries = hot_queries()
+    idx = 0
+    while time.time() < deadline:
+        _caller, _index, sql, params = queries[idx % len(queries)]
+        idx += 1
+        started = time.perf_counter()
+        try:
+            conn = db_connection.connect(db_path, readonly=True, timeout=reader_timeout)
+            try:
+                conn.execute(sql, params).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.OperationalError as exc:
+            errors += 1
+            first_error = first_error or str(exc)
+            continue
+        samples.append(time.perf_counter() - started)
+    results.put((samples, errors, first_error))
+
+
+def bench_concurrency(size: int, readers: int, seconds: float, journal_modes, reader_timeout: float,
+                      workdir: Path) -> list:
+    """
+    Runs the tracker's diff/commit loop while `readers` separate processes replay the
+    dashboard hot queries (db_tools.hot_queries()) on fresh read-only connections, the
+    way web_app/gui_app/tray_app open them. Counts reader lock errors and latency.
+    """
+    results = []
+    for journal_mode in journal_modes:
+        previous_mode = os.environ.get("SQLITE_JOURNAL_MODE")
+        os.environ["SQLITE_JOURNAL_MODE"] = journal_mode
+        db_path = workdir / f"bench_concurrency_{journal_mode.lower()}.db"
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+        # Seed just before the hot_queries() ranges so readers only pick up the writer's churn.
+        seen_at = datetime(2025, 12, 31, 22, tzinfo=timezone.utc)
+        db = Database(str(db_path))
+        try:
+            target_id = db.get_or_create_target("bench_target").id
+            _seed_followers(db, target_id, size, seen_at)
+            changed = max(1, size // 100)
+            snapshots = [
+                {f"user{i}" for i in range(size)},
+                {f"user{i}" for i in range(changed, size)} | {f"new{i}" for i in range(changed)},
+            ]
+
+            queue = multiprocessing.Queue()
+            deadline = time.time() + seconds
+            processes = [
+                multiprocessing.Process(
+                    target=_concurrency_reader, args=(str(db_path), deadline, reader_timeout, queue)
+                )
+                for _ in range(readers)
+            ]
+            for process in processes:
+                process.start()
+
+            commits = []
+            run_started_at = seen_at
+            while time.time() < deadline:
+                prev_run = run_started_at
+                run_started_at = run_started_at + timedelta(hours=1)
+                started = time.perf_counter()
+                db.write(lambda: _persist_sql(
+                    db,
+                    target_id=target_id,
+                    list_type="followers",
+                    current_items=snapshots[len(commits) % 2],
+                    run_started_at=run_started_at,
+                    prev_run_started_at=prev_run,
+                    expected_total=size,
+                    now_utc=run_started_at,
+                ))
+                commits.append(time.perf_counter() - started)
+
+            reader_samples = []
+            reader_errors = 0
+            first_error = None
+            for _ in processes:
+                samples, errors, error = queue.get()
+                reader_samples.extend(samples)
+                reader_errors += errors
+                first_error = first_error or error
+            for process in processes:
+                process.join()
+        finally:
+            db.close()
+            db.engine.dispose()
+            if previous_mode is None:
+                os.environ.pop("SQLITE_JOURNAL_MODE", None)
+            else:
+                os.environ["SQLITE_JOURNAL_MODE"] = previous_mode
+        results.append({
+            "journal_mode": journal_mode,
+            "writer": _latency_summary(commits),
+            "readers": _latency_summary(reader_samples),
+            "reader_errors": reader_errors,
+            "first_error": first_error,
+        })
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+    return results
+
+
+def _start_standin(followers: int, followings: int, page_size: int, latency_ms: int, window: int, port: int):
+    import uvicorn
+    from standin_server import create_app
+
+    server = uvicorn.Server(uvicorn.Config(
+        create_app(followers, followings, page_size, latency_ms, window),
+        host="127.0.0.1", port=port, log_level="warning",
+    ))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.time() + 15
+    while not server.started:
+        if not thread.is_alive() or time.time() > deadline:
+            raise RuntimeError(f"Stand-in server did not start on port {port}")
+        time.sleep(0.05)
+    return server, thread
+
+
+def bench_e2e(sizes, followings: int, runs: int, page_size: int, latency_ms: int, window: int, port: int,
+              workdir: Path, targets: int = 1, pool_size: int = 1) -> list:
+    """
+    Full InstagramTracker.run() passes (login, profile, both modals, diff, commit)
+    against standin_server.py on 127.0.0.1, one stand-in per follower count.
+    Each run is a batch over `targets` profiles sharing one tracker, browser and DB
+    connection, as main() does in multi-target mode, or over a DriverPool of
+    `pool_size` browsers with one DB writer; throughput is reported in targets/hour.
+    Needs Chrome and ChromeDriver, but no network access. Each size gets its own
+    working directory, so DB, cookies and lock files never touch the real ones.
+    """
+    results = []
+    original_cwd = os.getcwd()
+    overrides = {
+        "IG_BASE_URL": f"http://127.0.0.1:{port}",
+        "IG_USERNAME": "bench_user",
+        "IG_PASSWORD": "bench_password",
+        "TARGET_ACCOUNT": "bench_target",
+    }
+    previous_env = {key: os.environ.get(key) for key in overrides}
+    os.environ.update(overrides)
+    try:
+        import main as tracker_main
+        from driver_pool import DriverPool
+
+        for size in sizes:
+            size_dir = workdir / f"e2e_{size}"
+            size_dir.mkdir(parents=True, exist_ok=True)
+            server, thread = _start_standin(size, followings, page_size, latency_ms, window, port)
+            os.chdir(size_dir)
+            try:
+                for run_index in range(runs):
+                    names = [f"bench_target{i}" for i in range(targets)] if targets > 1 else ["bench_target"]
+                    started = time.perf_counter()
+                    if pool_size > 1:
+                        pool = DriverPool(min(pool_size, targets), lambda db: tracker_main.InstagramTracker(db=db))
+                        try:
+                            batch = [result for _, result in pool.run_batch(names, keep_browsers=False)]
+                        finally:
+                            pool.close()
+                    else:
+                        tracker = tracker_main.InstagramTracker()
+                        batch = []
+                        for target_index, name in enumerate(names):
+                            tracker.target_account = name
+                            batch.append(tracker.run(keep_driver=target_index < targets - 1))
+                    seconds = time.perf_counter() - started
+                    failed = [r for r in batch if r.get("status") != "success"]
+                    results.append({
+                        "size": size,
+                        "run": run_index + 1,
+                        "targets": targets,
+                        "seconds": seconds,
+                        "targets_per_hour": targets * 3600 / max(seconds, 0.001),
+                        "status": "failed" if failed else "success",
+                        "error": failed[0].get("error") if failed else None,
+                        "followers": sum(r.get("followers_collected", 0) for r in batch),
+                        "followings": sum(r.get("followings_collected", 0) for r in batch),
+                        "webdriver_calls": sum(r.get("webdriver_calls") or 0 for r in batch),
+                        "time_to_first_scroll": batch[0].get("time_to_first_scroll"),
+                    })
+            finally:
+                os.chdir(original_cwd)
+                server.should_exit = True
+                thread.join(timeout=10)
+    finally:
+        for key, value in previous_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmarks for the Instagram tracker")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_diff = sub.add_parser("diff", help="Compare the ORM and set-based SQL membership diff engines")
+    p_diff.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000],
+                        help="Existing follower rows per benchmark (default: 10000 100000 1000000)")
+    p_diff.add_argument("--engines", nargs="+", choices=sorted(DIFF_ENGINES), default=["orm", "sql"])
+    p_diff.add_argument("--churn", type=float, default=0.01, help="Fraction of rows lost and gained (default 0.01)")
+    p_diff.add_argument("--workdir", help="Directory for scratch DB files (default: system temp dir)")
+    p_diff.add_argument("--trace-memory", action="store_true", help="Report peak Python allocations (slower)")
+
+    p_scrape = sub.add_parser("scrape", help="store_followers over an in-memory fake WebDriver (no browser)")
+    p_scrape.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000],
+                          help="Rows in the modal (default: 10000 100000)")
+    p_scrape.add_argument("--collectors", nargs="+", choices=SCRAPE_COLLECTORS, default=["script", "observer"])
+    p_scrape.add_argument("--engines", nargs="+", choices=sorted(DIFF_ENGINES), default=["sql"])
+    p_scrape.add_argument("--churn", type=float, default=0.01, help="Fraction of rows lost and gained (default 0.01)")
+    p_scrape.add_argument("--page-size", type=int, default=50, help="Rows revealed per scroll (default 50)")
+    p_scrape.add_argument("--window", type=int, default=100,
+                          help="Rows kept rendered, like the virtualized modal (default 100; 0 = all)")
+    p_scrape.add_argument("--latency-ms", type=float, default=0.0, help="Delay per WebDriver command (default 0)")
+    p_scrape.add_argument("--workdir", help="Directory for scratch DB files (default: system temp dir)")
+
+    p_conc = sub.add_parser("concurrency", help="Tracker writes vs. dashboard readers on one DB")
+    p_conc.add_argument("--size", type=int, default=50000, help="Existing follower rows (default 50000)")
+    p_conc.add_argument("--readers", type=int, default=4, help="Concurrent reader processes (default 4)")
+    p_conc.add_argument("--seconds", type=float, default=10.0, help="Duration per journal mode (default 10)")
+    p_conc.add_argument("--journal-modes", nargs="+", default=["WAL", "DELETE"],
+                        help="Journal modes to compare (default: WAL DELETE)")
+    p_conc.add_argument("--reader-timeout", type=float, default=2.0,
+                        help="Reader busy timeout in seconds, as web_app uses (default 2)")
+    p_conc.add_argument("--workdir", help="Directory for scratch DB files (default: system temp dir)")
+
+    p_e2e = sub.add_parser("e2e", help="Full tracker runs against the local Instagram stand-in (needs Chrome)")
+    p_e2e.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                       help="Follower counts to serve (default: 1000 10000 100000)")
+    p_e2e.add_argument("--followings", type=int, default=300, help="Followings to serve (default 300)")
+    p_e2e.add_argument("--runs", type=int, default=1, help="Tracker runs per size (default 1)")
+    p_e2e.add_argument("--targets", type=int, default=1,
+                       help="Profiles per run sharing one browser, as in multi-target mode (default 1)")
+    p_e2e.add_argument("--pool-size", type=int, default=1,
+                       help="Browsers scraping the targets concurrently via DriverPool (default 1 = sequential)")
+    p_e2e.add_argument("--page-size", type=int, default=12, help="Users per list page (default 12)")
+    p_e2e.add_argument("--latency-ms", type=int, default=0, help="Delay per list page response (default 0)")
+    p_e2e.add_argument("--window", type=int, default=0, help="Rows kept rendered in the modal (default 0 = all)")
+    p_e2e.add_argument("--port", type=int, default=8765)
+    p_e2e.add_argument("--workdir", help="Directory for per-size DB/cookie files (default: system temp dir)")
+
+    return parser
+
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+
+    if args.command == "diff":
+        with tempfile.TemporaryDirectory() as tmp:
+            workdir = Path(args.workdir) if args.workdir else Path(tmp)
+            workdir.mkdir(parents=True, exist_ok=True)
+            results = bench_diff(args.sizes, args.engines, args.churn, workdir, args.trace_memory)
+        print(f"{'size':>10} {'engine':>6} {'seconds':>9} {'new':>8} {'seen':>9} {'lost':>8} {'peak_mb':>9}")
+        for row in results:
+            peak = f"{row['peak_bytes'] / 1048576:.1f}" if row["peak_bytes"] is not None else "-"
+            print(
+                f"{row['size']:>10} {row['engine']:>6} {row['seconds']:>9.3f} "
+                f"{row['new']:>8} {row['seen']:>9} {row['lost']:>8} {peak:>9}"
+            )
+        return
+
+    if args.command == "scrape":
+        with tempfile.TemporaryDirectory() as tmp:
+            workdir = Path(args.workdir) if args.workdir else Path(tmp)
+            workdir.mkdir(parents=True, exist_ok=True)
+            results = bench_scrape(
+                args.sizes, args.collectors, args.engines, args.churn, args.page_size, args.window,
+                args.latency_ms, workdir,
+            )
+        print(f"{'size':>8} {'collector':>9} {'engine':>6} {'seconds':>9} {'other':>8} {'diff_op':>8} "
+              f"{'collected':>10} {'iters':>6} {'wd_calls':>9}")
+        for row in results:
+            print(
+                f"{row['size']:>8} {row['collector']:>9} {row['engine']:>6} {row['seconds']:>9.3f} "
+                f"{row['other_seconds']:>8.3f} {row['diff_op_seconds']:>8.3f} {row['collected']:>10} "
+                f"{row['iterations']:>6} {row['webdriver_calls']:>9}"
+            )
+        return
+
+    if args.command == "concurrency":
+        with tempfile.TemporaryDirectory() as tmp:
+            workdir = Path(args.workdir) if args.workdir else Path(tmp)
+            workdir.mkdir(parents=True, exist_ok=True)
+            results = bench_concurrency(
+                args.size, args.readers, args.seconds, [m.upper() for m in args.journal_modes],
+                args.reader_timeout, workdir,
+            )
+        print(f"{'journal':>8} {'commits':>8} {'commit_p95':>11} {'reads':>8} {'read_p50':>9} "
+              f"{'read_p95':>9} {'read_max':>9} {'locked':>7}")
+        for row in results:
+            writer, readers = row["writer"], row["readers"]
+            print(
+                f"{row['journal_mode']:>8} {writer['count']:>8} {writer['p95']:>11.3f} {readers['count']:>8} "
+                f"{readers['p50']:>9.3f} {readers['p95']:>9.3f} {readers['max']:>9.3f} {row['reader_errors']:>7}"
+            )
+            if row["first_error"]:
+                print(f"  first reader error ({row['journal_mode']}): {row['first_error']}")
+        return
+
+    if args.command == "e2e":
+        with tempfile.TemporaryDirectory() as tmp:
+            workdir = Path(args.workdir).resolve() if args.workdir else Path(tmp)
+            workdir.mkdir(parents=True, exist_ok=True)
+            results = bench_e2e(
+                args.sizes, args.followings, args.runs, args.page_size, args.latency_ms, args.window,
+                args.port, workdir, args.targets, args.pool_size,
+            )
+        print(f"{'size':>8} {'run':>4} {'targets':>8} {'status':>8} {'seconds':>9} {'tgt/hour':>9} "
+              f"{'followers':>10} {'followings':>11} {'wd_calls':>9} {'first_scroll':>13}")
+        for row in results:
+            first_scroll = row["time_to_first_scroll"]
+            print(
+                f"{row['size']:>8} {row['run']:>4} {row['targets']:>8} {row['status']:>8} {row['seconds']:>9.1f} "
+                f"{row['targets_per_hour']:>9.1f} {row['followers']:>10} {row['followings']:>11} {str(row['webdriver_calls']):>9} "
+                f"{str(first_scroll if first_scroll is not None else '-'):>13}"
+            )
+            if row["error"]:
+                print(f"  error (size {row['size']}, run {row['run']}): {row['error']}")
+        return
+
+
+if __name__ == "__main__":
+    main()
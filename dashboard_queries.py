@@ -0,0 +1,67 @@
+# SQL shared by the web dashboard, the GUI and `db_tools.py check-indexes`, so the
+# index check plans the exact text the callers run. Stdlib-only on purpose, like
+# db_connection: the GUI and tray builds import this without SQLAlchemy.
+#
+# Keyed by event: "new" filters on first_seen_run_at, "lost" on lost_at_run_at.
+# Every query takes (start, end, target, target, is_follower, is_follower); target ''
+# means all targets. The IN lists on target_id/is_follower keep the
+# (target_id, is_follower, <timestamp>) indexes usable.
+
+EVENT_COLUMNS = {"new": "first_seen_run_at", "lost": "lost_at_run_at"}
+
+_CHANGES_WHERE = """
+    WHERE ff.{ts} IS NOT NULL
+      AND ff.{ts} >= ?
+      AND ff.{ts} <= ?
+      AND ff.target_id IN (SELECT id FROM targets WHERE ? = '' OR username = ?)
+      AND ff.is_follower IN (?, ?)
+"""
+
+# web_app.api_overview: follower/following totals for the range
+CHANGE_TOTALS_SQL = {
+    event: f"""
+    SELECT
+      SUM(CASE WHEN ff.is_follower = 1 THEN 1 ELSE 0 END) AS followers,
+      SUM(CASE WHEN ff.is_follower = 0 THEN 1 ELSE 0 END) AS followings
+    FROM followers_followings ff
+    {_CHANGES_WHERE.format(ts=ts)}
+    """
+    for event, ts in EVENT_COLUMNS.items()
+}
+
+# web_app.api_daily: one (timestamp, is_follower) row per change, bucketed by day in Python
+CHANGE_TIMES_SQL = {
+    event: f"""
+    SELECT ff.{ts}, ff.is_follower
+    FROM followers_followings ff
+    {_CHANGES_WHERE.format(ts=ts)}
+    """
+    for event, ts in EVENT_COLUMNS.items()
+}
+
+# web_app.api_day: the day's changes with their target
+DAY_CHANGES_SQL = {
+    event: f"""
+    SELECT
+      t.username AS target_username,
+      ff.follower_following_username,
+      ff.is_follower,
+      ff.{ts} AS ts
+    FROM followers_followings ff
+    JOIN targets t ON t.id = ff.target_id
+    {_CHANGES_WHERE.format(ts=ts)}
+    ORDER BY ff.{ts} ASC, ff.follower_following_username ASC
+    """
+    for event, ts in EVENT_COLUMNS.items()
+}
+
+# gui_app._query_day_changes: the day's changes for one target (or all)
+DAY_CHANGE_ROWS_SQL = {
+    event: f"""
+    SELECT ff.follower_following_username, ff.is_follower, ff.{ts}
+    FROM followers_followings ff
+    {_CHANGES_WHERE.format(ts=ts)}
+    ORDER BY ff.{ts} ASC, ff.follower_following_username ASC
+    """
+    for event, ts in EVENT_COLUMNS.items()
+}
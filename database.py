@@ -1,8 +1,13 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Float, ForeignKey, Index, func, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from contextlib import contextmanager
 from datetime import datetime
 
+import db_connection
+
 Base = declarative_base()
 
 
@@ -21,12 +26,21 @@ class RunHistory(Base):
     target_id = Column(Integer, ForeignKey('targets.id'), nullable=False)
     run_started_at = Column(DateTime, nullable=False)
     run_finished_at = Column(DateTime)
-    status = Column(String, nullable=False, default="running")  # running|success|failed
+    status = Column(String, nullable=False, default="running")  # running|success|failed|resumable|interrupted
     followers_collected = Column(Integer, default=0)
     followings_collected = Column(Integer, default=0)
+    scrape_mode = Column(String)  # full|incremental|unchanged|partial|mixed (NULL on older runs, counted as full)
+    # Each list's own mode (full|incremental|unchanged|partial); the skip-unchanged cap is counted per list
+    followers_scrape_mode = Column(String)
+    followings_scrape_mode = Column(String)
+    scrape_seconds_saved = Column(Float)  # estimated scroll time incremental lists skipped
 
     target = relationship("Target")
 
+    __table_args__ = (
+        Index('ix_run_history_target_started', 'target_id', 'run_started_at'),
+    )
+
 
 class FollowerFollowing(Base):
     __tablename__ = 'followers_followings'
@@ -47,6 +61,20 @@ class FollowerFollowing(Base):
 
     target = relationship("Target", back_populates="followers_followings")
 
+    __table_args__ = (
+        Index(
+            'ux_followers_followings_key',
+            'target_id', 'is_follower', 'follower_following_username',
+            unique=True,
+        ),
+        # Time-range indexes for the new/lost queries in web_app, report and gui_app.
+        Index('ix_followers_followings_first_seen', 'target_id', 'is_follower', 'first_seen_run_at'),
+        Index('ix_followers_followings_lost_at', 'target_id', 'is_follower', 'lost_at_run_at'),
+    )
+
+
+FF_KEY_COLUMNS = ['target_id', 'is_follower', 'follower_following_username']
+
 
 class ChangeLog(Base):
     __tablename__ = 'change_logs'
@@ -67,18 +95,130 @@ class Counts(Base):
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
     run_id = Column(Integer, ForeignKey('run_history.id'))
 
+    __table_args__ = (
+        Index('ix_counts_target_type_timestamp', 'target_id', 'count_type', 'timestamp'),
+    )
+
+
+class ScrapeCheckpoint(Base):
+    """Usernames harvested so far by an unfinished run, so a restarted run can resume the scroll."""
+    __tablename__ = 'scrape_checkpoints'
+
+    run_id = Column(Integer, ForeignKey('run_history.id'), primary_key=True)
+    list_type = Column(String, primary_key=True)  # 'followers', 'followings'
+    username = Column(String, primary_key=True)
+    checkpointed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class ScrapeCheckpointCursor(Base):
+    """List API cursor (next_max_id) past the last checkpointed page, so a resumed run can fetch the rest directly."""
+    __tablename__ = 'scrape_checkpoint_cursors'
+
+    run_id = Column(Integer, ForeignKey('run_history.id'), primary_key=True)
+    list_type = Column(String, primary_key=True)
+    cursor = Column(String, nullable=False)
+    checkpointed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class RunPhase(Base):
+    """Timing of one phase of a tracker run (setup_driver, login, navigate_to_profile, followers, followings, db_write)."""
+    __tablename__ = 'run_phases'
+
+    id = Column(Integer, primary_key=True)
+    run_id = Column(Integer, ForeignKey('run_history.id'), nullable=False)
+    phase = Column(String, nullable=False)
+    started_at = Column(DateTime, nullable=False)
+    duration_seconds = Column(Float, nullable=False)
+    iterations = Column(Integer)  # scroll iterations, for the list phases
+    rows = Column(Integer)  # usernames harvested (list phases) or diff rows written (db_write)
+    webdriver_calls = Column(Integer)
+
+    __table_args__ = (
+        Index('ix_run_phases_run', 'run_id'),
+    )
+
+
+class ScrapeRotation(Base):
+    """Progress of a rolling-coverage pass (SCRAPE_ROLLING_COVERAGE) over one target's list."""
+    __tablename__ = 'scrape_rotations'
+
+    target_id = Column(Integer, ForeignKey('targets.id'), primary_key=True)
+    list_type = Column(String, primary_key=True)  # 'followers', 'followings'
+    rotation_started_at = Column(DateTime, nullable=False)  # run_started_at of the rotation's first run
+    cursor = Column(String)  # list API max_id the next segment starts from; NULL = no rotation open
+    runs = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class SchemaVersion(Base):
+    __tablename__ = 'schema_version'
+
+    version = Column(Integer, primary_key=True)
+    applied_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+def last_run_query(session, target_id, before=None):
+    """Target's runs newest first (Database.get_last_run; planned by db_tools check-indexes)."""
+    query = session.query(RunHistory).filter_by(target_id=target_id)
+    if before is not None:
+        query = query.filter(RunHistory.run_started_at < before)
+    return query.order_by(RunHistory.run_started_at.desc())
+
 
 class Database:
-    def __init__(self):
-        self.engine = create_engine('sqlite:///instagram_tracker.db')
-        Base.metadata.create_all(self.engine)
+    # Versioned migration steps, applied once each and recorded in schema_version.
+    # Append new steps with the next number; never renumber or edit applied ones.
+    MIGRATIONS = [
+        (1, '_migrate_tracking_columns'),
+        (2, '_backfill_run_timestamps'),
+        (3, '_ensure_unique_membership_index'),
+        (4, '_ensure_indexes'),
+        (5, '_create_scrape_checkpoints'),
+        (6, '_create_scrape_rotations'),
+        (7, '_add_run_scrape_mode'),
+        (8, '_create_run_phases'),
+        (9, '_add_run_list_scrape_modes'),
+        (10, '_create_scrape_checkpoint_cursors'),
+    ]
+    SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+    def __init__(self, db_path='instagram_tracker.db'):
+        self.db_path = db_path
+        # All tracker connections go through the shared factory (WAL, busy_timeout, cache/mmap).
+        self.engine = create_engine(f'sqlite:///{db_path}', creator=lambda: db_connection.connect(db_path))
         self._ensure_schema()
         Session = sessionmaker(bind=self.engine)
         self.session = Session()
+        self._pending_writes = None
 
-    def _ensure_schema(self):
-        """Lightweight migrations for SQLite to add new columns when missing."""
+    def _schema_version(self):
         with self.engine.connect() as conn:
+            try:
+                return conn.exec_driver_sql("SELECT MAX(version) FROM schema_version").scalar() or 0
+            except OperationalError:
+                return 0
+
+    def _ensure_schema(self):
+        """Create tables and apply pending migrations; an up-to-date DB costs a single query."""
+        version = self._schema_version()
+        if version >= self.SCHEMA_VERSION:
+            return
+        Base.metadata.create_all(self.engine)
+        for step_version, step_name in self.MIGRATIONS:
+            if step_version <= version:
+                continue
+            getattr(self, step_name)()
+            with self.engine.begin() as conn:
+                conn.execute(
+                    sqlite_insert(SchemaVersion)
+                    .values(version=step_version, applied_at=datetime.utcnow())
+                    .on_conflict_do_nothing()
+                )
+        print(f"Database schema migrated from version {version} to {self.SCHEMA_VERSION}")
+
+    def _migrate_tracking_columns(self):
+        """Add run-tracking columns that older DBs are missing."""
+        with self.engine.begin() as conn:
             def has_column(table, column):
                 result = conn.exec_driver_sql(f"PRAGMA table_info({table});")
                 return any(row[1] == column for row in result)
@@ -108,7 +248,8 @@ class Database:
             if not has_column("counts", "run_id"):
                 add_column("counts", "run_id INTEGER")
 
-        # Backfill timestamp fields for existing rows
+    def _backfill_run_timestamps(self):
+        """Backfill timestamp fields for rows written before run tracking existed."""
         from sqlalchemy import update
         with self.engine.begin() as conn:
             # first_seen_run_at default to added_at
@@ -131,6 +272,116 @@ class Database:
                 .values(lost_at_run_at=FollowerFollowing.lost_at)
             )
 
+    def _ensure_indexes(self):
+        """create_all() only builds indexes with new tables; add any missing ones to existing DBs."""
+        with self.engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(conn, checkfirst=True)
+
+    def _create_scrape_checkpoints(self):
+        """scrape_checkpoints table for run resume (create_all already made it on new DBs)."""
+        ScrapeCheckpoint.__table__.create(self.engine, checkfirst=True)
+
+    def _create_scrape_checkpoint_cursors(self):
+        """scrape_checkpoint_cursors table for cursor-based resume (create_all already made it on new DBs)."""
+        ScrapeCheckpointCursor.__table__.create(self.engine, checkfirst=True)
+
+    def _create_scrape_rotations(self):
+        """scrape_rotations table for rolling coverage (create_all already made it on new DBs)."""
+        ScrapeRotation.__table__.create(self.engine, checkfirst=True)
+
+    def _add_run_scrape_mode(self):
+        """run_history.scrape_mode / scrape_seconds_saved for incremental runs."""
+        with self.engine.begin() as conn:
+            columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(run_history);")}
+            for col, ddl in (("scrape_mode", "VARCHAR"), ("scrape_seconds_saved", "FLOAT")):
+                if col not in columns:
+                    conn.exec_driver_sql(f"ALTER TABLE run_history ADD COLUMN {col} {ddl};")
+
+    def _create_run_phases(self):
+        """run_phases table for per-phase run timing (create_all already made it on new DBs)."""
+        RunPhase.__table__.create(self.engine, checkfirst=True)
+
+    def _add_run_list_scrape_modes(self):
+        """run_history.followers_scrape_mode / followings_scrape_mode for per-list skip streaks."""
+        with self.engine.begin() as conn:
+            columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(run_history);")}
+            for col in ("followers_scrape_mode", "followings_scrape_mode"):
+                if col not in columns:
+                    conn.exec_driver_sql(f"ALTER TABLE run_history ADD COLUMN {col} VARCHAR;")
+
+    def _ensure_unique_membership_index(self):
+        """
+        Collapse duplicate (target_id, is_follower, username) rows into the oldest row,
+        merging their timestamps the same way db_tools.merge_db does, then create the
+        unique index the upsert writers rely on.
+        """
+        with self.engine.begin() as conn:
+            exists = conn.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'ux_followers_followings_key'"
+            ).fetchone()
+            if exists:
+                return
+
+            conn.exec_driver_sql(
+                """
+                CREATE TEMP TABLE ff_duplicates AS
+                SELECT
+                    target_id,
+                    is_follower,
+                    follower_following_username,
+                    MIN(id) AS keep_id,
+                    MIN(added_at) AS added_at,
+                    MIN(first_seen_run_at) AS first_seen_run_at,
+                    MAX(last_seen_run_at) AS last_seen_run_at,
+                    MIN(is_lost) AS is_lost,
+                    MAX(lost_at) AS lost_at,
+                    MAX(lost_at_run_at) AS lost_at_run_at,
+                    MIN(estimated_added_at) AS estimated_added_at,
+                    MAX(estimated_removed_at) AS estimated_removed_at
+                FROM followers_followings
+                GROUP BY target_id, is_follower, follower_following_username
+                HAVING COUNT(1) > 1
+                """
+            )
+            duplicates = conn.exec_driver_sql("SELECT COUNT(1) FROM ff_duplicates").scalar() or 0
+            if duplicates:
+                print(f"Merging {duplicates} duplicated followers_followings keys before adding unique index")
+                conn.exec_driver_sql(
+                    """
+                    UPDATE followers_followings
+                    SET (added_at, first_seen_run_at, last_seen_run_at, is_lost,
+                         lost_at, lost_at_run_at, estimated_added_at, estimated_removed_at) = (
+                        SELECT d.added_at, d.first_seen_run_at, d.last_seen_run_at, d.is_lost,
+                               CASE WHEN d.is_lost = 0 THEN NULL ELSE d.lost_at END,
+                               CASE WHEN d.is_lost = 0 THEN NULL ELSE d.lost_at_run_at END,
+                               d.estimated_added_at,
+                               CASE WHEN d.is_lost = 0 THEN NULL ELSE d.estimated_removed_at END
+                        FROM ff_duplicates d
+                        WHERE d.keep_id = followers_followings.id
+                    )
+                    WHERE id IN (SELECT keep_id FROM ff_duplicates)
+                    """
+                )
+                conn.exec_driver_sql(
+                    """
+                    DELETE FROM followers_followings
+                    WHERE EXISTS (
+                        SELECT 1 FROM ff_duplicates d
+                        WHERE d.target_id = followers_followings.target_id
+                          AND d.is_follower = followers_followings.is_follower
+                          AND d.follower_following_username = followers_followings.follower_following_username
+                          AND d.keep_id <> followers_followings.id
+                    )
+                    """
+                )
+            conn.exec_driver_sql("DROP TABLE ff_duplicates")
+            conn.exec_driver_sql(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ux_followers_followings_key "
+                "ON followers_followings (target_id, is_follower, follower_following_username)"
+            )
+
     def get_target(self, username):
         return self.session.query(Target).filter_by(username=username).first()
 
@@ -149,18 +400,77 @@ class Database:
     def add_follower_following(self, target_id, username, is_follower, added_at=None,
                                first_seen=None, last_seen=None, estimated_added_at=None):
         now = added_at if added_at else datetime.utcnow()
-        ff = FollowerFollowing(
+        stmt = sqlite_insert(FollowerFollowing).values(
             target_id=target_id,
             follower_following_username=username,
             is_follower=is_follower,
             added_at=now,
             first_seen_run_at=first_seen or now,
             last_seen_run_at=last_seen or now,
-            estimated_added_at=estimated_added_at
+            estimated_added_at=estimated_added_at,
+            is_lost=False,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=FF_KEY_COLUMNS,
+            set_={
+                'last_seen_run_at': func.max(
+                    func.coalesce(FollowerFollowing.last_seen_run_at, stmt.excluded.last_seen_run_at),
+                    stmt.excluded.last_seen_run_at,
+                ),
+                'is_lost': False,
+                'lost_at': None,
+                'lost_at_run_at': None,
+                'estimated_removed_at': None,
+            },
         )
-        self.session.add(ff)
+        self.session.execute(stmt)
         self.session.commit()
-        return ff
+        return (
+            self.session.query(FollowerFollowing)
+            .filter_by(target_id=target_id, is_follower=is_follower, follower_following_username=username)
+            .one()
+        )
+
+    def write(self, op):
+        """
+        Apply a write operation (a callable using self.session) and commit it, or queue
+        it when a run_transaction() is open. Returns op()'s result, or None when queued.
+        """
+        if self._pending_writes is not None:
+            self._pending_writes.append(op)
+            return None
+        try:
+            result = op()
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return result
+
+    @contextmanager
+    def run_transaction(self):
+        """
+        Run-scoped unit of work: writes issued through write() inside the block (count
+        rows, membership diffs, finish_run) are queued and applied in one transaction
+        with a single commit when the block exits. Scraping in between holds no write
+        lock and readers never see a half-applied run. Queued writes are applied even
+        if the block raises, so a failed list keeps the lists that finished before it.
+        """
+        if self._pending_writes is not None:
+            raise RuntimeError("run_transaction() is already open")
+        self._pending_writes = []
+        try:
+            yield self
+        finally:
+            ops, self._pending_writes = self._pending_writes, None
+            if ops:
+                try:
+                    for op in ops:
+                        op()
+                    self.session.commit()
+                except Exception:
+                    self.session.rollback()
+                    raise
 
     def start_run(self, target_id, run_started_at, status="running"):
         run = RunHistory(
@@ -172,23 +482,181 @@ class Database:
         self.session.commit()
         return run
 
-    def finish_run(self, run_id, status, followers_collected=0, followings_collected=0, finished_at=None):
-        run = self.session.query(RunHistory).get(run_id)
-        if not run:
-            return
-        run.status = status
-        run.followers_collected = followers_collected
-        run.followings_collected = followings_collected
-        run.run_finished_at = finished_at if finished_at else datetime.utcnow()
-        self.session.commit()
-
-    def get_last_run(self, target_id):
+    def finish_run(self, run_id, status, followers_collected=0, followings_collected=0, finished_at=None,
+                   scrape_mode=None, scrape_seconds_saved=None, followers_scrape_mode=None,
+                   followings_scrape_mode=None):
+        finished_at = finished_at if finished_at else datetime.utcnow()
+
+        def op():
+            run = self.session.query(RunHistory).get(run_id)
+            if not run:
+                return
+            run.status = status
+            run.followers_collected = followers_collected
+            run.followings_collected = followings_collected
+            run.run_finished_at = finished_at
+            run.scrape_mode = scrape_mode
+            run.scrape_seconds_saved = scrape_seconds_saved
+            run.followers_scrape_mode = followers_scrape_mode
+            run.followings_scrape_mode = followings_scrape_mode
+            if status == "success":
+                # A successful run is never resumed; its checkpoints go with the same commit.
+                for model in (ScrapeCheckpoint, ScrapeCheckpointCursor):
+                    self.session.query(model).filter_by(run_id=run_id).delete(synchronize_session=False)
+
+        self.write(op)
+
+    def add_run_phases(self, run_id, phases):
+        """Record a run's phase timings: dicts with phase, started_at, duration_seconds and optional counters."""
+        rows = [RunPhase(run_id=run_id, **phase) for phase in phases]
+
+        def op():
+            self.session.add_all(rows)
+
+        self.write(op)
+
+    def get_last_run(self, target_id, before=None):
+        return last_run_query(self.session, target_id, before=before).first()
+
+    def runs_since_full_scrape(self, target_id):
+        """Successful runs since the target's last full scrape, or None if it never had one."""
+        full = or_(RunHistory.scrape_mode.is_(None), RunHistory.scrape_mode == "full")
+        last_full = (
+            self.session.query(func.max(RunHistory.run_started_at))
+            .filter(RunHistory.target_id == target_id, RunHistory.status == "success", full)
+            .scalar()
+        )
+        if last_full is None:
+            return None
         return (
-            self.session.query(RunHistory)
-            .filter_by(target_id=target_id)
+            self.session.query(func.count(RunHistory.id))
+            .filter(RunHistory.target_id == target_id, RunHistory.status == "success",
+                    RunHistory.run_started_at > last_full)
+            .scalar()
+        ) or 0
+
+    def consecutive_unchanged_runs(self, target_id, list_type, limit=100):
+        """How many of the target's latest successful runs in a row skipped this list's scroll as unchanged."""
+        list_mode = getattr(RunHistory, f"{list_type}_scrape_mode")
+        modes = (
+            # Runs from before the per-list columns only have the run-level mode
+            self.session.query(func.coalesce(list_mode, RunHistory.scrape_mode))
+            .filter(RunHistory.target_id == target_id, RunHistory.status == "success")
             .order_by(RunHistory.run_started_at.desc())
-            .first()
+            .limit(limit)
         )
+        streak = 0
+        for (mode,) in modes:
+            if mode != "unchanged":
+                break
+            streak += 1
+        return streak
+
+    def get_run_counts(self, run_id):
+        """{count_type: count} recorded by a run."""
+        rows = self.session.query(Counts.count_type, Counts.count).filter(Counts.run_id == run_id)
+        return {count_type: count for count_type, count in rows}
+
+    def active_usernames(self, target_id, list_type):
+        """Usernames currently active (not lost) in one of the target's lists."""
+        rows = self.session.query(FollowerFollowing.follower_following_username).filter_by(
+            target_id=target_id, is_follower=(list_type == "followers"), is_lost=False
+        )
+        return {row[0] for row in rows}
+
+    def claim_interrupted_run(self, target_id, max_age_minutes):
+        """
+        The target's latest run if it is still 'running' (the process died mid-run) or
+        'resumable' (the browser died mid-scrape), started within max_age_minutes and
+        has checkpoints to resume from. A claimed resumable run goes back to 'running'
+        and drops its counts, which the resumed run records again. Older or empty
+        unfinished runs are marked 'interrupted'. Checkpoints of the target's other
+        runs (failed ones included) can no longer be resumed and are dropped.
+        """
+        run = self.get_last_run(target_id)
+        claimed = None
+        if run and run.status in ("running", "resumable"):
+            has_checkpoints = (
+                self.session.query(ScrapeCheckpoint.run_id).filter_by(run_id=run.id).first() is not None
+            )
+            started = run.run_started_at
+            age_minutes = (datetime.utcnow() - started.replace(tzinfo=None)).total_seconds() / 60.0
+            if has_checkpoints and age_minutes <= max_age_minutes:
+                claimed = run
+
+        def op():
+            if claimed is not None:
+                if claimed.status == "resumable":
+                    self.session.query(Counts).filter_by(run_id=claimed.id).delete(synchronize_session=False)
+                claimed.status = "running"
+            elif run and run.status in ("running", "resumable"):
+                run.status = "interrupted"
+            stale_runs = select(RunHistory.id).where(RunHistory.target_id == target_id)
+            if claimed is not None:
+                stale_runs = stale_runs.where(RunHistory.id != claimed.id)
+            for model in (ScrapeCheckpoint, ScrapeCheckpointCursor):
+                self.session.query(model).filter(model.run_id.in_(stale_runs)).delete(synchronize_session=False)
+
+        self.write(op)
+        return claimed
+
+    def save_checkpoint(self, run_id, list_type, usernames, cursor=None):
+        """
+        Record harvested usernames for an unfinished run, and with cursor the list API
+        cursor past the pages they came from. Commits right away on its own connection,
+        also inside run_transaction(), since it must survive a crash.
+        """
+        now = datetime.utcnow()
+        rows = [{"run_id": run_id, "list_type": list_type, "username": name,
+                 "checkpointed_at": now} for name in usernames]
+        if not rows and not cursor:
+            return
+        with self.engine.begin() as conn:
+            if rows:
+                conn.execute(sqlite_insert(ScrapeCheckpoint).on_conflict_do_nothing(), rows)
+            if cursor:
+                stmt = sqlite_insert(ScrapeCheckpointCursor).values(
+                    run_id=run_id, list_type=list_type, cursor=cursor, checkpointed_at=now
+                )
+                conn.execute(stmt.on_conflict_do_update(
+                    index_elements=["run_id", "list_type"],
+                    set_={"cursor": stmt.excluded.cursor, "checkpointed_at": stmt.excluded.checkpointed_at},
+                ))
+
+    def load_checkpoint(self, run_id, list_type):
+        with self.engine.connect() as conn:
+            result = conn.execute(
+                ScrapeCheckpoint.__table__.select()
+                .with_only_columns(ScrapeCheckpoint.username)
+                .where(ScrapeCheckpoint.run_id == run_id, ScrapeCheckpoint.list_type == list_type)
+            )
+            return {row[0] for row in result}
+
+    def load_checkpoint_cursor(self, run_id, list_type):
+        """The list API cursor saved with the run's checkpoints, or None (DOM collectors, or none saved yet)."""
+        with self.engine.connect() as conn:
+            return conn.execute(
+                ScrapeCheckpointCursor.__table__.select()
+                .with_only_columns(ScrapeCheckpointCursor.cursor)
+                .where(ScrapeCheckpointCursor.run_id == run_id, ScrapeCheckpointCursor.list_type == list_type)
+            ).scalar()
+
+    def get_rotation(self, target_id, list_type):
+        return self.session.query(ScrapeRotation).filter_by(target_id=target_id, list_type=list_type).first()
+
+    def save_rotation(self, target_id, list_type, rotation_started_at, cursor, runs):
+        """Store where the rolling-coverage rotation for this list stands (queued like other run writes)."""
+        def op():
+            self.session.merge(ScrapeRotation(
+                target_id=target_id,
+                list_type=list_type,
+                rotation_started_at=rotation_started_at,
+                cursor=cursor,
+                runs=runs,
+                updated_at=datetime.utcnow(),
+            ))
+
+        self.write(op)
 
     def add_count(self, target_id, count_type, count, timestamp=None, run_id=None):
         entry = Counts(
@@ -198,8 +666,7 @@ class Database:
             timestamp=timestamp if timestamp else datetime.utcnow(),
             run_id=run_id
         )
-        self.session.add(entry)
-        self.session.commit()
+        self.write(lambda: self.session.add(entry))
         return entry
 
     def close(self):
@@ -0,0 +1,48 @@
+import os
+import sqlite3
+from pathlib import Path
+
+# Stdlib-only on purpose: the GUI and tray builds import this without SQLAlchemy.
+# Settings are read per connection so a .env loaded after import still applies.
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def apply_pragmas(conn, readonly: bool = False, busy_timeout_ms: int | None = None):
+    """Per-connection tuning shared by the tracker, web, GUI and tray connections."""
+    timeout_ms = _env_int("SQLITE_BUSY_TIMEOUT_MS", 5000) if busy_timeout_ms is None else busy_timeout_ms
+    journal_mode = os.getenv("SQLITE_JOURNAL_MODE", "WAL").strip().upper() or "WAL"
+    synchronous = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").strip().upper() or "NORMAL"
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"PRAGMA busy_timeout = {int(timeout_ms)}")
+        cursor.execute(f"PRAGMA cache_size = -{_env_int('SQLITE_CACHE_SIZE_KB', 16384)}")
+        cursor.execute(f"PRAGMA mmap_size = {_env_int('SQLITE_MMAP_SIZE_BYTES', 256 * 1024 * 1024)}")
+        if not readonly:
+            # journal_mode is persistent in the DB file; readers just inherit it.
+            cursor.execute(f"PRAGMA journal_mode = {journal_mode}")
+            cursor.execute(f"PRAGMA synchronous = {synchronous}")
+    finally:
+        cursor.close()
+
+
+def connect(db_path, readonly: bool = False, timeout: float | None = None) -> sqlite3.Connection:
+    """
+    Open a tuned sqlite3 connection. Readers use read-only URI mode so they can
+    never take the write lock; with WAL they also never wait on the tracker's commits.
+    `timeout` (seconds) overrides SQLITE_BUSY_TIMEOUT_MS.
+    """
+    busy_timeout_ms = _env_int("SQLITE_BUSY_TIMEOUT_MS", 5000) if timeout is None else int(timeout * 1000)
+    sqlite_timeout = busy_timeout_ms / 1000.0
+    if readonly:
+        uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=sqlite_timeout)
+    else:
+        conn = sqlite3.connect(str(db_path), timeout=sqlite_timeout)
+    apply_pragmas(conn, readonly=readonly, busy_timeout_ms=busy_timeout_ms)
+    return conn
@@ -1,9 +1,11 @@
 import argparse
-import shutil
 import sqlite3
+import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
 
+import db_connection
+
 
 DEFAULT_DB = "instagram_tracker.db"
 
@@ -12,6 +14,19 @@ def _timestamp():
     return datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
 
 
+def _copy_db(src_path: Path, out_path: Path):
+    """Copy through the SQLite backup API; a plain file copy misses commits still in the WAL."""
+    src = db_connection.connect(src_path, readonly=True)
+    try:
+        dst = sqlite3.connect(str(out_path))
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+
+
 def export_db(src_path: Path, out_path: Path | None, overwrite: bool) -> Path:
     if not src_path.exists():
         raise FileNotFoundError(f"Source DB not found: {src_path}")
@@ -23,7 +38,7 @@ def export_db(src_path: Path, out_path: Path | None, overwrite: bool) -> Path:
     if out_path.exists() and not overwrite:
         raise FileExistsError(f"Export path already exists: {out_path}")
 
-    shutil.copy2(src_path, out_path)
+    _copy_db(src_path, out_path)
     return out_path
 
 
@@ -32,55 +47,6 @@ def _run(conn: sqlite3.Connection, sql: str) -> int:
     return cur.rowcount
 
 
-def _parse_dt(value):
-    if value is None:
-        return None
-    if isinstance(value, datetime):
-        return value
-    if isinstance(value, str):
-        try:
-            return datetime.fromisoformat(value)
-        except ValueError:
-            return None
-    return None
-
-
-def _pick_min_dt(a, b):
-    if a is None:
-        return b
-    if b is None:
-        return a
-    da = _parse_dt(a)
-    db = _parse_dt(b)
-    if da is None:
-        return a
-    if db is None:
-        return b
-    return a if da <= db else b
-
-
-def _pick_max_dt(a, b):
-    if a is None:
-        return b
-    if b is None:
-        return a
-    da = _parse_dt(a)
-    db = _parse_dt(b)
-    if da is None:
-        return a
-    if db is None:
-        return b
-    return a if da >= db else b
-
-
-def _merge_is_lost(a, b):
-    if a is None:
-        return b
-    if b is None:
-        return a
-    return 0 if int(a) == 0 or int(b) == 0 else 1
-
-
 def preview_merge(dest_path: Path, src_path: Path) -> dict:
     if not dest_path.exists():
         raise FileNotFoundError(f"Destination DB not found: {dest_path}")
@@ -114,38 +80,29 @@ def preview_merge(dest_path: Path, src_path: Path) -> dict:
             """
         ).fetchone()[0]
 
-        source_ff_rows = conn.execute(
+        ff_total, ff_update = conn.execute(
             """
             SELECT
-              st.username,
-              ff.follower_following_username,
-              ff.is_follower
-            FROM srcdb.followers_followings ff
-            JOIN srcdb.targets st ON st.id = ff.target_id
-            GROUP BY st.username, ff.follower_following_username, ff.is_follower
+              COUNT(1),
+              COALESCE(SUM(CASE WHEN EXISTS (
+                SELECT 1
+                FROM followers_followings ff2
+                JOIN targets t ON t.id = ff2.target_id
+                WHERE t.username = src.target_username
+                  AND ff2.is_follower = src.is_follower
+                  AND ff2.follower_following_username = src.follower_following_username
+              ) THEN 1 ELSE 0 END), 0)
+            FROM (
+              SELECT DISTINCT
+                st.username AS target_username,
+                ff.follower_following_username,
+                ff.is_follower
+              FROM srcdb.followers_followings ff
+              JOIN srcdb.targets st ON st.id = ff.target_id
+            ) src
             """
-        ).fetchall()
-
-        ff_insert = 0
-        ff_update = 0
-        for target_name, follower_name, is_follower in source_ff_rows:
-            target_row = conn.execute("SELECT id FROM targets WHERE username = ?", (target_name,)).fetchone()
-            if target_row is None:
-                ff_insert += 1
-                continue
-            target_id = target_row[0]
-            existing = conn.execute(
-                """
-                SELECT 1 FROM followers_followings
-                WHERE target_id = ? AND follower_following_username = ? AND is_follower = ?
-                LIMIT 1
-                """,
-                (target_id, follower_name, is_follower),
-            ).fetchone()
-            if existing:
-                ff_update += 1
-            else:
-                ff_insert += 1
+        ).fetchone()
+        ff_insert = ff_total - ff_update
 
         result["followers_followings_insert"] = ff_insert
         result["followers_followings_update"] = ff_update
@@ -234,10 +191,20 @@ def cleanup_targets(dest_path: Path, usernames, apply: bool, backup: bool) -> di
 
         if backup:
             backup_path = dest_path.with_name(f"{dest_path.stem}.bak_{_timestamp()}{dest_path.suffix}")
-            shutil.copy2(dest_path, backup_path)
+            _copy_db(dest_path, backup_path)
             result["backup_path"] = str(backup_path)
 
+        present = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
         with conn:
+            # Per-run tables added by later schema versions
+            for table in ("run_phases", "scrape_checkpoints", "scrape_checkpoint_cursors"):
+                if table in present:
+                    conn.execute(
+                        f"DELETE FROM {table} WHERE run_id IN (SELECT id FROM run_history WHERE target_id IN ({id_ph}))",
+                        target_ids,
+                    )
+            if "scrape_rotations" in present:
+                conn.execute(f"DELETE FROM scrape_rotations WHERE target_id IN ({id_ph})", target_ids)
             conn.execute(f"DELETE FROM counts WHERE target_id IN ({id_ph})", target_ids)
             conn.execute(f"DELETE FROM followers_followings WHERE target_id IN ({id_ph})", target_ids)
             conn.execute(f"DELETE FROM run_history WHERE target_id IN ({id_ph})", target_ids)
@@ -352,7 +319,7 @@ def rollback_lost(
 
         if backup:
             backup_path = dest_path.with_name(f"{dest_path.stem}.bak_{_timestamp()}{dest_path.suffix}")
-            shutil.copy2(dest_path, backup_path)
+            _copy_db(dest_path, backup_path)
             result["backup_path"] = str(backup_path)
 
         with conn:
@@ -377,6 +344,15 @@ def rollback_lost(
         conn.close()
 
 
+def _ensure_dest_schema(dest_path: Path):
+    """Apply tracker migrations (incl. the unique membership index the merge upsert needs)."""
+    from database import Database
+
+    db = Database(str(dest_path))
+    db.close()
+    db.engine.dispose()
+
+
 def merge_db(dest_path: Path, src_path: Path, backup: bool) -> dict:
     if not dest_path.exists():
         raise FileNotFoundError(f"Destination DB not found: {dest_path}")
@@ -388,7 +364,8 @@ def merge_db(dest_path: Path, src_path: Path, backup: bool) -> dict:
         backup_path = dest_path.with_name(
             f"{dest_path.stem}.bak_{_timestamp()}{dest_path.suffix}"
         )
-        shutil.copy2(dest_path, backup_path)
+        _copy_db(dest_path, backup_path)
+    _ensure_dest_schema(dest_path)
 
     counts = {
         "targets": 0,
@@ -427,10 +404,11 @@ def merge_db(dest_path: Path, src_path: Path, backup: bool) -> dict:
                 """,
             )
 
-            src_rows = conn.execute(
+            conn.execute(
                 """
+                CREATE TEMP TABLE merge_ff_src AS
                 SELECT
-                    st.username AS target_username,
+                    t.id AS target_id,
                     ff.follower_following_username,
                     ff.is_follower,
                     MIN(ff.added_at) AS min_added_at,
@@ -443,134 +421,69 @@ def merge_db(dest_path: Path, src_path: Path, backup: bool) -> dict:
                     MIN(ff.is_lost) AS min_is_lost
                 FROM srcdb.followers_followings ff
                 JOIN srcdb.targets st ON st.id = ff.target_id
-                GROUP BY st.username, ff.follower_following_username, ff.is_follower
+                JOIN targets t ON t.username = st.username
+                GROUP BY t.id, ff.follower_following_username, ff.is_follower
                 """
-            ).fetchall()
+            )
+            src_total = conn.execute("SELECT COUNT(1) FROM merge_ff_src").fetchone()[0]
+            existing = conn.execute(
+                """
+                SELECT COUNT(1)
+                FROM merge_ff_src src
+                JOIN followers_followings ff
+                  ON ff.target_id = src.target_id
+                 AND ff.is_follower = src.is_follower
+                 AND ff.follower_following_username = src.follower_following_username
+                """
+            ).fetchone()[0]
 
-            for row in src_rows:
-                (
-                    target_username,
-                    follower_username,
+            # Timestamps merge as earliest-first/latest-last; a row stays active if
+            # either side has it active, and lost fields only survive on lost rows.
+            conn.execute(
+                """
+                INSERT INTO followers_followings
+                    (target_id, follower_following_username, is_follower, added_at, lost_at, is_lost,
+                     first_seen_run_at, last_seen_run_at, lost_at_run_at, estimated_added_at, estimated_removed_at)
+                SELECT
+                    target_id,
+                    follower_following_username,
                     is_follower,
                     min_added_at,
-                    min_first_seen,
-                    max_last_seen,
-                    max_lost_at,
-                    max_lost_run,
-                    min_est_added,
-                    max_est_removed,
-                    min_is_lost,
-                ) = row
-
-                dest_target = conn.execute(
-                    "SELECT id FROM targets WHERE username = ?",
-                    (target_username,),
-                ).fetchone()
-                if dest_target is None:
-                    conn.execute(
-                        "INSERT INTO targets (username) VALUES (?)",
-                        (target_username,),
-                    )
-                    dest_target_id = conn.execute(
-                        "SELECT id FROM targets WHERE username = ?",
-                        (target_username,),
-                    ).fetchone()[0]
-                else:
-                    dest_target_id = dest_target[0]
-
-                dest_row = conn.execute(
-                    """
-                    SELECT id, added_at, first_seen_run_at, last_seen_run_at,
-                           lost_at, is_lost, lost_at_run_at, estimated_added_at, estimated_removed_at
-                    FROM followers_followings
-                    WHERE target_id = ? AND follower_following_username = ? AND is_follower = ?
-                    ORDER BY COALESCE(first_seen_run_at, added_at) ASC
-                    LIMIT 1
-                    """,
-                    (dest_target_id, follower_username, is_follower),
-                ).fetchone()
-
-                if dest_row:
-                    (
-                        row_id,
-                        dest_added,
-                        dest_first_seen,
-                        dest_last_seen,
-                        dest_lost_at,
-                        dest_is_lost,
-                        dest_lost_run,
-                        dest_est_added,
-                        dest_est_removed,
-                    ) = dest_row
-
-                    merged_is_lost = _merge_is_lost(dest_is_lost, min_is_lost)
-                    merged_added = _pick_min_dt(dest_added, min_added_at)
-                    merged_first_seen = _pick_min_dt(dest_first_seen, min_first_seen)
-                    merged_last_seen = _pick_max_dt(dest_last_seen, max_last_seen)
-                    merged_est_added = _pick_min_dt(dest_est_added, min_est_added)
-
-                    if merged_is_lost == 0:
-                        merged_lost_at = None
-                        merged_lost_run = None
-                        merged_est_removed = None
-                    else:
-                        merged_lost_at = _pick_max_dt(dest_lost_at, max_lost_at)
-                        merged_lost_run = _pick_max_dt(dest_lost_run, max_lost_run)
-                        merged_est_removed = _pick_max_dt(dest_est_removed, max_est_removed)
-
-                    conn.execute(
-                        """
-                        UPDATE followers_followings
-                        SET added_at = ?,
-                            first_seen_run_at = ?,
-                            last_seen_run_at = ?,
-                            lost_at = ?,
-                            is_lost = ?,
-                            lost_at_run_at = ?,
-                            estimated_added_at = ?,
-                            estimated_removed_at = ?
-                        WHERE id = ?
-                        """,
-                        (
-                            merged_added,
-                            merged_first_seen,
-                            merged_last_seen,
-                            merged_lost_at,
-                            merged_is_lost,
-                            merged_lost_run,
-                            merged_est_added,
-                            merged_est_removed,
-                            row_id,
-                        ),
-                    )
-                    counts["followers_followings_updated"] += 1
-                else:
-                    insert_is_lost = 1 if min_is_lost else 0
-                    insert_lost_at = max_lost_at if insert_is_lost else None
-                    insert_lost_run = max_lost_run if insert_is_lost else None
-                    insert_est_removed = max_est_removed if insert_is_lost else None
-                    conn.execute(
-                        """
-                        INSERT INTO followers_followings
-                            (target_id, follower_following_username, is_follower, added_at, lost_at, is_lost,
-                             first_seen_run_at, last_seen_run_at, lost_at_run_at, estimated_added_at, estimated_removed_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            dest_target_id,
-                            follower_username,
-                            is_follower,
-                            min_added_at,
-                            insert_lost_at,
-                            insert_is_lost,
-                            min_first_seen,
-                            max_last_seen,
-                            insert_lost_run,
-                            min_est_added,
-                            insert_est_removed,
-                        ),
-                    )
-                    counts["followers_followings_inserted"] += 1
+                    CASE WHEN min_is_lost THEN max_lost_at END,
+                    CASE WHEN min_is_lost THEN 1 ELSE 0 END,
+                    min_first_seen_run_at,
+                    max_last_seen_run_at,
+                    CASE WHEN min_is_lost THEN max_lost_at_run_at END,
+                    min_estimated_added_at,
+                    CASE WHEN min_is_lost THEN max_estimated_removed_at END
+                FROM merge_ff_src
+                WHERE true
+                ON CONFLICT (target_id, is_follower, follower_following_username) DO UPDATE SET
+                    added_at = COALESCE(MIN(added_at, excluded.added_at), added_at, excluded.added_at),
+                    first_seen_run_at = COALESCE(
+                        MIN(first_seen_run_at, excluded.first_seen_run_at), first_seen_run_at, excluded.first_seen_run_at
+                    ),
+                    last_seen_run_at = COALESCE(
+                        MAX(last_seen_run_at, excluded.last_seen_run_at), last_seen_run_at, excluded.last_seen_run_at
+                    ),
+                    estimated_added_at = COALESCE(
+                        MIN(estimated_added_at, excluded.estimated_added_at), estimated_added_at, excluded.estimated_added_at
+                    ),
+                    is_lost = CASE WHEN is_lost = 0 OR excluded.is_lost = 0 THEN 0 ELSE 1 END,
+                    lost_at = CASE WHEN is_lost = 0 OR excluded.is_lost = 0 THEN NULL
+                        ELSE COALESCE(MAX(lost_at, excluded.lost_at), lost_at, excluded.lost_at) END,
+                    lost_at_run_at = CASE WHEN is_lost = 0 OR excluded.is_lost = 0 THEN NULL
+                        ELSE COALESCE(MAX(lost_at_run_at, excluded.lost_at_run_at), lost_at_run_at, excluded.lost_at_run_at) END,
+                    estimated_removed_at = CASE WHEN is_lost = 0 OR excluded.is_lost = 0 THEN NULL
+                        ELSE COALESCE(
+                            MAX(estimated_removed_at, excluded.estimated_removed_at),
+                            estimated_removed_at, excluded.estimated_removed_at
+                        ) END
+                """
+            )
+            conn.execute("DROP TABLE merge_ff_src")
+            counts["followers_followings_inserted"] = src_total - existing
+            counts["followers_followings_updated"] = existing
 
             counts["counts"] = _run(
                 conn,
@@ -613,6 +526,79 @@ def merge_db(dest_path: Path, src_path: Path, backup: bool) -> dict:
     return counts
 
 
+def hot_queries() -> list:
+    """
+    (caller, index expected in the plan, SQL, params) for each hot query, built from
+    the callers' own code: the dashboards' shared SQL (dashboard_queries) as is, and
+    the report / tracker SQLAlchemy queries compiled for SQLite with literal binds.
+    """
+    from sqlalchemy.dialects import sqlite
+    from sqlalchemy.orm import Session
+
+    import report
+    from dashboard_queries import CHANGE_TIMES_SQL, CHANGE_TOTALS_SQL, DAY_CHANGE_ROWS_SQL, DAY_CHANGES_SQL
+    from database import last_run_query
+
+    def compiled(query):
+        return str(query.statement.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True})), ()
+
+    first_seen, lost_at = "ix_followers_followings_first_seen", "ix_followers_followings_lost_at"
+    all_targets = ("2026-01-01", "2026-01-31", "", "", 1, 0)
+    one_day_followers = ("2026-01-01", "2026-01-02", "someone", "someone", 1, 1)
+    one_day_followings = ("2026-01-01", "2026-01-02", "", "", 0, 0)
+    queries = []
+    for event, index_name in (("new", first_seen), ("lost", lost_at)):
+        queries += [
+            (f"web_app.api_overview ({event})", index_name, CHANGE_TOTALS_SQL[event], all_targets),
+            (f"web_app.api_daily ({event})", index_name, CHANGE_TIMES_SQL[event], all_targets),
+            (f"web_app.api_day ({event})", index_name, DAY_CHANGES_SQL[event], one_day_followers),
+            (f"gui_app._query_day_changes ({event})", index_name, DAY_CHANGE_ROWS_SQL[event], one_day_followings),
+        ]
+
+    session = Session()
+    start, end = datetime(2026, 1, 1), datetime(2026, 1, 31)
+    summary_new, summary_lost = report.summary_queries(session, start)
+    queries += [
+        ("report.cmd_new", first_seen, *compiled(report.new_query(session, "both", start, end, None))),
+        ("report.cmd_lost", lost_at, *compiled(report.lost_query(session, "followers", start, end, "someone"))),
+        ("report.cmd_summary (new)", first_seen, *compiled(summary_new)),
+        ("report.cmd_summary (lost)", lost_at, *compiled(summary_lost)),
+        ("report.cmd_daily_counts", "ix_counts_target_type_timestamp",
+         *compiled(report.daily_counts_query(session, start, end, None))),
+        # get_last_run() takes .first(), i.e. LIMIT 1
+        ("Database.get_last_run", "ix_run_history_target_started", *compiled(last_run_query(session, 1).limit(1))),
+    ]
+    session.close()
+    return queries
+
+
+def check_indexes(dest_path: Path | None) -> list:
+    """
+    Run EXPLAIN QUERY PLAN for each hot dashboard/report query and check that it
+    searches (not scans) its time-range index. Without a DB, checks a fresh schema.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        if dest_path is None:
+            dest_path = Path(tmp) / "check_indexes.db"
+            _ensure_dest_schema(dest_path)
+        elif not dest_path.exists():
+            raise FileNotFoundError(f"Destination DB not found: {dest_path}")
+
+        conn = db_connection.connect(dest_path, readonly=True)
+        try:
+            results = []
+            for caller, index_name, sql, params in hot_queries():
+                plan = [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+                ok = any(
+                    line.startswith("SEARCH") and f"INDEX {index_name} (" in line
+                    for line in plan
+                )
+                results.append({"caller": caller, "index": index_name, "plan": plan, "ok": ok})
+        finally:
+            conn.close()
+    return results
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Export or merge Instagram tracker databases")
     sub = parser.add_subparsers(dest="command", required=True)
@@ -657,6 +643,9 @@ def build_parser() -> argparse.ArgumentParser:
     p_rollback.add_argument("--apply", action="store_true", help="Apply rollback (default is preview only)")
     p_rollback.add_argument("--no-backup", action="store_true", help="Do not create backup when applying rollback")
 
+    p_indexes = sub.add_parser("check-indexes", help="Verify hot queries use their indexes (EXPLAIN QUERY PLAN)")
+    p_indexes.add_argument("--dest", help="DB path to check (default: a fresh DB with the current schema)")
+
     return parser
 
 
@@ -764,6 +753,16 @@ def main():
             print("No changes applied. Re-run with --apply to execute rollback.")
         return
 
+    if args.command == "check-indexes":
+        results = check_indexes(Path(args.dest) if args.dest else None)
+        for row in results:
+            print(f"[{'OK' if row['ok'] else 'FAIL'}] {row['caller']} -> {row['index']}")
+            for line in row["plan"]:
+                print(f"    {line}")
+        if not all(row["ok"] for row in results):
+            raise SystemExit(1)
+        return
+
 
 if __name__ == "__main__":
     main()
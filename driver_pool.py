@@ -0,0 +1,295 @@
+import os
+import queue
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import inspect as sa_inspect
+
+from database import Database
+
+
+# Concurrent scraping of many targets: N browser workers, one SQLite writer.
+# Workers get a QueuedDatabase in place of Database; every DB call they make runs on
+# the writer thread, so SQLite only ever sees one connection writing.
+
+
+class DbWriter:
+    """Owns the Database on a dedicated thread and runs submitted calls one at a time."""
+
+    def __init__(self, db_path: str = "instagram_tracker.db"):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        # Created on the writer thread: sqlite3 connections stay on the thread that opened them.
+        self.db = self._executor.submit(Database, db_path).result()
+        self.jobs = 0
+        self.busy_seconds = 0.0
+
+    def submit(self, fn):
+        """Run fn() on the writer thread and return its result (ORM rows come back detached)."""
+        return self._executor.submit(self._run, fn).result()
+
+    def _run(self, fn):
+        started = time.monotonic()
+        try:
+            return self._detach(fn())
+        finally:
+            self.jobs += 1
+            self.busy_seconds += time.monotonic() - started
+
+    def _detach(self, result):
+        state = sa_inspect(result, raiseerr=False)
+        if state is None or not hasattr(state, "mapper") or state.session is None:
+            return result
+        # Load every column, then detach, so worker threads never trigger a refresh.
+        for attr in state.mapper.column_attrs:
+            getattr(result, attr.key)
+        self.db.session.expunge(result)
+        return result
+
+    def close(self):
+        def shutdown():
+            self.db.close()
+            self.db.engine.dispose()
+
+        self._executor.submit(shutdown).result()
+        self._executor.shutdown(wait=True)
+
+
+class QueuedDatabase:
+    """
+    The subset of Database that InstagramTracker.run() and store_followers use,
+    forwarded to a DbWriter. run_transaction() buffers the worker's writes locally
+    and hands them to the writer as one batch, applied with a single commit.
+    """
+
+    def __init__(self, writer: DbWriter):
+        self._writer = writer
+        self._pending_writes = None
+
+    @property
+    def session(self):
+        # Only reached from write ops, which execute on the writer thread.
+        return self._writer.db.session
+
+    def get_or_create_target(self, username):
+        return self._writer.submit(lambda: self._writer.db.get_or_create_target(username))
+
+    def get_last_run(self, target_id, before=None):
+        return self._writer.submit(lambda: self._writer.db.get_last_run(target_id, before=before))
+
+    def runs_since_full_scrape(self, target_id):
+        return self._writer.submit(lambda: self._writer.db.runs_since_full_scrape(target_id))
+
+    def consecutive_unchanged_runs(self, target_id, list_type):
+        return self._writer.submit(lambda: self._writer.db.consecutive_unchanged_runs(target_id, list_type))
+
+    def get_run_counts(self, run_id):
+        return self._writer.submit(lambda: self._writer.db.get_run_counts(run_id))
+
+    def active_usernames(self, target_id, list_type):
+        return self._writer.submit(lambda: self._writer.db.active_usernames(target_id, list_type))
+
+    def claim_interrupted_run(self, target_id, max_age_minutes):
+        return self._writer.submit(lambda: self._writer.db.claim_interrupted_run(target_id, max_age_minutes))
+
+    def save_checkpoint(self, run_id, list_type, usernames, cursor=None):
+        # Not deferred by run_transaction(): checkpoints must be on disk before the run commits.
+        names = list(usernames)
+        self._writer.submit(lambda: self._writer.db.save_checkpoint(run_id, list_type, names, cursor=cursor))
+
+    def load_checkpoint(self, run_id, list_type):
+        return self._writer.submit(lambda: self._writer.db.load_checkpoint(run_id, list_type))
+
+    def load_checkpoint_cursor(self, run_id, list_type):
+        return self._writer.submit(lambda: self._writer.db.load_checkpoint_cursor(run_id, list_type))
+
+    def get_rotation(self, target_id, list_type):
+        return self._writer.submit(lambda: self._writer.db.get_rotation(target_id, list_type))
+
+    def save_rotation(self, target_id, list_type, rotation_started_at, cursor, runs):
+        self.write(lambda: self._writer.db.save_rotation(target_id, list_type, rotation_started_at, cursor, runs))
+
+    def start_run(self, target_id, run_started_at, status="running"):
+        return self._writer.submit(lambda: self._writer.db.start_run(target_id, run_started_at, status=status))
+
+    def write(self, op):
+        if self._pending_writes is not None:
+            self._pending_writes.append(op)
+            return None
+        return self._writer.submit(lambda: self._writer.db.write(op))
+
+    def add_count(self, **kwargs):
+        self.write(lambda: self._writer.db.add_count(**kwargs))
+
+    def finish_run(self, run_id, status, **kwargs):
+        self.write(lambda: self._writer.db.finish_run(run_id, status, **kwargs))
+
+    def add_run_phases(self, run_id, phases):
+        self.write(lambda: self._writer.db.add_run_phases(run_id, phases))
+
+    @contextmanager
+    def run_transaction(self):
+        if self._pending_writes is not None:
+            raise RuntimeError("run_transaction() is already open")
+        self._pending_writes = []
+        try:
+            yield self
+        finally:
+            ops, self._pending_writes = self._pending_writes, None
+            if ops:
+                self._writer.submit(lambda: self._apply(ops))
+
+    def _apply(self, ops):
+        with self._writer.db.run_transaction():
+            for op in ops:
+                op()
+
+    def close(self):
+        # The writer's session outlives individual runs.
+        pass
+
+
+class HelperDatabase:
+    """
+    Database for the PARALLEL_LISTS followings helper thread when the tracker owns a
+    plain Database. Reads and checkpoints use a Database of its own, opened on the
+    helper thread, since sqlite3 connections stay on the thread that created them.
+    Run writes are queued in the owner's open run_transaction() and applied by the
+    owner's thread, so both lists still land in one commit.
+    """
+
+    def __init__(self, owner: Database):
+        self._owner = owner
+        self._db = Database(owner.db_path)
+
+    @property
+    def session(self):
+        # Only reached from write ops, which execute on the owner's thread.
+        return self._owner.session
+
+    def active_usernames(self, target_id, list_type):
+        return self._db.active_usernames(target_id, list_type)
+
+    def save_checkpoint(self, run_id, list_type, usernames, cursor=None):
+        self._db.save_checkpoint(run_id, list_type, usernames, cursor=cursor)
+
+    def load_checkpoint(self, run_id, list_type):
+        return self._db.load_checkpoint(run_id, list_type)
+
+    def load_checkpoint_cursor(self, run_id, list_type):
+        return self._db.load_checkpoint_cursor(run_id, list_type)
+
+    def get_rotation(self, target_id, list_type):
+        return self._db.get_rotation(target_id, list_type)
+
+    def _require_transaction(self):
+        if self._owner._pending_writes is None:
+            raise RuntimeError("HelperDatabase writes need the owner's run_transaction() to be open")
+
+    def write(self, op):
+        self._require_transaction()
+        return self._owner.write(op)
+
+    def save_rotation(self, target_id, list_type, rotation_started_at, cursor, runs):
+        self._require_transaction()
+        self._owner.save_rotation(target_id, list_type, rotation_started_at, cursor, runs)
+
+    def add_count(self, **kwargs):
+        self._require_transaction()
+        self._owner.add_count(**kwargs)
+
+    def close(self):
+        self._db.close()
+        self._db.engine.dispose()
+
+
+def process_tree_rss_mb(root_pid: Optional[int]) -> Optional[float]:
+    """Resident memory of a process and its descendants (ChromeDriver + Chrome), via ps. None if unknown."""
+    if not root_pid or os.name == "nt":
+        return None
+    try:
+        output = subprocess.run(
+            ["ps", "-A", "-o", "pid=,ppid=,rss="], capture_output=True, text=True, timeout=10, check=True
+        ).stdout
+    except Exception:
+        return None
+    children = {}
+    rss = {}
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) != 3 or not all(p.isdigit() for p in parts):
+            continue
+        pid, ppid, kb = (int(p) for p in parts)
+        children.setdefault(ppid, []).append(pid)
+        rss[pid] = kb
+    if root_pid not in rss:
+        return None
+    total = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += rss.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total / 1024.0
+
+
+class DriverPool:
+    """
+    Bounded pool of browser workers for multi-target mode. Each worker is a tracker
+    built by tracker_factory(db) around a QueuedDatabase, keeps its browser between
+    targets, and recycles it after recycle_after_runs runs or once the browser's
+    process tree exceeds max_rss_mb (0 disables either limit).
+    """
+
+    def __init__(self, size: int, tracker_factory: Callable, max_rss_mb: float = 0.0,
+                 recycle_after_runs: int = 0, db_path: str = "instagram_tracker.db"):
+        self.size = max(1, size)
+        self.max_rss_mb = max_rss_mb
+        self.recycle_after_runs = recycle_after_runs
+        self.writer = DbWriter(db_path)
+        self.trackers = [tracker_factory(QueuedDatabase(self.writer)) for _ in range(self.size)]
+        self._idle = queue.Queue()
+        for tracker in self.trackers:
+            self._idle.put(tracker)
+        self._print_lock = threading.Lock()
+
+    def _run_target(self, target_name: str) -> dict:
+        tracker = self._idle.get()
+        try:
+            tracker.target_account = target_name
+            result = tracker.run(keep_driver=True, recycle_after_runs=self.recycle_after_runs)
+            rss_mb = process_tree_rss_mb(tracker.driver_service_pid) if tracker.driver else None
+            if rss_mb is not None:
+                result["browser_rss_mb"] = round(rss_mb, 1)
+                if self.max_rss_mb > 0 and rss_mb > self.max_rss_mb:
+                    with self._print_lock:
+                        print(f"Browser for {target_name} uses {rss_mb:.0f} MB (cap {self.max_rss_mb:.0f} MB); recycling")
+                    tracker.close_driver()
+            return result
+        finally:
+            self._idle.put(tracker)
+
+    def run_batch(self, target_names: List[str], keep_browsers: bool = True) -> List[Tuple[str, dict]]:
+        """Scrape every target with at most `size` browsers at once; returns (target, result) in input order."""
+        with ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="pool-worker") as executor:
+            futures = [(name, executor.submit(self._run_target, name)) for name in target_names]
+            results = []
+            for name, future in futures:
+                try:
+                    results.append((name, future.result()))
+                except Exception as e:
+                    results.append((name, {"status": "failed", "error": str(e)}))
+        if not keep_browsers:
+            self.close_browsers()
+        return results
+
+    def close_browsers(self):
+        for tracker in self.trackers:
+            tracker.close_driver()
+
+    def close(self):
+        self.close_browsers()
+        self.writer.close()
@@ -0,0 +1,205 @@
+import json
+import time
+from typing import List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+import store_followers
+
+
+# In-memory stand-in for the slice of the Selenium driver API store_followers uses,
+# so its Python side (harvesting, dedupe, DB diff) can be profiled without a browser.
+# Scripts are recognised by the store_followers constants they are sent as.
+
+_DIALOG = 'div[role="dialog"]'
+_ROW = 'div[role="dialog"] a[role="link"]'
+_ROW_HEIGHT = 40
+_BOX_HEIGHT = 400
+
+
+class FakeElement:
+    def __init__(self, driver: "FakeWebDriver", kind: str, username: Optional[str] = None):
+        self._driver = driver
+        self.kind = kind
+        self.username = username
+
+    def get_attribute(self, name: str):
+        return self._driver.execute("getElementAttribute", {"element": self, "name": name})
+
+    def is_displayed(self) -> bool:
+        return True
+
+    def click(self):
+        self._driver.execute("clickElement", {"element": self})
+
+
+class FakeWebDriver:
+    """
+    Serves a follower modal over `usernames`: `page_size` rows are revealed per
+    scroll, `window` > 0 keeps only the last `window` rows rendered (like the
+    virtualized modal) and every command sleeps `latency_ms` to model the
+    WebDriver round trip. Revealed pages are also logged as performance-log
+    network events so SCRAPE_COLLECTOR=network can be exercised, and list API
+    pages can be fetched by cursor for SCRAPE_ROLLING_COVERAGE.
+    """
+
+    def __init__(self, usernames: List[str], page_size: int = 12, window: int = 0, latency_ms: float = 0.0,
+                 base_url: str = "https://www.instagram.com"):
+        self.usernames = list(usernames)
+        self.page_size = max(page_size, 1)
+        self.window = window
+        self.latency = latency_ms / 1000.0
+        self.base_url = base_url.rstrip("/")
+        self.revealed = 0
+        self.commands = 0
+        self.pages_served = 0
+        self._observer_cursor = None
+        self._performance_log = []
+        self._bodies = {}
+        self._dialog = FakeElement(self, "dialog")
+        self._box = FakeElement(self, "box")
+        self._reveal_page()
+
+    # Rendering model
+
+    def _visible(self) -> List[str]:
+        start = max(0, self.revealed - self.window) if self.window > 0 else 0
+        return self.usernames[start:self.revealed]
+
+    def _page_body(self, start: int) -> str:
+        end = min(start + self.page_size, len(self.usernames))
+        return json.dumps({
+            "users": [{"username": name} for name in self.usernames[start:end]],
+            "next_max_id": str(end) if end < len(self.usernames) else None,
+        })
+
+    def _reveal_page(self):
+        start = self.revealed
+        if start >= len(self.usernames):
+            return
+        self.revealed = min(start + self.page_size, len(self.usernames))
+        request_id = str(len(self._bodies) + 1)
+        url = f"{self.base_url}/api/v1/friendships/1/followers/?count={self.page_size}&max_id={start}"
+        self._bodies[request_id] = self._page_body(start)
+        for method, params in (
+            ("Network.requestWillBeSent",
+             {"requestId": request_id, "request": {"url": url, "method": "GET", "headers": {"X-IG-App-ID": "1"}}}),
+            ("Network.responseReceived",
+             {"requestId": request_id, "response": {"url": url, "mimeType": "application/json"}}),
+            ("Network.loadingFinished", {"requestId": request_id}),
+        ):
+            self._performance_log.append({"message": json.dumps({"message": {"method": method, "params": params}})})
+
+    def _href(self, username: str) -> str:
+        return f"{self.base_url}/{username}/"
+
+    def _scroll_height(self) -> int:
+        return len(self._visible()) * _ROW_HEIGHT
+
+    # Command dispatch; everything goes through execute() so call counters see it
+
+    def execute(self, driver_command, params=None):
+        self.commands += 1
+        if self.latency:
+            time.sleep(self.latency)
+        params = params or {}
+        handler = getattr(self, f"_cmd_{driver_command}", None)
+        if handler is None:
+            raise NotImplementedError(f"FakeWebDriver does not implement {driver_command}")
+        return handler(**params)
+
+    def find_element(self, by=By.ID, value=None):
+        return self.execute("findElement", {"by": by, "value": value})
+
+    def find_elements(self, by=By.ID, value=None):
+        return self.execute("findElements", {"by": by, "value": value})
+
+    def execute_script(self, script, *args):
+        return self.execute("executeScript", {"script": script, "args": list(args)})
+
+    def execute_async_script(self, script, *args):
+        return self.execute("executeAsyncScript", {"script": script, "args": list(args)})
+
+    def get_log(self, log_type):
+        return self.execute("getLog", {"log_type": log_type})
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        return self.execute("executeCdpCommand", {"cmd": cmd, "cmd_args": cmd_args})
+
+    def _cmd_findElements(self, by, value):
+        if by == By.CSS_SELECTOR and value == _ROW:
+            return [FakeElement(self, "row", name) for name in self._visible()]
+        if by == By.CSS_SELECTOR and value == _DIALOG:
+            return [self._dialog]
+        if by == By.XPATH or (by == By.CSS_SELECTOR and value.startswith(_DIALOG)):
+            return [self._box]
+        return []
+
+    def _cmd_findElement(self, by, value):
+        found = self._cmd_findElements(by, value)
+        if not found:
+            raise NoSuchElementException(f"FakeWebDriver has no element for {by}={value}")
+        return found[0]
+
+    def _cmd_getElementAttribute(self, element, name):
+        if name == "href" and element.kind == "row":
+            return self._href(element.username)
+        return None
+
+    def _cmd_clickElement(self, element):
+        return None
+
+    def _cmd_getLog(self, log_type):
+        if log_type != "performance":
+            return []
+        entries, self._performance_log = self._performance_log, []
+        return entries
+
+    def _cmd_executeCdpCommand(self, cmd, cmd_args):
+        if cmd == "Network.getResponseBody":
+            return {"body": self._bodies.pop(cmd_args["requestId"]), "base64Encoded": False}
+        return {}
+
+    def _cmd_executeAsyncScript(self, script, args):
+        if script == store_followers._PAGE_FETCH_SCRIPT:
+            # Cursor replay of the list API, as rolling coverage issues it
+            max_id = (parse_qs(urlsplit(args[0]).query).get("max_id") or ["0"])[0]
+            self.pages_served += 1
+            return self._page_body(int(max_id)) if max_id.isdigit() else None
+        return None
+
+    def _cmd_executeScript(self, script, args):
+        if script == store_followers._HARVEST_SCRIPT:
+            return self._visible()
+        if script == store_followers._SCROLL_SCRIPT:
+            self._reveal_page()
+            return None
+        if script == store_followers._PROBE_SCRIPT:
+            visible = self._visible()
+            return [len(visible), self._scroll_height(), self._href(visible[-1]) if visible else ""]
+        if script == store_followers._OBSERVER_INSTALL_SCRIPT:
+            if self._observer_cursor is None:
+                self._observer_cursor = max(0, self.revealed - len(self._visible()))
+            return True
+        if script == store_followers._OBSERVER_DRAIN_SCRIPT:
+            if self._observer_cursor is None:
+                return None
+            names = self.usernames[self._observer_cursor:self.revealed]
+            self._observer_cursor = self.revealed
+            return names
+        if script == store_followers._OBSERVER_TEARDOWN_SCRIPT:
+            self._observer_cursor = None
+            return None
+        if "getComputedStyle" in script:
+            # _find_scroll_container's overflow detection
+            return self._box
+        if "scrollTop = arguments[0].scrollHeight" in script or "window.scrollTo" in script:
+            self._reveal_page()
+            return None
+        if "clientHeight" in script and script.strip().startswith("return"):
+            return _BOX_HEIGHT
+        if "scrollHeight" in script and script.strip().startswith("return"):
+            return self._scroll_height()
+        return None
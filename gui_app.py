@@ -1,7 +1,6 @@
 import os
 import sys
 import time
-import sqlite3
 import threading
 import subprocess
 import importlib.util
@@ -19,6 +18,9 @@ from tkinter import ttk, filedialog
 
 from dotenv import load_dotenv
 
+import db_connection
+from dashboard_queries import DAY_CHANGE_ROWS_SQL
+
 try:
     from tkcalendar import Calendar
 except Exception:
@@ -501,7 +503,7 @@ def _read_last_run():
     if not DB_PATH.exists():
         return None
     try:
-        conn = sqlite3.connect(str(DB_PATH), timeout=1)
+        conn = db_connection.connect(DB_PATH, readonly=True, timeout=1)
         try:
             row = conn.execute(
                 "SELECT run_started_at, run_finished_at, status "
@@ -523,7 +525,7 @@ def _read_last_success_run():
     if not DB_PATH.exists():
         return None
     try:
-        conn = sqlite3.connect(str(DB_PATH), timeout=1)
+        conn = db_connection.connect(DB_PATH, readonly=True, timeout=1)
         try:
             row = conn.execute(
                 "SELECT run_started_at, run_finished_at "
@@ -1730,7 +1732,7 @@ class TrackerGUI:
         run_count = 0
         if db_exists:
             try:
-                conn = sqlite3.connect(str(DB_PATH), timeout=1)
+                conn = db_connection.connect(DB_PATH, readonly=True, timeout=1)
                 try:
                     run_count = conn.execute("SELECT COUNT(1) FROM run_history").fetchone()[0]
                 finally:
@@ -1819,7 +1821,7 @@ class TrackerGUI:
         run_times = []
         if DB_PATH.exists():
             try:
-                conn = sqlite3.connect(str(DB_PATH), timeout=1)
+                conn = db_connection.connect(DB_PATH, readonly=True, timeout=1)
                 try:
                     run_rows = conn.execute(
                         "SELECT run_started_at FROM run_history ORDER BY run_started_at DESC LIMIT 5000"
@@ -2020,7 +2022,7 @@ class TrackerGUI:
     def _query_daily_rows(self, target_name, list_type):
         if not DB_PATH.exists():
             return []
-        conn = sqlite3.connect(str(DB_PATH), timeout=2)
+        conn = db_connection.connect(DB_PATH, readonly=True, timeout=2)
         try:
             new_rows = conn.execute(
                 """
@@ -2088,29 +2090,19 @@ class TrackerGUI:
     def _query_day_changes(self, day_str, target_name, list_type, event_type):
         if not DB_PATH.exists():
             return []
-        ts_col = "first_seen_run_at" if event_type == "new" else "lost_at_run_at"
-        type_sql = ""
+        # IN lists on target_id/is_follower keep the (target_id, is_follower, ts) index usable.
+        follower_values = (1, 0)
         if list_type == "followers":
-            type_sql = " AND ff.is_follower = 1"
+            follower_values = (1, 1)
         elif list_type == "followings":
-            type_sql = " AND ff.is_follower = 0"
+            follower_values = (0, 0)
         start_utc, end_utc = _local_day_to_utc_range(day_str)
 
-        conn = sqlite3.connect(str(DB_PATH), timeout=2)
+        conn = db_connection.connect(DB_PATH, readonly=True, timeout=2)
         try:
             rows = conn.execute(
-                f"""
-                SELECT ff.follower_following_username, ff.is_follower, ff.{ts_col}
-                FROM followers_followings ff
-                JOIN targets t ON t.id = ff.target_id
-                WHERE ff.{ts_col} IS NOT NULL
-                  AND ff.{ts_col} >= ?
-                  AND ff.{ts_col} <= ?
-                  AND (? = '' OR t.username = ?)
-                  {type_sql}
-                ORDER BY ff.{ts_col} ASC, ff.follower_following_username ASC
-                """,
-                (start_utc, end_utc, target_name, target_name),
+                DAY_CHANGE_ROWS_SQL[event_type],
+                (start_utc, end_utc, target_name, target_name, *follower_values),
             ).fetchall()
         finally:
             conn.close()
@@ -8,11 +8,14 @@ import logging
 import signal
 import subprocess
 import atexit
-import sqlite3
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from logging.handlers import RotatingFileHandler
 from datetime import datetime
 import pytz
 from dotenv import load_dotenv
+import db_connection
 from database import Database
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -22,8 +25,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
-from store_followers import store_followers
+from store_followers import store_followers, attach_call_counter, webdriver_call_count
 from alerting import send_alert
+from driver_pool import DriverPool, HelperDatabase
 
 # Load environment variables
 load_dotenv()
@@ -81,7 +85,7 @@ def random_scroll():
 def _last_success_age_hours(db_path="instagram_tracker.db"):
     if not os.path.exists(db_path):
         return None, None
-    conn = sqlite3.connect(db_path, timeout=2)
+    conn = db_connection.connect(db_path, readonly=True, timeout=2)
     try:
         row = conn.execute(
             """
@@ -110,7 +114,7 @@ def _last_success_age_hours(db_path="instagram_tracker.db"):
 def _run_db_quick_check(db_path="instagram_tracker.db"):
     if not os.path.exists(db_path):
         return True, "database file not found"
-    conn = sqlite3.connect(db_path, timeout=5)
+    conn = db_connection.connect(db_path, readonly=True, timeout=5)
     try:
         row = conn.execute("PRAGMA quick_check(1);").fetchone()
     finally:
@@ -124,7 +128,7 @@ def _run_db_quick_check(db_path="instagram_tracker.db"):
 def _vacuum_db(db_path="instagram_tracker.db"):
     if not os.path.exists(db_path):
         return False
-    conn = sqlite3.connect(db_path, timeout=30)
+    conn = db_connection.connect(db_path, timeout=30)
     try:
         conn.execute("VACUUM;")
         conn.commit()
@@ -136,6 +140,90 @@ def _vacuum_db(db_path="instagram_tracker.db"):
         conn.close()
 
 
+# Only hrefs are read from the follower modal, so avatars, video and webfonts are dead weight.
+LEAN_BLOCKED_URL_PATTERNS = [
+    "*.jpg*", "*.jpeg*", "*.png*", "*.webp*", "*.gif*", "*.heic*", "*.svg*",
+    "*.mp4*", "*.m4v*", "*.webm*", "*.m3u8*",
+    "*.woff*", "*.woff2*", "*.ttf*", "*.otf*",
+]
+
+# Resource timing keeps only 250 entries by default; grow it before any page script runs.
+_RESOURCE_TIMING_BUFFER_SCRIPT = "performance.setResourceTimingBufferSize(100000);"
+
+_PAGE_METRICS_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+let bytes = nav ? (nav.transferSize || 0) : 0;
+for (const r of resources) { bytes += r.transferSize || 0; }
+return {
+    bytes: bytes,
+    resources: resources.length,
+    load_seconds: nav && nav.loadEventEnd > 0 ? nav.loadEventEnd / 1000 : null,
+};
+"""
+
+
+# Returned by the followings helper when its browser never reached the profile.
+_HELPER_UNAVAILABLE = object()
+
+
+def _installed_chrome_version():
+    """Local Chrome version lookup (runs the browser binary / registry, no network)."""
+    try:
+        return ChromeDriverManager().driver.get_browser_version_from_os()
+    except Exception:
+        return None
+
+
+def _resolve_chromedriver_path():
+    """
+    Returns (driver_path, source). ChromeDriverManager().install() does a network
+    version check on every call, so its result is cached in CHROMEDRIVER_CACHE_FILE
+    keyed by the installed Chrome version for CHROMEDRIVER_CACHE_TTL_HOURS. When the
+    lookup fails (e.g. offline) the last known-good driver is used if it still exists.
+    """
+    cache_file = os.getenv("CHROMEDRIVER_CACHE_FILE", "chromedriver_cache.json")
+    try:
+        ttl_hours = float(os.getenv("CHROMEDRIVER_CACHE_TTL_HOURS", "24"))
+    except ValueError:
+        ttl_hours = 24.0
+    cache = {}
+    try:
+        with open(cache_file, "r") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    cached_path = cache.get("driver_path")
+    cached_ok = bool(cached_path) and os.path.exists(cached_path)
+
+    chrome_version = _installed_chrome_version()
+    age_hours = (time.time() - float(cache.get("resolved_at", 0))) / 3600.0
+    if (
+        cached_ok
+        and ttl_hours > 0
+        and age_hours < ttl_hours
+        and cache.get("chrome_version") == chrome_version
+    ):
+        return cached_path, "cache"
+
+    try:
+        driver_path = ChromeDriverManager().install()
+    except Exception as e:
+        if cached_ok:
+            print(f"ChromeDriver lookup failed ({e}); using last known-good driver {cached_path}")
+            return cached_path, "offline-fallback"
+        raise
+    try:
+        with open(cache_file, "w") as f:
+            json.dump(
+                {"chrome_version": chrome_version, "driver_path": driver_path, "resolved_at": time.time()},
+                f,
+            )
+    except OSError as e:
+        print(f"Could not write ChromeDriver cache {cache_file}: {e}")
+    return driver_path, "resolved"
+
+
 class SingleInstanceLock:
     def __init__(self, lock_path):
         self.lock_path = lock_path
@@ -181,16 +269,67 @@ class SingleInstanceLock:
         self.acquired = False
 
 class InstagramTracker:
-    def __init__(self):
-        self.db = Database()
+    def __init__(self, db=None):
+        # Driver-pool workers pass a driver_pool.QueuedDatabase so all writes go through one writer.
+        self.db = db if db is not None else Database()
         self.username = os.getenv('IG_USERNAME')
         self.password = os.getenv('IG_PASSWORD')
         self.target_account = os.getenv('TARGET_ACCOUNT')
+        # Overridable so runs can target a local stand-in (standin_server.py)
+        self.base_url = os.getenv('IG_BASE_URL', 'https://www.instagram.com').rstrip('/')
         self.driver = None
         self.driver_service = None
         self.driver_service_pid = None
         self.cookies_file = 'instagram_cookies.json'
         self.cookie_invalid_detected = False
+        self.driver_runs = 0
+        self.driver_startup = None
+        self.lean_profile = False
+        self.scrape_stats = {}
+        # Shared with the parallel followings helper (copy.copy keeps the same dict).
+        self.followings_stats = {}
+        self.scrape_incremental = False
+        self.scrape_verify_unchanged = {}
+        self.run_phases = []
+        # setup_driver/login timed by prewarm(), saved with the run that uses the session
+        self.prewarm_phases = []
+
+    def adopt_driver(self, previous):
+        """Take over a live browser session from the previous loop iteration's tracker."""
+        self.driver = previous.driver
+        self.driver_service = previous.driver_service
+        self.driver_service_pid = previous.driver_service_pid
+        self.driver_runs = previous.driver_runs
+        previous.driver = None
+        previous.driver_service = None
+        previous.driver_service_pid = None
+
+    def session_alive(self):
+        """Cheap reuse check: the browser still answers and still holds a session cookie."""
+        if not self.driver:
+            return False
+        try:
+            current_url = self.driver.current_url
+        except Exception as e:
+            print(f"Kept browser is not responding: {e}")
+            return False
+        if not current_url.startswith(self.base_url):
+            return False
+        return self.has_session_cookie()
+
+    def close_driver(self):
+        if not self.driver:
+            return
+        print(f"WebDriver calls by this browser: {webdriver_call_count(self.driver)}")
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logging.exception("Driver quit failed: %s", e)
+        self._force_kill_driver()
+        self.driver = None
+        self.driver_service = None
+        self.driver_service_pid = None
+        self.driver_runs = 0
         
     def close_modal(self):
         """Attempt to close any open Instagram modal dialog."""
@@ -246,27 +385,88 @@ class InstagramTracker:
             
         # Use a realistic user agent
         chrome_options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+        if (os.getenv("SCRAPE_COLLECTOR", "script").strip().lower() == "network"
+                or os.getenv("SCRAPE_ROLLING_COVERAGE", "false").lower() == "true"):
+            # The network collector (also used by rolling coverage) reads list pages from Network.* events in the performance log
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+        self.lean_profile = os.getenv("SCRAPE_LEAN_PROFILE", "true").lower() == "true"
+        if self.lean_profile:
+            # Content setting 2 = block; covers images the URL patterns miss (e.g. extensionless CDN URLs)
+            chrome_options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+            })
         
-        # Use ChromeDriverManager to automatically handle driver installation
         # Check if a custom driver path is specified (for Docker environments)
+        resolve_started = time.monotonic()
         chromedriver_path = os.getenv("CHROMEDRIVER_PATH")
         if chromedriver_path and os.path.exists(chromedriver_path):
             service = Service(chromedriver_path)
+            driver_source = "CHROMEDRIVER_PATH"
         else:
-            # Use ChromeDriverManager to automatically download and manage the driver
-            service = Service(ChromeDriverManager().install())
-            
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            # ChromeDriverManager, behind a per-Chrome-version cache with offline fallback
+            driver_path, driver_source = _resolve_chromedriver_path()
+            service = Service(driver_path)
+        resolve_seconds = time.monotonic() - resolve_started
+
+        launch_started = time.monotonic()
+        self.driver = attach_call_counter(webdriver.Chrome(service=service, options=chrome_options))
+        self.driver_startup = {
+            "resolve_seconds": round(resolve_seconds, 3),
+            "resolve_source": driver_source,
+            "launch_seconds": round(time.monotonic() - launch_started, 3),
+        }
+        print(
+            f"Driver startup: resolve {self.driver_startup['resolve_seconds']}s ({driver_source}), "
+            f"launch {self.driver_startup['launch_seconds']}s"
+        )
         self.driver_service = service
         try:
             self.driver_service_pid = self.driver_service.process.pid
         except Exception:
             self.driver_service_pid = None
         self.driver.implicitly_wait(10)
+        self._setup_page_instrumentation()
         
         # Set window size to look more natural
         self.driver.set_window_size(1280, 800)
     
+    def _setup_page_instrumentation(self):
+        """CDP setup: request blocking for the lean profile and an unbounded resource timing buffer."""
+        try:
+            self.driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument", {"source": _RESOURCE_TIMING_BUFFER_SCRIPT}
+            )
+            if self.lean_profile:
+                self.driver.execute_cdp_cmd("Network.enable", {})
+                self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URL_PATTERNS})
+                print(f"Lean profile: blocking {len(LEAN_BLOCKED_URL_PATTERNS)} image/media/font URL patterns")
+        except Exception as e:
+            print(f"Could not apply CDP page settings: {e}")
+
+    def page_metrics(self):
+        """
+        Bytes transferred and load time of the current page from the performance API.
+        Cross-origin resources without Timing-Allow-Origin report 0 bytes, so this
+        is a lower bound; it is meant for comparing runs with the lean profile on/off.
+        """
+        try:
+            metrics = self.driver.execute_script(_PAGE_METRICS_SCRIPT)
+        except Exception as e:
+            print(f"Could not read page metrics: {e}")
+            return None
+        if not metrics:
+            return None
+        load_seconds = metrics.get("load_seconds")
+        return {
+            "bytes": int(metrics.get("bytes") or 0),
+            "resources": int(metrics.get("resources") or 0),
+            "load_seconds": round(load_seconds, 2) if load_seconds is not None else None,
+            "lean_profile": self.lean_profile,
+        }
+
     def login(self, skip_cookie_login=False):
         try:
             print("Attempting to log in to Instagram...")
@@ -285,7 +485,7 @@ class InstagramTracker:
                             print(f"Failed to delete invalid cookie file: {e}")
                 
             print("Performing fresh login...")
-            self.driver.get('https://www.instagram.com/')
+            self.driver.get(f'{self.base_url}/')
             random_sleep(3, 6)
             
             # Wait for and find username input
@@ -392,7 +592,7 @@ class InstagramTracker:
         """Load and set saved cookies if they exist"""
         try:
             if os.path.exists(self.cookies_file):
-                self.driver.get('https://www.instagram.com/')
+                self.driver.get(f'{self.base_url}/')
                 random_sleep(2, 4)
                 
                 with open(self.cookies_file, 'r') as f:
@@ -423,7 +623,7 @@ class InstagramTracker:
     def navigate_to_profile(self):
         try:
             print(f"Navigating to profile: {self.target_account}")
-            self.driver.get(f'https://www.instagram.com/{self.target_account}/')
+            self.driver.get(f'{self.base_url}/{self.target_account}/')
             
             # Wait for profile to load by checking for profile elements
             try:
@@ -496,6 +696,9 @@ class InstagramTracker:
                         run_id=run_id,
                         prev_run_started_at=prev_run_started_at,
                         expected_total=followers_count,
+                        stats=self.scrape_stats,
+                        incremental=self.scrape_incremental,
+                        verify_unchanged=self.scrape_verify_unchanged.get("followers", False),
                     )
                     if followers_list is not None and len(followers_list) > 0:
                         print(f"Successfully scraped {len(followers_list)} followers")
@@ -512,6 +715,9 @@ class InstagramTracker:
                                 run_id=run_id,
                                 prev_run_started_at=prev_run_started_at,
                                 expected_total=followers_count,
+                                stats=self.scrape_stats,
+                                incremental=self.scrape_incremental,
+                                verify_unchanged=self.scrape_verify_unchanged.get("followers", False),
                             )
                             print(f"Retry followers scraped: {len(followers_list)}")
                 except Exception as e:
@@ -531,6 +737,19 @@ class InstagramTracker:
             print(f"Error getting followers info: {str(e)}")
             return None
 
+    def read_header_counts(self):
+        """{"followers": n, "followings": n} from the profile header, or None if either can't be read."""
+        try:
+            followers_link = self.driver.find_element(By.CSS_SELECTOR, 'a[href*="/followers/"]')
+            followings_link = self.driver.find_element(By.CSS_SELECTOR, 'a[href*="/following/"]')
+            return {
+                "followers": int(followers_link.find_element(By.CSS_SELECTOR, 'span[class*="x5n08af"] span').text.replace(',', '')),
+                "followings": int(followings_link.find_element(By.CSS_SELECTOR, 'span span').text.replace(',', '')),
+            }
+        except Exception as e:
+            print(f"Could not read header counts: {e}")
+            return None
+
     def get_followings_info(self, target, run_started_at, run_id, prev_run_started_at):
         try:
             print("Getting followings information...")
@@ -592,6 +811,9 @@ class InstagramTracker:
                         run_id=run_id,
                         prev_run_started_at=prev_run_started_at,
                         expected_total=followings_count,
+                        stats=self.followings_stats,
+                        incremental=self.scrape_incremental,
+                        verify_unchanged=self.scrape_verify_unchanged.get("followings", False),
                     )
                     if current_followings_list is not None and len(current_followings_list) > 0:
                         print(f"Successfully scraped {len(current_followings_list)} followings")
@@ -608,6 +830,9 @@ class InstagramTracker:
                                 run_id=run_id,
                                 prev_run_started_at=prev_run_started_at,
                                 expected_total=followings_count,
+                                stats=self.followings_stats,
+                                incremental=self.scrape_incremental,
+                                verify_unchanged=self.scrape_verify_unchanged.get("followings", False),
                             )
                             print(f"Retry followings scraped: {len(current_followings_list)}")
                 except Exception as e:
@@ -627,70 +852,341 @@ class InstagramTracker:
             print(f"Error getting followings info: {str(e)}")
             return None
 
-    def run(self):
+    def prewarm(self):
+        """
+        Launch and authenticate the browser ahead of the next scheduled run so run()
+        starts on a ready session. A failed pre-warm closes the browser and leaves
+        the normal cold start (and its error reporting) to run(). The setup_driver
+        and login phases are kept in prewarm_phases for run() to save with its own.
+        """
+        started = time.monotonic()
+        self.prewarm_phases = []
+        if self.session_alive():
+            print("Pre-warm: kept browser session is still valid")
+            return True
+        self.run_phases = []
+        ok = self._start_session({})
+        if ok:
+            self.prewarm_phases = self.run_phases
+        else:
+            self.close_driver()
+        self.run_phases = []
+        print(f"Pre-warm {'ready' if ok else 'failed'} after {time.monotonic() - started:.1f}s")
+        return ok
+
+    def _open_followings_helper(self, cookies, target, run_started_at, run_id, prev_run_started_at):
+        """
+        Runs on a worker thread: a second browser that takes over this session's
+        cookies, opens the target profile and scrapes the followings modal while the
+        main browser scrapes followers. A plain Database is swapped for a HelperDatabase
+        opened on this thread (sqlite3 connections can't cross threads); its run writes
+        are only queued in the open run_transaction() and applied by the main thread.
+        A QueuedDatabase already runs every call on its writer thread and is shared.
+        Returns the followings count, or _HELPER_UNAVAILABLE if the helper browser
+        could not reach the profile (the caller then scrapes followings itself).
+        """
+        helper = copy.copy(self)
+        helper.driver = None
+        helper.driver_service = None
+        helper.driver_service_pid = None
+        helper.driver_runs = 0
+        helper.scrape_stats = {}
+        try:
+            if isinstance(self.db, Database):
+                helper.db = HelperDatabase(self.db)
+            helper.setup_driver()
+            helper.driver.get(f'{self.base_url}/')
+            for cookie in cookies:
+                helper.driver.add_cookie(cookie)
+            if not helper.navigate_to_profile():
+                print("Followings helper browser could not load the profile")
+                return _HELPER_UNAVAILABLE
+            # helper.run_phases is this tracker's list (copy.copy), so the phase lands with the run
+            with helper._phase("followings") as phase:
+                count = helper.get_followings_info(target, run_started_at, run_id, prev_run_started_at)
+                phase.update(iterations=helper.followings_stats.get("iterations"),
+                             rows=helper.followings_stats.get("collected"))
+            return count
+        except Exception as e:
+            print(f"Followings helper browser failed: {e}")
+            return _HELPER_UNAVAILABLE
+        finally:
+            helper.close_driver()
+            if helper.db is not self.db:
+                helper.db.close()
+
+    def _begin_phase(self, name):
+        return {
+            "phase": name,
+            "started_at": datetime.now(pytz.UTC),
+            "_started": time.monotonic(),
+            "_calls": webdriver_call_count(self.driver),
+        }
+
+    def _end_phase(self, entry, iterations=None, rows=None):
+        entry["duration_seconds"] = round(time.monotonic() - entry.pop("_started"), 3)
+        entry["webdriver_calls"] = max(webdriver_call_count(self.driver) - entry.pop("_calls"), 0)
+        entry["iterations"] = iterations
+        entry["rows"] = rows
+        self.run_phases.append(entry)
+
+    @contextmanager
+    def _phase(self, name):
+        """
+        Times a block as a run phase in self.run_phases (written to run_phases with the
+        run). The yielded dict takes optional "iterations"/"rows" counters.
+        """
+        entry = self._begin_phase(name)
+        counters = {}
+        try:
+            yield counters
+        finally:
+            self._end_phase(entry, **counters)
+
+    def _timed_phase(self, name, fn, *args):
+        with self._phase(name):
+            return fn(*args)
+
+    def _start_session(self, result):
+        self.close_driver()
+        self._timed_phase("setup_driver", self.setup_driver)
+        if not self._timed_phase("login", self.login):
+            print("Failed to login, aborting...")
+            result["error"] = "login_failed_after_cookie_invalid" if self.cookie_invalid_detected else "login_failed"
+            return False
+        return True
+
+    def run(self, keep_driver=False, recycle_after_runs=0):
+        """
+        One tracking run. With keep_driver, a browser adopted from the previous run is
+        reused when session_alive() passes (no cold start, no cookie login), and the
+        browser is left open afterwards unless the run failed or it has served
+        recycle_after_runs runs (0 = no limit).
+        """
         run_started_at = datetime.now(pytz.UTC)
         run_record = None
         followers_collected = 0
         followings_collected = 0
         result = {"status": "failed", "error": None}
+        self.scrape_stats = {}
+        self.followings_stats = {}
+        self.scrape_incremental = False
+        self.scrape_verify_unchanged = {}
+        self.run_phases = []
+        prewarm_phases, self.prewarm_phases = self.prewarm_phases, []
+        calls_at_start = webdriver_call_count(self.driver)
+        run_clock = time.monotonic()
         try:
-            self.setup_driver()
-            if not self.login():
-                print("Failed to login, aborting...")
-                result["error"] = "login_failed_after_cookie_invalid" if self.cookie_invalid_detected else "login_failed"
-                return result
-            if not self.navigate_to_profile():
-                print("Failed to load target profile, aborting...")
-                result["error"] = "profile_load_failed"
-                return result
+            # A browser is only present here when it was kept from the last run or pre-warmed.
+            reused = self.session_alive()
+            if reused:
+                print(f"Reusing browser session (run {self.driver_runs + 1} on this browser)")
+                # Its start-up happened before run_started_at, but it was paid for this run
+                self.run_phases.extend(prewarm_phases)
+            else:
+                calls_at_start = 0
+                if not self._start_session(result):
+                    return result
+            if not self._timed_phase("navigate_to_profile", self.navigate_to_profile):
+                if not reused:
+                    print("Failed to load target profile, aborting...")
+                    result["error"] = "profile_load_failed"
+                    return result
+                print("Reused session could not load the profile; restarting the browser...")
+                reused = False
+                calls_at_start = 0
+                if not self._start_session(result):
+                    return result
+                if not self._timed_phase("navigate_to_profile", self.navigate_to_profile):
+                    print("Failed to load target profile, aborting...")
+                    result["error"] = "profile_load_failed"
+                    return result
 
             target = self.db.get_or_create_target(self.target_account)
-            prev_run = self.db.get_last_run(target.id)
+            interrupted_run = None
+            if int(os.getenv("SCRAPE_CHECKPOINT_EVERY", "500") or 0) > 0:
+                interrupted_run = self.db.claim_interrupted_run(
+                    target.id, float(os.getenv("SCRAPE_RESUME_MAX_AGE_MINUTES", "120"))
+                )
+            if interrupted_run is not None:
+                # Same run_id and timestamps, so store_followers tops up from its checkpoints.
+                run_record = interrupted_run
+                run_started_at = run_record.run_started_at
+                if run_started_at.tzinfo is None:
+                    run_started_at = pytz.UTC.localize(run_started_at)
+                prev_run = self.db.get_last_run(target.id, before=run_record.run_started_at)
+                result["resumed_run_id"] = run_record.id
+                print(f"Resuming interrupted run {run_record.id} started at {run_started_at.isoformat()}")
+            else:
+                prev_run = self.db.get_last_run(target.id)
+                # The "running" row is committed up front so status readers can see the run;
+                # counts, both diffs and finish_run then land in one transaction at the end.
+                run_record = self.db.start_run(target.id, run_started_at)
             prev_run_started_at = prev_run.run_started_at if prev_run else None
-            run_record = self.db.start_run(target.id, run_started_at)
             run_id = run_record.id
+            if os.getenv("SCRAPE_INCREMENTAL", "false").lower() == "true":
+                full_every = int(os.getenv("SCRAPE_FULL_EVERY_RUNS", "10"))
+                since_full = self.db.runs_since_full_scrape(target.id)
+                self.scrape_incremental = since_full is not None and (full_every <= 0 or since_full + 1 < full_every)
+                print(
+                    f"Scrape mode: {'incremental' if self.scrape_incremental else 'full reconciliation'} "
+                    f"({'no full scrape yet' if since_full is None else f'{since_full} runs since the last full scrape'})"
+                )
+            if os.getenv("SCRAPE_SKIP_UNCHANGED", "false").lower() == "true" and prev_run is not None:
+                max_skips = int(os.getenv("SCRAPE_SKIP_UNCHANGED_MAX_CONSECUTIVE", "5"))
+                header = self.read_header_counts()
+                previous = self.db.get_run_counts(prev_run.id) if header is not None else {}
+                for list_type in ("followers", "followings"):
+                    skips = self.db.consecutive_unchanged_runs(target.id, list_type)
+                    if skips >= max_skips:
+                        print(f"{list_type}: {skips} unchanged runs in a row (max {max_skips}); scraping it in full")
+                    elif header is not None and previous.get(list_type) == header[list_type]:
+                        self.scrape_verify_unchanged[list_type] = True
+                        print(f"{list_type}: header count {header[list_type]} unchanged since the last run; "
+                              f"verifying the first page")
 
-            followers_count = self.get_followers_info(target, run_started_at, run_id, prev_run_started_at)
-            if followers_count is None:
-                print("Failed to get followers information, but continuing...")
-            else:
-                print(f"Successfully processed {followers_count} followers")
-                followers_collected = followers_count
+            with self.db.run_transaction():
+                lists_started = time.monotonic()
+                followings_helper = None
+                if os.getenv("PARALLEL_LISTS", "false").lower() == "true":
+                    # Reading target.id reloads the attributes start_run's commit expired, so
+                    # the helper thread never triggers a refresh on the shared session.
+                    print(f"Scraping followers and followings in parallel browsers for target id {target.id}")
+                    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="followings-helper")
+                    followings_helper = executor.submit(
+                        self._open_followings_helper, self.driver.get_cookies(),
+                        target, run_started_at, run_id, prev_run_started_at,
+                    )
+                    executor.shutdown(wait=False)
+                try:
+                    with self._phase("followers") as phase:
+                        followers_count = self.get_followers_info(target, run_started_at, run_id, prev_run_started_at)
+                        phase.update(iterations=self.scrape_stats.get("iterations"), rows=self.scrape_stats.get("collected"))
+                except Exception:
+                    if followings_helper is not None:
+                        # Its writes are queued in this transaction; let it finish before unwinding.
+                        followings_helper.result()
+                    raise
+                first_scroll = self.scrape_stats.get("first_scroll_monotonic")
+                if first_scroll is not None:
+                    result["time_to_first_scroll"] = round(first_scroll - run_clock, 2)
+                    print(
+                        f"Time to first scroll: {result['time_to_first_scroll']}s "
+                        f"({'ready browser' if reused else 'cold start'})"
+                    )
+                if followers_count is None:
+                    print("Failed to get followers information, but continuing...")
+                else:
+                    print(f"Successfully processed {followers_count} followers")
+                    followers_collected = followers_count
 
-            followings_count = self.get_followings_info(target, run_started_at, run_id, prev_run_started_at)
-            if followings_count is None:
-                print("Failed to get followings information, but continuing...")
-            else:
-                print(f"Successfully processed {followings_count} followings")
-                followings_collected = followings_count
+                followings_count = _HELPER_UNAVAILABLE
+                if followings_helper is not None:
+                    followings_count = followings_helper.result()
+                    if followings_count is _HELPER_UNAVAILABLE:
+                        print("Scraping followings on the main browser instead")
+                if followings_count is _HELPER_UNAVAILABLE:
+                    with self._phase("followings") as phase:
+                        followings_count = self.get_followings_info(target, run_started_at, run_id, prev_run_started_at)
+                        phase.update(iterations=self.followings_stats.get("iterations"),
+                                     rows=self.followings_stats.get("collected"))
+                result["lists_seconds"] = round(time.monotonic() - lists_started, 2)
+                print(
+                    f"Both lists scraped in {result['lists_seconds']}s "
+                    f"({'parallel browsers' if followings_helper is not None else 'sequential'})"
+                )
+                if followings_count is None:
+                    print("Failed to get followings information, but continuing...")
+                else:
+                    print(f"Successfully processed {followings_count} followings")
+                    followings_collected = followings_count
 
-            if run_record:
+                list_stats = [self.scrape_stats, self.followings_stats]
+                lost_lists = [name for name, s in zip(("followers", "followings"), list_stats) if s.get("driver_lost")]
+                if lost_lists:
+                    # Finished as "resumable" below: the checkpoints stay and the next run tops up from them
+                    raise RuntimeError(f"browser_lost during {' and '.join(lost_lists)}")
+                # A list that failed or was cut short doesn't count as a full reconciliation
+                modes = {s.get("scrape_mode") for s in list_stats}
+                if modes == {"unchanged"}:
+                    scrape_mode = "unchanged"
+                elif "incremental" in modes:
+                    scrape_mode = "incremental"
+                elif modes == {"full"}:
+                    scrape_mode = "full"
+                else:
+                    # One list skipped as unchanged and the other scraped in full is "mixed"
+                    scrape_mode = "mixed" if modes == {"full", "unchanged"} else "partial"
+                seconds_saved = sum(s.get("seconds_saved") or 0.0 for s in list_stats)
+                result["scrape_mode"] = scrape_mode
+                if scrape_mode == "incremental":
+                    result["scrape_seconds_saved"] = round(seconds_saved, 2)
+                    print(f"Incremental run saved ~{result['scrape_seconds_saved']}s of scrolling")
                 self.db.finish_run(run_record.id, status="success",
                                    followers_collected=followers_collected,
                                    followings_collected=followings_collected,
-                                   finished_at=datetime.now(pytz.UTC))
+                                   finished_at=datetime.now(pytz.UTC),
+                                   scrape_mode=scrape_mode,
+                                   scrape_seconds_saved=result.get("scrape_seconds_saved"),
+                                   followers_scrape_mode=self.scrape_stats.get("scrape_mode"),
+                                   followings_scrape_mode=self.followings_stats.get("scrape_mode"))
+                # Closes when run_transaction() has applied the queued writes and committed
+                db_write = self._begin_phase("db_write")
+            diff_rows = sum((s.get("diff") or {}).get(key) or 0 for s in list_stats for key in ("new", "seen", "lost"))
+            self._end_phase(db_write, rows=diff_rows)
+            # Both lists are scraped on the profile document, so its entries cover the run's traffic.
+            page = self.page_metrics()
+            if page:
+                result["page"] = page
+                print(
+                    f"Profile page traffic: {page['bytes'] / 1024:.0f} KB over {page['resources']} resources, "
+                    f"load {page['load_seconds']}s (lean profile {'on' if page['lean_profile'] else 'off'})"
+                )
             result["status"] = "success"
+            result["webdriver_calls"] = webdriver_call_count(self.driver) - calls_at_start
+            if not reused and self.driver_startup:
+                result["driver_startup"] = self.driver_startup
             result["followers_collected"] = followers_collected
             result["followings_collected"] = followings_collected
         except Exception as e:
             print(f"Error in run: {str(e)}")
             result["error"] = str(e)
             if run_record:
-                self.db.finish_run(run_record.id, status="failed",
+                resumable = any(s.get("driver_lost") for s in (self.scrape_stats, self.followings_stats))
+                self.db.finish_run(run_record.id, status="resumable" if resumable else "failed",
                                    followers_collected=followers_collected,
                                    followings_collected=followings_collected,
                                    finished_at=datetime.now(pytz.UTC))
         finally:
+            if run_record is not None and self.run_phases:
+                self._save_run_phases(run_record.id, result)
             if self.driver:
-                try:
-                    self.driver.quit()
-                except Exception as e:
-                    logging.exception("Driver quit failed: %s", e)
-            self._force_kill_driver()
+                self.driver_runs += 1
+                print(f"WebDriver calls this run: {webdriver_call_count(self.driver) - calls_at_start}")
+                recycle_due = recycle_after_runs > 0 and self.driver_runs >= recycle_after_runs
+                if not keep_driver or result["status"] != "success" or recycle_due:
+                    if keep_driver:
+                        reason = "run failed" if result["status"] != "success" else f"{self.driver_runs} runs served"
+                        print(f"Recycling browser session ({reason})")
+                    self.close_driver()
+            else:
+                self._force_kill_driver()
             self.db.close()
             print("Script finished")
         return result
 
+    def _save_run_phases(self, run_id, result):
+        result["phases"] = {}
+        for entry in self.run_phases:
+            result["phases"][entry["phase"]] = round(
+                result["phases"].get(entry["phase"], 0.0) + entry["duration_seconds"], 3
+            )
+        print("Run phases: " + ", ".join(f"{name} {seconds}s" for name, seconds in result["phases"].items()))
+        try:
+            self.db.add_run_phases(run_id, self.run_phases)
+        except Exception as e:
+            print(f"Could not record run phases: {e}")
+
     def _force_kill_driver(self):
         default_force = "true" if os.name == "nt" else "false"
         force_kill = os.getenv("FORCE_KILL_CHROME", default_force).lower() == "true"
@@ -714,6 +1210,98 @@ class InstagramTracker:
             logging.exception("Force-kill failed: %s", e)
 
 
+def _target_schedule(default_interval_minutes):
+    """
+    [(username, interval_minutes)] from TARGET_ACCOUNTS ("alice,bob:30" - an optional
+    ":minutes" overrides RUN_INTERVAL_MINUTES for that target), else TARGET_ACCOUNT.
+    """
+    raw = os.getenv("TARGET_ACCOUNTS", "").strip()
+    if not raw:
+        single = (os.getenv("TARGET_ACCOUNT") or "").strip()
+        return [(single, default_interval_minutes)] if single else []
+    targets = []
+    for item in raw.split(","):
+        name, _, minutes = item.strip().partition(":")
+        name = name.strip().lstrip("@")
+        if not name or name in dict(targets):
+            continue
+        try:
+            interval = int(minutes) if minutes.strip() else default_interval_minutes
+        except ValueError:
+            print(f"Invalid interval for target '{name}' in TARGET_ACCOUNTS; using {default_interval_minutes}m")
+            interval = default_interval_minutes
+        targets.append((name, max(interval, 1)))
+    return targets
+
+
+def _handle_run_result(run_result, target_name, run_counter, stale_success_hours,
+                       db_integrity_every_runs, db_vacuum_every_runs, stop_on_auth_failure):
+    """Alerts and periodic DB maintenance after one run. Returns True when the loop should stop."""
+    if run_result.get("status") != "success":
+        error_reason = str(run_result.get("error", "unknown"))
+        send_alert(
+            "tracker_run_failed",
+            "Instagram tracker run failed",
+            f"Run for {target_name} failed. Reason: {error_reason}",
+            level="error",
+        )
+        if error_reason in {"login_failed", "login_failed_after_cookie_invalid"}:
+            send_alert(
+                "tracker_auth_failed",
+                "Instagram tracker authentication failed",
+                (
+                    "Authentication failed (cookie and/or credentials). "
+                    "Run login-only mode again and verify IG_PASSWORD in .env."
+                ),
+                level="error",
+            )
+            if stop_on_auth_failure:
+                print("STOP_ON_AUTH_FAILURE is enabled. Exiting loop after authentication failure.")
+                return True
+    elif os.getenv("ALERT_ON_SUCCESS", "false").lower() == "true":
+        send_alert(
+            "tracker_run_success",
+            "Instagram tracker run succeeded",
+            (
+                f"{target_name}: followers processed: {run_result.get('followers_collected', 0)}, "
+                f"followings processed: {run_result.get('followings_collected', 0)}"
+            ),
+            level="info",
+        )
+    if stale_success_hours > 0:
+        age_hours, last_success = _last_success_age_hours()
+        if age_hours is not None and age_hours >= stale_success_hours:
+            send_alert(
+                "tracker_stale_success",
+                "Instagram tracker stale data warning",
+                (
+                    f"No successful run in {age_hours:.1f} hours. "
+                    f"Last successful run: {last_success.isoformat()}."
+                ),
+                level="warning",
+            )
+    if db_integrity_every_runs > 0 and run_counter % db_integrity_every_runs == 0:
+        ok, msg = _run_db_quick_check()
+        if ok:
+            logging.info("SQLite quick_check passed.")
+        else:
+            logging.error("SQLite quick_check failed: %s", msg)
+            send_alert(
+                "tracker_db_quick_check_failed",
+                "Instagram tracker DB integrity warning",
+                f"SQLite quick_check failed: {msg}",
+                level="error",
+            )
+    if (
+        db_vacuum_every_runs > 0
+        and run_counter % db_vacuum_every_runs == 0
+        and run_result.get("status") == "success"
+    ):
+        if _vacuum_db():
+            logging.info("SQLite VACUUM completed.")
+    return False
+
+
 def main():
     setup_logging()
     disable_run_lock = os.getenv("DISABLE_RUN_LOCK", "false").lower() == "true"
@@ -782,77 +1370,112 @@ def main():
             tracker.db.close()
         return
 
+    persistent_driver = os.getenv("PERSISTENT_DRIVER", "false").lower() == "true"
+    try:
+        recycle_after_runs = int(os.getenv("DRIVER_RECYCLE_AFTER_RUNS", "12"))
+    except ValueError:
+        recycle_after_runs = 12
+    try:
+        prewarm_seconds = int(os.getenv("PREWARM_SECONDS", "0"))
+    except ValueError:
+        prewarm_seconds = 0
+    previous_tracker = None
+    next_tracker = None
+    if persistent_driver or prewarm_seconds > 0:
+        # Browsers kept between runs or pre-warmed during the sleep must not outlive the loop.
+        atexit.register(lambda: [t.close_driver() for t in (previous_tracker, next_tracker) if t])
+
+    targets = _target_schedule(interval_minutes)
+    if not targets:
+        print("No target configured. Set TARGET_ACCOUNT or TARGET_ACCOUNTS in .env.")
+        return
+    if len(targets) > 1:
+        print("Multi-target mode: " + ", ".join(f"{name} every {minutes}m" for name, minutes in targets))
+    intervals = dict(targets)
+    next_due = {name: 0.0 for name in intervals}
+    try:
+        pool_size = int(os.getenv("DRIVER_POOL_SIZE", "1"))
+    except ValueError:
+        pool_size = 1
+    pool = None
+    if pool_size > 1 and len(targets) > 1:
+        try:
+            max_rss_mb = float(os.getenv("DRIVER_POOL_MAX_RSS_MB", "0"))
+        except ValueError:
+            max_rss_mb = 0.0
+        pool = DriverPool(min(pool_size, len(targets)), lambda db: InstagramTracker(db=db),
+                          max_rss_mb=max_rss_mb, recycle_after_runs=recycle_after_runs)
+        atexit.register(pool.close)
+        print(f"Driver pool: {pool.size} browsers, one DB writer"
+              + (f", recycle above {max_rss_mb:.0f} MB" if max_rss_mb > 0 else ""))
+        if prewarm_seconds > 0:
+            print("PREWARM_SECONDS is ignored with DRIVER_POOL_SIZE > 1")
+            prewarm_seconds = 0
+
     run_counter = 0
-    while True:
-        run_counter += 1
-        tracker = InstagramTracker()
-        run_result = tracker.run()
-        if run_result.get("status") != "success":
-            error_reason = str(run_result.get("error", "unknown"))
-            send_alert(
-                "tracker_run_failed",
-                "Instagram tracker run failed",
-                f"Run failed. Reason: {error_reason}",
-                level="error",
-            )
-            if error_reason in {"login_failed", "login_failed_after_cookie_invalid"}:
-                send_alert(
-                    "tracker_auth_failed",
-                    "Instagram tracker authentication failed",
-                    (
-                        "Authentication failed (cookie and/or credentials). "
-                        "Run login-only mode again and verify IG_PASSWORD in .env."
-                    ),
-                    level="error",
-                )
-                if stop_on_auth_failure:
-                    print("STOP_ON_AUTH_FAILURE is enabled. Exiting loop after authentication failure.")
-                    break
-        elif os.getenv("ALERT_ON_SUCCESS", "false").lower() == "true":
-            send_alert(
-                "tracker_run_success",
-                "Instagram tracker run succeeded",
-                (
-                    f"Followers processed: {run_result.get('followers_collected', 0)}, "
-                    f"followings processed: {run_result.get('followings_collected', 0)}"
-                ),
-                level="info",
-            )
-        if stale_success_hours > 0:
-            age_hours, last_success = _last_success_age_hours()
-            if age_hours is not None and age_hours >= stale_success_hours:
-                send_alert(
-                    "tracker_stale_success",
-                    "Instagram tracker stale data warning",
-                    (
-                        f"No successful run in {age_hours:.1f} hours. "
-                        f"Last successful run: {last_success.isoformat()}."
-                    ),
-                    level="warning",
-                )
-        if db_integrity_every_runs > 0 and run_counter % db_integrity_every_runs == 0:
-            ok, msg = _run_db_quick_check()
-            if ok:
-                logging.info("SQLite quick_check passed.")
+    stop_requested = False
+    while not stop_requested:
+        now = time.time()
+        due = sorted((name for name in intervals if next_due[name] <= now), key=lambda name: next_due[name])
+        batch_started = time.monotonic()
+        batch_succeeded = 0
+        if pool is not None:
+            batch_results = iter(pool.run_batch(due, keep_browsers=persistent_driver))
+        else:
+            tracker = next_tracker or InstagramTracker()
+            next_tracker = None
+            if persistent_driver and previous_tracker is not None and tracker.driver is None:
+                tracker.adopt_driver(previous_tracker)
+            previous_tracker = tracker
+        for index, target_name in enumerate(due):
+            run_counter += 1
+            if pool is not None:
+                _, run_result = next(batch_results)
             else:
-                logging.error("SQLite quick_check failed: %s", msg)
-                send_alert(
-                    "tracker_db_quick_check_failed",
-                    "Instagram tracker DB integrity warning",
-                    f"SQLite quick_check failed: {msg}",
-                    level="error",
+                # One browser and DB connection serve the whole batch; only the last run may close it.
+                tracker.target_account = target_name
+                last_in_batch = index == len(due) - 1
+                run_result = tracker.run(
+                    keep_driver=persistent_driver or not last_in_batch,
+                    recycle_after_runs=recycle_after_runs,
                 )
-        if (
-            db_vacuum_every_runs > 0
-            and run_counter % db_vacuum_every_runs == 0
-            and run_result.get("status") == "success"
-        ):
-            if _vacuum_db():
-                logging.info("SQLite VACUUM completed.")
-        sleep_seconds = interval_minutes * 60 + random.randint(0, jitter_seconds)
-        print(f"Sleeping for {sleep_seconds} seconds until next run...")
-        time.sleep(sleep_seconds)
+            if run_result.get("status") == "success":
+                batch_succeeded += 1
+            if _handle_run_result(run_result, target_name, run_counter, stale_success_hours,
+                                  db_integrity_every_runs, db_vacuum_every_runs, stop_on_auth_failure):
+                stop_requested = True
+                break
+        # Scheduled from the end of the batch with one jitter, so targets sharing an interval stay batched.
+        batch_jitter = random.randint(0, jitter_seconds)
+        for target_name in due:
+            next_due[target_name] = time.time() + intervals[target_name] * 60 + batch_jitter
+        if len(due) > 1:
+            batch_seconds = max(time.monotonic() - batch_started, 0.001)
+            print(
+                f"Batch finished: {batch_succeeded}/{len(due)} targets in {batch_seconds:.0f}s "
+                f"({len(due) * 3600 / batch_seconds:.1f} targets/hour)"
+            )
+        if stop_requested:
+            break
 
+        upcoming = min(next_due, key=next_due.get)
+        sleep_seconds = max(0.0, next_due[upcoming] - time.time())
+        print(f"Sleeping for {sleep_seconds:.0f} seconds until next run ({upcoming})...")
+        if prewarm_seconds > 0 and sleep_seconds > prewarm_seconds:
+            wake_at = time.monotonic() + sleep_seconds
+            time.sleep(sleep_seconds - prewarm_seconds)
+            print(f"Pre-warming browser {prewarm_seconds}s before the next run...")
+            next_tracker = InstagramTracker()
+            if persistent_driver and previous_tracker is not None:
+                next_tracker.adopt_driver(previous_tracker)
+                previous_tracker = next_tracker
+            next_tracker.prewarm()
+            remaining = wake_at - time.monotonic()
+            if remaining < 0:
+                print(f"Pre-warm overran the schedule by {-remaining:.1f}s; consider raising PREWARM_SECONDS")
+            time.sleep(max(0.0, remaining))
+        else:
+            time.sleep(sleep_seconds)
 
 if __name__ == "__main__":
     main()
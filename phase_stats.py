@@ -0,0 +1,25 @@
+# Run-phase statistics shared by `report.py phases`, /api/v1/phases and the scrape
+# logs in store_followers, so all three order phases and compute percentiles the same
+# way. Stdlib-only, like dashboard_queries.
+
+# main.py records phases in this order; unknown phase names sort after them.
+PHASE_ORDER = ["setup_driver", "login", "navigate_to_profile", "followers", "followings", "db_write"]
+
+
+def ordered_phases(names):
+    """Phase names in PHASE_ORDER, then any others alphabetically."""
+    names = set(names)
+    return [name for name in PHASE_ORDER if name in names] + sorted(names - set(PHASE_ORDER))
+
+
+def percentile(ordered, q):
+    """Nearest-rank percentile (q in 0..1) of an already sorted list, or None if it is empty."""
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def average(values):
+    """Mean of the non-None values rounded to 0.1, or None if there are none."""
+    values = [v for v in values if v is not None]
+    return round(sum(values) / len(values), 1) if values else None
@@ -9,7 +9,9 @@ from rich.table import Table
 from rich.prompt import Prompt
 from rich import box
 import questionary
-from database import Database, FollowerFollowing, Target, RunHistory, Counts
+from sqlalchemy import select
+from database import Database, FollowerFollowing, Target, RunHistory, Counts, RunPhase
+from phase_stats import average, ordered_phases, percentile
 
 console = Console()
 
@@ -140,23 +142,70 @@ def cmd_list_current(db: Database, args):
 
 
 def filter_type(query, type_filter: str):
+    # Always an IN list, so (target_id, is_follower, <timestamp>) indexes can be used.
     if type_filter == "followers":
-        return query.filter(FollowerFollowing.is_follower.is_(True))
+        return query.filter(FollowerFollowing.is_follower.in_([True]))
     if type_filter == "followings":
-        return query.filter(FollowerFollowing.is_follower.is_(False))
-    return query
+        return query.filter(FollowerFollowing.is_follower.in_([False]))
+    return query.filter(FollowerFollowing.is_follower.in_([True, False]))
+
+
+def filter_target(query, target_column, target_name: Optional[str]):
+    target_ids = select(Target.id)
+    if target_name:
+        target_ids = target_ids.where(Target.username == target_name)
+    return query.filter(target_column.in_(target_ids))
+
+
+# Query builders shared with `db_tools.py check-indexes`, which plans what they generate.
+
+def new_query(session, type_filter: str, start: datetime, end: datetime, target_name: Optional[str]):
+    q = session.query(FollowerFollowing, Target.username.label("target"))\
+        .join(Target, Target.id == FollowerFollowing.target_id)
+    q = filter_type(q, type_filter)
+    q = q.filter(FollowerFollowing.first_seen_run_at >= start, FollowerFollowing.first_seen_run_at <= end)
+    q = filter_target(q, FollowerFollowing.target_id, target_name)
+    return q.order_by(FollowerFollowing.first_seen_run_at.asc())
+
+
+def lost_query(session, type_filter: str, start: datetime, end: datetime, target_name: Optional[str]):
+    q = session.query(FollowerFollowing, Target.username.label("target"))\
+        .join(Target, Target.id == FollowerFollowing.target_id)
+    q = filter_type(q, type_filter)
+    q = q.filter(FollowerFollowing.lost_at_run_at != None)\
+         .filter(FollowerFollowing.lost_at_run_at >= start, FollowerFollowing.lost_at_run_at <= end)
+    q = filter_target(q, FollowerFollowing.target_id, target_name)
+    return q.order_by(FollowerFollowing.lost_at_run_at.asc())
+
+
+def summary_queries(session, start: datetime):
+    """(new, lost) change timestamps since start, for every target."""
+    q_new = filter_target(
+        filter_type(session.query(FollowerFollowing.first_seen_run_at, FollowerFollowing.is_follower), "both"),
+        FollowerFollowing.target_id, None,
+    )
+    q_lost = filter_target(
+        filter_type(session.query(FollowerFollowing.lost_at_run_at, FollowerFollowing.is_follower), "both"),
+        FollowerFollowing.target_id, None,
+    )
+    return (
+        q_new.filter(FollowerFollowing.first_seen_run_at >= start),
+        q_lost.filter(FollowerFollowing.lost_at_run_at != None, FollowerFollowing.lost_at_run_at >= start),
+    )
+
+
+def daily_counts_query(session, start: datetime, end: datetime, target_name: Optional[str]):
+    q = session.query(Counts.timestamp, Counts.count_type, Counts.target_id, Counts.count)
+    q = q.filter(Counts.timestamp >= start, Counts.timestamp <= end)
+    q = q.filter(Counts.count_type.in_(["followers", "followings"]))
+    q = filter_target(q, Counts.target_id, target_name)
+    return q.order_by(Counts.timestamp.asc())
 
 
 def cmd_new(db: Database, args):
     start = parse_iso(args.from_date)
     end = parse_iso(args.to_date)
-    q = db.session.query(FollowerFollowing, Target.username.label("target"))\
-        .join(Target, Target.id == FollowerFollowing.target_id)
-    q = filter_type(q, args.type)
-    q = q.filter(FollowerFollowing.first_seen_run_at >= start, FollowerFollowing.first_seen_run_at <= end)
-    if args.target:
-        q = q.filter(Target.username == args.target)
-    rows = q.order_by(FollowerFollowing.first_seen_run_at.asc()).all()
+    rows = new_query(db.session, args.type, start, end, args.target).all()
     table = build_table("New followers/followings", ["target", "username", "type", "first_seen_run_at", "estimated_added_at"])
     for ff, target in rows:
         table.add_row(target, ff.follower_following_username, "follower" if ff.is_follower else "following",
@@ -167,14 +216,7 @@ def cmd_new(db: Database, args):
 def cmd_lost(db: Database, args):
     start = parse_iso(args.from_date)
     end = parse_iso(args.to_date)
-    q = db.session.query(FollowerFollowing, Target.username.label("target"))\
-        .join(Target, Target.id == FollowerFollowing.target_id)
-    q = filter_type(q, args.type)
-    q = q.filter(FollowerFollowing.lost_at_run_at != None)\
-         .filter(FollowerFollowing.lost_at_run_at >= start, FollowerFollowing.lost_at_run_at <= end)
-    if args.target:
-        q = q.filter(Target.username == args.target)
-    rows = q.order_by(FollowerFollowing.lost_at_run_at.asc()).all()
+    rows = lost_query(db.session, args.type, start, end, args.target).all()
     table = build_table("Lost followers/followings", ["target", "username", "type", "lost_at_run_at", "estimated_removed_at"])
     for ff, target in rows:
         table.add_row(target, ff.follower_following_username, "follower" if ff.is_follower else "following",
@@ -207,8 +249,7 @@ def cmd_summary(db: Database, args):
     start_local = end_local - timedelta(days=days)
     end = end_local.astimezone(timezone.utc).replace(tzinfo=None)
     start = start_local.astimezone(timezone.utc).replace(tzinfo=None)
-    q_new = db.session.query(FollowerFollowing.first_seen_run_at, FollowerFollowing.is_follower)
-    q_lost = db.session.query(FollowerFollowing.lost_at_run_at, FollowerFollowing.is_follower)
+    q_new, q_lost = summary_queries(db.session, start)
 
     buckets = {}
     day_cursor = start_local.date()
@@ -221,7 +262,7 @@ def cmd_summary(db: Database, args):
         }
         day_cursor += timedelta(days=1)
 
-    for ts, is_follower in q_new.filter(FollowerFollowing.first_seen_run_at >= start).all():
+    for ts, is_follower in q_new.all():
         if ts is None:
             continue
         day = _to_tz_day(ts, tz_name)
@@ -229,7 +270,7 @@ def cmd_summary(db: Database, args):
             key = "new_followers" if is_follower else "new_followings"
             buckets[day][key] += 1
 
-    for ts, is_follower in q_lost.filter(FollowerFollowing.lost_at_run_at != None, FollowerFollowing.lost_at_run_at >= start).all():
+    for ts, is_follower in q_lost.all():
         if ts is None:
             continue
         day = _to_tz_day(ts, tz_name)
@@ -247,12 +288,7 @@ def cmd_summary(db: Database, args):
 def cmd_daily_counts(db: Database, args):
     start, end = resolve_range(getattr(args, "from_date", None), getattr(args, "to_date", None), getattr(args, "days", None))
     tz_name = getattr(args, "tz", "local")
-    q = db.session.query(Counts.timestamp, Counts.count_type, Counts.target_id, Counts.count)
-    q = q.filter(Counts.timestamp >= start, Counts.timestamp <= end)
-    if args.target:
-        q = q.join(Target, Target.id == Counts.target_id).filter(Target.username == args.target)
-
-    raw_rows = q.order_by(Counts.timestamp.asc()).all()
+    raw_rows = daily_counts_query(db.session, start, end, args.target).all()
     latest_per_key = {}
     for ts, count_type, target_id, count in raw_rows:
         day = _to_tz_day(ts, tz_name)
@@ -340,6 +376,35 @@ def cmd_day_details(db: Database, args):
     )
 
 
+def cmd_phases(db: Database, args):
+    start = utcnow_naive() - timedelta(days=args.days)
+    q = db.session.query(RunPhase, Target.username)\
+        .join(RunHistory, RunHistory.id == RunPhase.run_id)\
+        .join(Target, Target.id == RunHistory.target_id)\
+        .filter(RunHistory.run_started_at >= start)
+    if args.target:
+        q = q.filter(Target.username == args.target)
+
+    by_phase = {}
+    for phase, _target in q.all():
+        by_phase.setdefault(phase.phase, []).append(phase)
+
+    columns = ["phase", "runs", "p50_s", "p95_s", "max_s", "avg_iterations", "avg_rows", "avg_webdriver_calls"]
+    table = build_table(f"Run phases last {args.days} days", columns)
+    export_rows = []
+    for name in ordered_phases(by_phase):
+        phases = by_phase[name]
+        durations = sorted(p.duration_seconds for p in phases)
+        r = [name, len(phases),
+             round(percentile(durations, 0.5), 2), round(percentile(durations, 0.95), 2), round(durations[-1], 2),
+             average(p.iterations for p in phases), average(p.rows for p in phases),
+             average(p.webdriver_calls for p in phases)]
+        table.add_row(*("-" if x is None else str(x) for x in r))
+        export_rows.append(r)
+    console.print(table)
+    _export(export_rows, columns, out_csv=getattr(args, "out_csv", None), out_json=getattr(args, "out_json", None))
+
+
 def menu(db: Database):
     action = questionary.select(
         "Choose report",
@@ -351,6 +416,7 @@ def menu(db: Database):
             "Daily counts",
             "Day details",
             "Current followers/followings",
+            "Run phases",
             "Quit"
         ]).ask()
     if action == "Quit" or action is None:
@@ -385,6 +451,10 @@ def menu(db: Database):
         out_json = Prompt.ask("Save to JSON path (blank to skip)", default="")
         cmd_list_current(db, argparse.Namespace(type=ftype or "both", target=target or None,
                                                 out_csv=out_csv or None, out_json=out_json or None, tz="local"))
+    elif action == "Run phases":
+        days = int(Prompt.ask("Days", default="30"))
+        target = Prompt.ask("Target username (blank for all)", default="")
+        cmd_phases(db, argparse.Namespace(days=days, target=target or None))
 
 
 def build_parser():
@@ -429,6 +499,12 @@ def build_parser():
     p_list.add_argument("--out-csv", help="Path to save CSV output")
     p_list.add_argument("--out-json", help="Path to save JSON output")
 
+    p_phases = sub.add_parser("phases", help="p50/p95 duration per run phase")
+    p_phases.add_argument("--days", type=int, default=30)
+    p_phases.add_argument("--target", help="Target account to filter")
+    p_phases.add_argument("--out-csv", help="Path to save CSV output")
+    p_phases.add_argument("--out-json", help="Path to save JSON output")
+
     parser.add_argument("--menu", action="store_true", help="Launch interactive menu")
     return parser
 
@@ -455,6 +531,8 @@ def main():
             cmd_day_details(db, args)
         elif args.command == "list":
             cmd_list_current(db, args)
+        elif args.command == "phases":
+            cmd_phases(db, args)
         else:
             parser.print_help()
     finally:
@@ -0,0 +1,246 @@
+import argparse
+import asyncio
+import hashlib
+import html
+import json
+import os
+from urllib.parse import parse_qs
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+
+
+# Offline stand-in for the parts of instagram.com that InstagramTracker touches:
+# the login form, a profile header with follower/following counts and a lazy-loading
+# list modal backed by paginated JSON. Point the tracker at it with IG_BASE_URL.
+# The markup mirrors the selectors main.py and store_followers.py rely on.
+
+SESSION_COOKIE = "sessionid"
+
+_LOGO = '<svg aria-label="Instagram" width="24" height="24"><circle cx="12" cy="12" r="10"></circle></svg>'
+
+_LOGIN_PAGE = """<!doctype html>
+<html><head><title>Login</title></head><body>
+<form id="loginForm" method="post" action="/accounts/login/">
+  <div>
+    <div><div><label><input name="username" autocomplete="username"></label></div></div>
+    <div><div><label><input name="password" type="password"></label></div></div>
+    <button type="submit">Log in</button>
+  </div>
+</form>
+</body></html>
+"""
+
+_HOME_PAGE = """<!doctype html>
+<html><head><title>Home</title></head><body>
+<nav>{logo}</nav>
+<main>Signed in.</main>
+</body></html>
+"""
+
+_PROFILE_PAGE = """<!doctype html>
+<html><head><title>{username}</title>
+<style>
+  .row {{ height: 40px; line-height: 40px; }}
+  div[role="dialog"] {{ position: fixed; top: 80px; left: 340px; width: 600px; background: #fff; border: 1px solid #ccc; }}
+</style>
+</head><body>
+<nav>{logo}</nav>
+<header><section>
+  <h2>{username}</h2>
+  <ul>
+    <li><a href="/{username}/followers/" data-list="followers"><span class="x5n08af"><span>{followers_label}</span></span> followers</a></li>
+    <li><a href="/{username}/following/" data-list="following"><span class="x5n08af"><span>{followings_label}</span></span> following</a></li>
+  </ul>
+</section></header>
+<script>
+(() => {{
+  const USER_ID = {user_id};
+  const PAGE_SIZE = {page_size};
+  const WINDOW = {window};
+  const profileUrl = location.pathname;
+  let state = null;
+
+  function closeDialog() {{
+    if (!state) return;
+    state.dialog.remove();
+    state = null;
+    history.pushState(null, '', profileUrl);
+  }}
+
+  async function loadPage() {{
+    const current = state;
+    if (!current || current.loading || current.done) return;
+    current.loading = true;
+    let url = `/api/v1/friendships/${{USER_ID}}/${{current.kind}}/?count=${{PAGE_SIZE}}`;
+    if (current.nextMaxId) url += `&max_id=${{current.nextMaxId}}`;
+    const response = await fetch(url, {{ credentials: 'same-origin' }});
+    const data = await response.json();
+    if (state !== current) return;
+    for (const user of data.users) {{
+      const row = document.createElement('div');
+      row.className = 'row';
+      const link = document.createElement('a');
+      link.setAttribute('role', 'link');
+      link.href = `/${{user.username}}/`;
+      link.textContent = user.username;
+      row.appendChild(link);
+      current.box.appendChild(row);
+    }}
+    if (WINDOW > 0) {{
+      // Virtualized list: drop rows scrolled far out of view, like the real modal
+      while (current.box.children.length > WINDOW) current.box.removeChild(current.box.firstChild);
+    }}
+    current.nextMaxId = data.next_max_id;
+    current.done = !data.next_max_id;
+    current.loading = false;
+  }}
+
+  function openDialog(kind, href) {{
+    closeDialog();
+    const dialog = document.createElement('div');
+    dialog.setAttribute('role', 'dialog');
+    const bar = document.createElement('div');
+    const close = document.createElement('button');
+    close.setAttribute('aria-label', 'Close');
+    close.textContent = 'x';
+    close.addEventListener('click', closeDialog);
+    bar.appendChild(close);
+    const box = document.createElement('div');
+    box.style.overflow = 'hidden auto';
+    box.style.height = '400px';
+    box.addEventListener('scroll', () => {{
+      if (box.scrollTop + box.clientHeight >= box.scrollHeight - 80) loadPage();
+    }});
+    dialog.appendChild(bar);
+    dialog.appendChild(box);
+    document.body.appendChild(dialog);
+    state = {{ kind: kind, dialog: dialog, box: box, nextMaxId: null, loading: false, done: false }};
+    history.pushState(null, '', href);
+    loadPage();
+  }}
+
+  document.querySelectorAll('a[data-list]').forEach((link) => {{
+    link.addEventListener('click', (event) => {{
+      event.preventDefault();
+      openDialog(link.dataset.list, link.getAttribute('href'));
+    }});
+  }});
+  document.addEventListener('keydown', (event) => {{
+    if (event.key === 'Escape') closeDialog();
+  }});
+}})();
+</script>
+</body></html>
+"""
+
+
+def _user_id(username: str) -> int:
+    return int(hashlib.sha1(username.encode("utf-8")).hexdigest()[:12], 16)
+
+
+def create_app(followers: int = 1000, followings: int = 300, page_size: int = 12,
+               latency_ms: int = 0, window: int = 0) -> FastAPI:
+    """
+    Builds the stand-in app. Every profile has `followers` followers named
+    user<N> and `followings` followings named followed<N>; list pages hold
+    `page_size` users, each API response is delayed by `latency_ms`, and
+    `window` > 0 keeps only that many rows rendered in the modal.
+    """
+    app = FastAPI(title="Instagram stand-in")
+    lists = {"followers": ("user", followers), "following": ("followed", followings)}
+
+    def signed_in(request: Request) -> bool:
+        return bool(request.cookies.get(SESSION_COOKIE))
+
+    @app.get("/", response_class=HTMLResponse)
+    def home(request: Request):
+        if not signed_in(request):
+            return HTMLResponse(_LOGIN_PAGE)
+        return HTMLResponse(_HOME_PAGE.format(logo=_LOGO))
+
+    @app.post("/accounts/login/")
+    async def login(request: Request):
+        form = parse_qs((await request.body()).decode("utf-8"))
+        username = (form.get("username") or [""])[0]
+        if not username or not (form.get("password") or [""])[0]:
+            return RedirectResponse("/", status_code=303)
+        response = RedirectResponse("/", status_code=303)
+        response.set_cookie(SESSION_COOKIE, hashlib.sha1(username.encode("utf-8")).hexdigest(), path="/")
+        return response
+
+    @app.get("/api/v1/friendships/{user_id}/{kind}/")
+    async def friendships(request: Request, user_id: int, kind: str, count: int = 12, max_id: str = ""):
+        if not signed_in(request):
+            return JSONResponse({"status": "fail", "message": "login_required"}, status_code=401)
+        if kind not in lists:
+            return JSONResponse({"status": "fail", "message": "not_found"}, status_code=404)
+        if latency_ms > 0:
+            await asyncio.sleep(latency_ms / 1000.0)
+        prefix, total = lists[kind]
+        start = int(max_id) if max_id.isdigit() else 0
+        end = min(start + max(count, 1), total)
+        users = [{"pk": _user_id(f"{prefix}{i}"), "username": f"{prefix}{i}"} for i in range(start, end)]
+        return {"users": users, "next_max_id": str(end) if end < total else None, "status": "ok"}
+
+    @app.get("/{username}/", response_class=HTMLResponse)
+    @app.get("/{username}/{list_kind}/", response_class=HTMLResponse)
+    def profile(request: Request, username: str, list_kind: str = ""):
+        if not signed_in(request):
+            return HTMLResponse(_LOGIN_PAGE)
+        return HTMLResponse(_PROFILE_PAGE.format(
+            logo=_LOGO,
+            username=html.escape(username),
+            user_id=json.dumps(_user_id(username)),
+            page_size=json.dumps(page_size),
+            window=json.dumps(window),
+            followers_label=f"{followers:,}",
+            followings_label=f"{followings:,}",
+        ))
+
+    return app
+
+
+def _app_from_env() -> FastAPI:
+    return create_app(
+        followers=int(os.getenv("STANDIN_FOLLOWERS", "1000")),
+        followings=int(os.getenv("STANDIN_FOLLOWINGS", "300")),
+        page_size=int(os.getenv("STANDIN_PAGE_SIZE", "12")),
+        latency_ms=int(os.getenv("STANDIN_LATENCY_MS", "0")),
+        window=int(os.getenv("STANDIN_WINDOW", "0")),
+    )
+
+
+# `uvicorn standin_server:app` picks its sizes from STANDIN_* env vars.
+app = _app_from_env()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Local Instagram stand-in for offline tracker runs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--followers", type=int, default=1000, help="Followers per profile (default 1000)")
+    parser.add_argument("--followings", type=int, default=300, help="Followings per profile (default 300)")
+    parser.add_argument("--page-size", type=int, default=12, help="Users per list page (default 12)")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Delay per list page response (default 0)")
+    parser.add_argument("--window", type=int, default=0,
+                        help="Keep only this many rows rendered in the modal (default 0 = all)")
+    return parser
+
+
+def main():
+    import uvicorn
+
+    args = build_parser().parse_args()
+    print(f"Stand-in serving {args.followers} followers / {args.followings} followings on "
+          f"http://{args.host}:{args.port} (set IG_BASE_URL to this)")
+    uvicorn.run(
+        create_app(args.followers, args.followings, args.page_size, args.latency_ms, args.window),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
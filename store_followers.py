@@ -1,11 +1,17 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+import json
 import os
+import re
 import time
 from datetime import datetime
-from database import FollowerFollowing
-from typing import Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from database import FF_KEY_COLUMNS, FollowerFollowing
+from phase_stats import percentile
+from sqlalchemy import Boolean, Column, DateTime, Integer, MetaData, String, Table, and_, cast, exists, func, insert, literal, or_, select, true, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import List, Optional, Set, Tuple
 
 
 def _align_datetimes(a, b) -> Tuple[Optional[datetime], Optional[datetime]]:
@@ -26,6 +32,378 @@ def _midpoint_dt(a, b) -> Optional[datetime]:
         return None
     return a2 + (b2 - a2) / 2
 
+
+# Per-connection temp table the SQL diff engine stages scraped usernames in.
+_scrape_staging = Table(
+    "scrape_staging",
+    MetaData(),
+    Column("username", String, primary_key=True),
+    prefixes=["TEMPORARY"],
+)
+
+
+# Collects every username currently rendered in the modal in one round trip,
+# using the same href parsing as the per-element DOM path.
+_HARVEST_SCRIPT = """
+    const links = document.querySelectorAll('div[role="dialog"] a[role="link"]');
+    const seen = new Set();
+    const names = [];
+    for (const link of links) {
+        const href = link.href || link.getAttribute('href');
+        if (!href || href.indexOf('/') === -1) continue;
+        const parts = href.split('/');
+        const name = parts[parts.length - 2];
+        if (name && !seen.has(name)) {
+            seen.add(name);
+            names.push(name);
+        }
+    }
+    return names;
+"""
+
+# Installs a MutationObserver on the dialog that records every row href as it is
+# rendered, so rows recycled by the virtualized list between polls are not missed.
+_OBSERVER_INSTALL_SCRIPT = """
+    const dialog = document.querySelector('div[role="dialog"]');
+    if (!dialog) return false;
+    const existing = window.__igFollowCollector;
+    if (existing && existing.dialog === dialog) return true;
+    if (existing) existing.observer.disconnect();
+    const state = { dialog: dialog, seen: new Set(), pending: [] };
+    const addLink = (link) => {
+        const href = link.href || link.getAttribute('href');
+        if (!href || href.indexOf('/') === -1) return;
+        const parts = href.split('/');
+        const name = parts[parts.length - 2];
+        if (name && !state.seen.has(name)) {
+            state.seen.add(name);
+            state.pending.push(name);
+        }
+    };
+    const addNode = (node) => {
+        if (!node || node.nodeType !== 1) return;
+        if (node.matches('a[role="link"]')) addLink(node);
+        node.querySelectorAll('a[role="link"]').forEach(addLink);
+    };
+    addNode(dialog);
+    state.observer = new MutationObserver((mutations) => {
+        for (const mutation of mutations) {
+            if (mutation.type === 'attributes') {
+                addNode(mutation.target);
+                continue;
+            }
+            mutation.addedNodes.forEach(addNode);
+        }
+    });
+    state.observer.observe(dialog, {
+        childList: true, subtree: true, attributes: true, attributeFilter: ['href'],
+    });
+    window.__igFollowCollector = state;
+    return true;
+"""
+
+# Returns usernames recorded since the previous drain, or null if the observer is gone.
+_OBSERVER_DRAIN_SCRIPT = """
+    const state = window.__igFollowCollector;
+    if (!state || !state.dialog.isConnected) return null;
+    const names = state.pending;
+    state.pending = [];
+    return names;
+"""
+
+_OBSERVER_TEARDOWN_SCRIPT = """
+    const state = window.__igFollowCollector;
+    if (state) state.observer.disconnect();
+    delete window.__igFollowCollector;
+"""
+
+_SCROLL_SCRIPT = """
+    const box = arguments[0];
+    box.scrollTop = box.scrollHeight;
+    box.scrollTop = box.scrollTop + box.clientHeight * 0.2;
+"""
+
+
+# Cheap growth probe for the adaptive pacer: row count, scroll height and last row href.
+_PROBE_SCRIPT = """
+    const box = arguments[0];
+    const links = document.querySelectorAll('div[role="dialog"] a[role="link"]');
+    const last = links.length ? (links[links.length - 1].href || '') : '';
+    return [links.length, box.scrollHeight, last];
+"""
+
+
+# Follower-list pages the modal fetches while scrolling (web API and GraphQL shapes).
+_NETWORK_LIST_URLS = {
+    "followers": re.compile(r"/friendships/\d+/followers/|/graphql/query"),
+    "followings": re.compile(r"/friendships/\d+/following/|/graphql/query"),
+}
+# GraphQL responses are only trusted under the list's own edge key.
+_NETWORK_GRAPHQL_KEYS = {"followers": ("edge_followed_by",), "followings": ("edge_follow",)}
+
+
+# Replays a list API request from inside the page (same cookies and origin) and
+# returns the raw body, or null on any failure.
+_PAGE_FETCH_SCRIPT = """
+    const [url, headers, done] = arguments;
+    fetch(url, {credentials: 'include', headers: headers})
+        .then((response) => response.ok ? response.text() : null)
+        .then(done, () => done(null));
+"""
+
+
+def _with_max_id(url: str, cursor: str) -> str:
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != "max_id"]
+    query.append(("max_id", cursor))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _usernames_from_payload(payload, list_keys) -> List[str]:
+    """Usernames from a follower-list JSON page: {"users": [...]} or GraphQL edges[].node."""
+    names = []
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+            continue
+        if not isinstance(node, dict):
+            continue
+        for key, value in node.items():
+            if key in list_keys:
+                if isinstance(value, dict):
+                    value = [edge.get("node") for edge in value.get("edges") or [] if isinstance(edge, dict)]
+                for user in value if isinstance(value, list) else []:
+                    if isinstance(user, dict) and user.get("username"):
+                        names.append(user["username"])
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+    return names
+
+
+class _NetworkCollector:
+    """
+    Reads follower pages straight from the JSON responses the modal fetches while
+    scrolling: drains Chrome's performance log (goog:loggingPrefs, enabled by
+    main.py when SCRAPE_COLLECTOR=network) for finished list requests and pulls
+    their bodies with CDP Network.getResponseBody.
+
+    For the web API shape it also remembers the last list request (URL and X-*
+    headers) and the next_max_id cursor of the last page, so fetch_page() can
+    continue the list from a stored cursor without scrolling to it.
+    """
+
+    def __init__(self, list_type: str):
+        self.url_pattern = _NETWORK_LIST_URLS[list_type]
+        self.graphql_keys = _NETWORK_GRAPHQL_KEYS[list_type]
+        self.pending = {}
+        self.responses = 0
+        self.request = None
+        self.cursor = None
+        self.list_end = False
+
+    def _note_page(self, url: str, payload):
+        if "/graphql/" in url or not isinstance(payload, dict):
+            return
+        self.cursor = payload.get("next_max_id") or None
+        self.list_end = self.cursor is None
+
+    def fetch_page(self, driver, cursor: str) -> Tuple[List[str], Optional[str]]:
+        """One list page starting at cursor, as (usernames, next cursor or None at the end)."""
+        if self.request is None:
+            raise RuntimeError("no list API request captured to replay")
+        body = driver.execute_async_script(
+            _PAGE_FETCH_SCRIPT, _with_max_id(self.request["url"], cursor), self.request["headers"]
+        )
+        payload = json.loads(body or "null")
+        if not isinstance(payload, dict) or "users" not in payload:
+            raise RuntimeError(f"unexpected list page for cursor {cursor!r}")
+        return _usernames_from_payload(payload, ("users",)), payload.get("next_max_id") or None
+
+    def drain(self, driver) -> List[str]:
+        names = []
+        for entry in driver.get_log("performance"):
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            method = message.get("method")
+            params = message.get("params") or {}
+            if method == "Network.requestWillBeSent":
+                request = params.get("request") or {}
+                url = request.get("url") or ""
+                if self.url_pattern.search(url) and "/graphql/" not in url and request.get("method", "GET") == "GET":
+                    headers = {
+                        key: value for key, value in (request.get("headers") or {}).items()
+                        if key.lower().startswith("x-")
+                    }
+                    self.request = {"url": url, "headers": headers}
+            elif method == "Network.responseReceived":
+                response = params.get("response") or {}
+                if "json" in (response.get("mimeType") or "") and self.url_pattern.search(response.get("url") or ""):
+                    self.pending[params.get("requestId")] = response.get("url")
+            elif method == "Network.loadingFinished" and params.get("requestId") in self.pending:
+                request_id = params["requestId"]
+                url = self.pending.pop(request_id)
+                try:
+                    body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                    list_keys = self.graphql_keys if "/graphql/" in url else ("users",)
+                    payload = json.loads(body.get("body") or "null")
+                    page = _usernames_from_payload(payload, list_keys)
+                    self._note_page(url, payload)
+                except Exception as e:
+                    print(f"Could not read list response {url}: {e}")
+                    continue
+                if page:
+                    self.responses += 1
+                    names.extend(page)
+        return names
+
+
+class _ScrollPacer:
+    """
+    Waits after each scroll only until the modal grows (row count, scrollHeight or
+    last row changes). When nothing arrives the wait ceiling doubles up to
+    max_wait, and resets to base_wait once rows show up again.
+    """
+
+    def __init__(self, poll_interval: float, base_wait: float, max_wait: float):
+        self.poll_interval = poll_interval
+        self.base_wait = base_wait
+        self.max_wait = max(max_wait, base_wait)
+        self.ceiling = base_wait
+        self.last_probe = None
+        self.samples: List[float] = []
+
+    def wait(self, driver, scroll_box) -> int:
+        """Returns the scrollHeight observed at the end of the wait."""
+        started = time.monotonic()
+        deadline = started + self.ceiling
+        grew = False
+        probe = self.last_probe
+        while True:
+            time.sleep(self.poll_interval)
+            probe = driver.execute_script(_PROBE_SCRIPT, scroll_box)
+            if probe != self.last_probe:
+                grew = True
+                break
+            if time.monotonic() >= deadline:
+                break
+        self.samples.append(time.monotonic() - started)
+        self.last_probe = probe
+        self.ceiling = self.base_wait if grew else min(self.ceiling * 2, self.max_wait)
+        return probe[1]
+
+    def projected_idle_seconds(self, iterations: int) -> float:
+        """Time the next `iterations` waits would take if no rows arrived."""
+        total = 0.0
+        ceiling = self.ceiling
+        for _ in range(max(iterations, 0)):
+            total += ceiling
+            ceiling = min(ceiling * 2, self.max_wait)
+        return total
+
+
+def _latency_summary(samples: List[float]) -> dict:
+    if not samples:
+        return {"count": 0, "total": 0.0, "min": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "total": round(sum(ordered), 3),
+        "min": round(ordered[0], 3),
+        "p50": round(percentile(ordered, 0.5), 3),
+        "p95": round(percentile(ordered, 0.95), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def attach_call_counter(driver):
+    """
+    Counts WebDriver protocol round trips by wrapping driver.execute, which every
+    driver and element command goes through. Safe to call more than once.
+    """
+    if hasattr(driver, "webdriver_calls"):
+        return driver
+    original_execute = driver.execute
+
+    def counting_execute(driver_command, params=None):
+        driver.webdriver_calls += 1
+        return original_execute(driver_command, params)
+
+    driver.webdriver_calls = 0
+    driver.execute = counting_execute
+    return driver
+
+
+def webdriver_call_count(driver) -> int:
+    return int(getattr(driver, "webdriver_calls", 0) or 0)
+
+
+def _driver_lost(driver) -> bool:
+    """True when the browser no longer answers, as opposed to a page-level failure."""
+    try:
+        driver.current_url
+        return False
+    except Exception:
+        return True
+
+
+def _harvest(driver, collector: str, network: Optional[_NetworkCollector] = None) -> Tuple[str, List[str]]:
+    """
+    Reads usernames with the requested collector and returns (collector, usernames).
+    The returned collector differs from the requested one after a fallback.
+    """
+    if collector == "network":
+        try:
+            usernames = network.drain(driver)
+            if network.responses:
+                print(f"Network responses yielded {len(usernames)} usernames ({network.responses} pages so far)")
+                return collector, usernames
+            print("No follower-list responses captured, falling back to script harvesting")
+        except Exception as e:
+            print(f"Network collector failed, falling back to script harvesting: {e}")
+        collector = "script"
+    if collector == "observer":
+        try:
+            usernames = driver.execute_script(_OBSERVER_DRAIN_SCRIPT)
+            if usernames is None and driver.execute_script(_OBSERVER_INSTALL_SCRIPT):
+                usernames = driver.execute_script(_OBSERVER_DRAIN_SCRIPT)
+            if usernames is not None:
+                print(f"Observer recorded {len(usernames)} new usernames")
+                return collector, usernames
+            print("Observer collector unavailable, falling back to script harvesting")
+        except Exception as e:
+            print(f"Observer collector failed, falling back to script harvesting: {e}")
+        collector = "script"
+    if collector == "script":
+        try:
+            usernames = driver.execute_script(_HARVEST_SCRIPT) or []
+            print(f"Found {len(usernames)} usernames in current view")
+            return collector, usernames
+        except Exception as e:
+            print(f"Script harvesting failed, falling back to DOM harvesting: {e}")
+            collector = "dom"
+    return collector, _harvest_dom(driver)
+
+
+def _harvest_dom(driver) -> List[str]:
+    """Legacy harvesting: one find_elements call plus one get_attribute call per row."""
+    item_elements = driver.find_elements(By.CSS_SELECTOR, 'div[role="dialog"] a[role="link"]')
+    print(f"Found {len(item_elements)} elements in current view")
+    usernames = []
+    for element in item_elements:
+        try:
+            href = element.get_attribute('href')
+            username = href.split('/')[-2] if href and '/' in href else None
+            if username:
+                usernames.append(username)
+        except Exception as e:
+            print(f"Error processing element: {e}")
+            continue
+    return usernames
+
 def _find_scroll_container(driver) -> Optional[object]:
     """
     Tries to find the scrollable container inside the Instagram modal dialog.
@@ -54,6 +432,300 @@ def _find_scroll_container(driver) -> Optional[object]:
         print(f"JS scroll container detection failed: {e}")
         return None
 
+def _rolling_segment(driver, db, network: _NetworkCollector, target_id, list_type, run_started_at,
+                     collect, max_pages: int) -> Tuple[Optional[datetime], Optional[tuple], dict]:
+    """
+    This run's share of a rolling-coverage rotation, after a head scroll that did not
+    cover the whole list. Continues the list from the stored cursor (or, for a new
+    rotation, from where the head scroll stopped) for up to max_pages API pages.
+
+    Returns (lost_since, rotation, info): lost_since is the rotation start to reconcile
+    lost rows against when the rotation completed this run, else None; rotation is the
+    (rotation_started_at, cursor, runs) state to store, or None to leave it unchanged.
+    """
+    head_cursor = network.cursor
+    if network.request is None or head_cursor is None:
+        print(f"Rolling coverage for {list_type}: no list API cursor captured, skipping this run's segment")
+        return None, None, {"segment_pages": 0, "completed": False}
+
+    state = db.get_rotation(target_id, list_type)
+    if state is not None and state.cursor:
+        started_at, cursor, runs = state.rotation_started_at, state.cursor, state.runs + 1
+    else:
+        started_at, cursor, runs = run_started_at, head_cursor, 1
+
+    pages = 0
+    harvested = 0
+    while cursor and pages < max_pages:
+        try:
+            names, next_cursor = network.fetch_page(driver, cursor)
+        except Exception as e:
+            print(f"Rolling segment fetch failed for {list_type} at cursor {cursor!r}: {e}")
+            if pages == 0 and runs > 1:
+                # Stored cursors can expire; start a fresh rotation from this run's head scroll
+                print(f"Restarting the {list_type} rotation from this run's head scroll")
+                return None, (run_started_at, head_cursor, 1), {"segment_pages": 0, "completed": False, "restarted": True}
+            break
+        collect(names)
+        harvested += len(names)
+        pages += 1
+        cursor = next_cursor
+
+    info = {"segment_pages": pages, "segment_usernames": harvested, "rotation_runs": runs}
+    if cursor is None:
+        info["completed"] = True
+        print(
+            f"Rolling coverage for {list_type}: rotation started {started_at} completed after {runs} run(s) "
+            f"({pages} pages this run)"
+        )
+        # The next rotation starts with this run's head scroll
+        return started_at, (run_started_at, head_cursor, 1), info
+    info["completed"] = False
+    print(
+        f"Rolling coverage for {list_type}: run {runs} of the rotation started {started_at}; "
+        f"{pages} pages ({harvested} usernames) fetched, continuing from cursor {cursor!r} next run"
+    )
+    return None, (started_at, cursor, runs), info
+
+
+def _resume_from_cursor(driver, network: _NetworkCollector, cursor: str, collect, max_pages: int) -> Tuple[int, bool]:
+    """
+    Fetches the rest of the list from the cursor a crashed run checkpointed, instead
+    of scrolling past the rows already harvested. network.cursor follows each page so
+    checkpoints flushed meanwhile record the progress. Returns (pages, reached_end).
+    """
+    pages = 0
+    while cursor and pages < max_pages:
+        try:
+            names, next_cursor = network.fetch_page(driver, cursor)
+        except Exception as e:
+            print(f"Resume fetch failed at cursor {cursor!r} after {pages} pages: {e}")
+            return pages, False
+        network.cursor = next_cursor
+        collect(names)
+        pages += 1
+        cursor = next_cursor
+    return pages, cursor is None
+
+
+def _lost_marking_allowed(list_type: str, scraped_count: int, active_existing_count: int,
+                          expected_total: Optional[int]) -> bool:
+    """Coverage guard: only trust a scrape for lost-marking when it saw enough of the list."""
+    min_coverage_for_lost = float(os.getenv("SCRAPE_MIN_COVERAGE_FOR_LOST", "0.9"))
+    min_reference_count = int(os.getenv("SCRAPE_MIN_REFERENCE_COUNT_FOR_LOST", "100"))
+    ref_expected = int(expected_total or 0)
+    reference_count = max(ref_expected, active_existing_count)
+
+    if reference_count >= min_reference_count:
+        if scraped_count == 0:
+            print(
+                f"Safety guard activated for {list_type}: scraped 0 while reference_count={reference_count}. "
+                "Skipping lost marking for this run."
+            )
+            return False
+        coverage = scraped_count / float(reference_count)
+        if coverage < min_coverage_for_lost:
+            print(
+                f"Safety guard activated for {list_type}: coverage={coverage:.3f} "
+                f"(scraped={scraped_count}, reference={reference_count}, threshold={min_coverage_for_lost}). "
+                "Skipping lost marking for this run."
+            )
+            return False
+    return True
+
+
+def _persist_orm(db, target_id, list_type, current_items, run_started_at, prev_run_started_at,
+                 expected_total, now_utc, mark_lost=True, lost_since=None) -> dict:
+    """Row-by-row diff through ORM objects (SCRAPE_DIFF_ENGINE=orm). See _persist_sql for mark_lost/lost_since."""
+    is_follower = list_type == 'followers'
+    diff = {"new": 0, "seen": 0, "lost": 0}
+
+    # Get the existing items from the database for comparison
+    existing_items = {
+        entry.follower_following_username: entry
+        for entry in db.session.query(FollowerFollowing)
+        .filter_by(target_id=target_id, is_follower=is_follower)
+        .all()
+    }
+    active_existing_count = sum(1 for entry in existing_items.values() if not entry.is_lost)
+
+    # Add new items or update existing ones
+    for username in current_items:
+        if username not in existing_items:
+            est_added = None
+            if prev_run_started_at:
+                est_added = _midpoint_dt(prev_run_started_at, run_started_at)
+            ff = FollowerFollowing(
+                target_id=target_id,
+                follower_following_username=username,
+                is_follower=is_follower,
+                added_at=now_utc,
+                first_seen_run_at=run_started_at,
+                last_seen_run_at=run_started_at,
+                estimated_added_at=est_added,
+                is_lost=False,
+            )
+            db.session.add(ff)
+            diff["new"] += 1
+        else:
+            ff = existing_items[username]
+            if ff.first_seen_run_at is None:
+                ff.first_seen_run_at = ff.added_at or run_started_at
+            ff.last_seen_run_at = run_started_at
+            ff.is_lost = False
+            ff.lost_at = None
+            ff.lost_at_run_at = None
+            diff["seen"] += 1
+
+    def unconfirmed(username, entry):
+        if username in current_items:
+            return False
+        if lost_since is None:
+            return True
+        last_seen, since = _align_datetimes(entry.last_seen_run_at, lost_since)
+        return last_seen is None or last_seen < since
+
+    covered = len(current_items)
+    if lost_since is not None:
+        covered += sum(
+            1 for username, entry in existing_items.items() if username not in current_items and not unconfirmed(username, entry)
+        )
+
+    # Mark items that are no longer present as lost (only when scrape coverage is trusted)
+    if mark_lost and _lost_marking_allowed(list_type, covered, active_existing_count, expected_total):
+        for username, entry in existing_items.items():
+            if not entry.is_lost and unconfirmed(username, entry):
+                entry.is_lost = True
+                entry.lost_at = run_started_at
+                entry.lost_at_run_at = run_started_at
+                if entry.last_seen_run_at is None:
+                    entry.last_seen_run_at = run_started_at
+                if entry.last_seen_run_at:
+                    entry.estimated_removed_at = _midpoint_dt(entry.last_seen_run_at, run_started_at)
+                else:
+                    entry.estimated_removed_at = run_started_at
+                diff["lost"] += 1
+    return diff
+
+
+def _persist_unchanged(db, target_id, list_type, run_started_at, **_) -> dict:
+    """Verified-unchanged list: confirm every active row for this run with one UPDATE."""
+    ff = FollowerFollowing.__table__
+    seen = db.session.connection().execute(
+        update(ff)
+        .where(ff.c.target_id == target_id, ff.c.is_follower == (list_type == 'followers'), ff.c.is_lost.is_(False))
+        .values(last_seen_run_at=literal(run_started_at, DateTime))
+    ).rowcount
+    return {"new": 0, "seen": seen, "lost": 0}
+
+
+def _sql_epoch_us(value):
+    """Microseconds since the epoch for a datetime stored as 'YYYY-MM-DD HH:MM:SS.ffffff'."""
+    return cast(func.strftime('%s', value), Integer) * 1000000 + cast(func.substr(value, 21, 6), Integer)
+
+
+def _sql_midpoint(a, b):
+    """SQL midpoint of two stored datetimes, in SQLAlchemy's SQLite DATETIME text format."""
+    mid = (_sql_epoch_us(a) + _sql_epoch_us(b)) / 2
+    seconds = func.strftime('%Y-%m-%d %H:%M:%S', mid / 1000000, 'unixepoch')
+    return seconds.op('||')('.').op('||')(func.printf('%06d', mid % 1000000))
+
+
+def _persist_sql(db, target_id, list_type, current_items, run_started_at, prev_run_started_at,
+                 expected_total, now_utc, mark_lost=True, lost_since=None) -> dict:
+    """
+    Set-based diff (SCRAPE_DIFF_ENGINE=sql): scraped usernames are bulk-loaded into a
+    temp staging table, then one transaction runs a count of the staged usernames
+    already in the list (the seen count), one INSERT ... ON CONFLICT DO UPDATE on the
+    unique (target_id, is_follower, username) index that inserts new rows and marks
+    existing ones seen (reviving lost ones), and one UPDATE that marks active rows
+    missing from the staging table lost. Existing rows are never loaded into Python.
+
+    mark_lost=False skips lost-marking (a partial rolling-coverage run). With
+    lost_since, a completed rotation is reconciled instead: rows not confirmed
+    since that time are lost, and the coverage guard counts every row confirmed
+    during the rotation rather than this run's scrape alone.
+    """
+    is_follower = list_type == 'followers'
+    ff = FollowerFollowing.__table__
+    conn = db.session.connection()
+    run_at = literal(run_started_at, DateTime)
+    same_list = and_(ff.c.target_id == target_id, ff.c.is_follower == is_follower)
+    staged = exists().where(_scrape_staging.c.username == ff.c.follower_following_username)
+
+    active_existing_count = conn.execute(
+        select(func.count()).select_from(ff).where(same_list, ff.c.is_lost.is_(False))
+    ).scalar() or 0
+
+    conn.exec_driver_sql("CREATE TEMP TABLE IF NOT EXISTS scrape_staging (username VARCHAR PRIMARY KEY)")
+    conn.exec_driver_sql("DELETE FROM scrape_staging")
+    if current_items:
+        conn.execute(insert(_scrape_staging), [{"username": username} for username in current_items])
+
+    seen = conn.execute(
+        select(func.count()).select_from(ff).where(same_list, staged)
+    ).scalar() or 0
+
+    # One upsert covers both transitions: unseen usernames are inserted, existing
+    # rows hit the unique key and are marked seen (and revived if they were lost).
+    est_added = _midpoint_dt(prev_run_started_at, run_started_at) if prev_run_started_at else None
+    upsert = sqlite_insert(ff).from_select(
+        [
+            "target_id", "follower_following_username", "is_follower", "added_at",
+            "first_seen_run_at", "last_seen_run_at", "estimated_added_at", "is_lost",
+        ],
+        select(
+            literal(target_id, Integer),
+            _scrape_staging.c.username,
+            literal(is_follower, Boolean),
+            literal(now_utc, DateTime),
+            run_at,
+            run_at,
+            literal(est_added, DateTime),
+            literal(False, Boolean),
+        ).where(true()),
+    )
+    conn.execute(
+        upsert.on_conflict_do_update(
+            index_elements=FF_KEY_COLUMNS,
+            set_={
+                "first_seen_run_at": func.coalesce(ff.c.first_seen_run_at, ff.c.added_at, upsert.excluded.first_seen_run_at),
+                "last_seen_run_at": upsert.excluded.last_seen_run_at,
+                "is_lost": False,
+                "lost_at": None,
+                "lost_at_run_at": None,
+            },
+        )
+    )
+    new = len(current_items) - seen
+
+    lost = 0
+    covered = len(current_items)
+    unconfirmed = ~staged
+    if lost_since is not None:
+        since = literal(lost_since, DateTime)
+        covered = conn.execute(
+            select(func.count()).select_from(ff).where(same_list, ff.c.last_seen_run_at >= since)
+        ).scalar() or 0
+        unconfirmed = and_(~staged, or_(ff.c.last_seen_run_at.is_(None), ff.c.last_seen_run_at < since))
+    if mark_lost and _lost_marking_allowed(list_type, covered, active_existing_count, expected_total):
+        last_seen = func.coalesce(ff.c.last_seen_run_at, run_at)
+        lost = conn.execute(
+            update(ff)
+            .where(same_list, ff.c.is_lost.is_(False), unconfirmed)
+            .values(
+                is_lost=True,
+                lost_at=run_at,
+                lost_at_run_at=run_at,
+                last_seen_run_at=last_seen,
+                estimated_removed_at=_sql_midpoint(last_seen, run_at),
+            )
+        ).rowcount
+
+    conn.exec_driver_sql("DELETE FROM scrape_staging")
+    return {"new": new, "seen": seen, "lost": lost}
+
+
 def store_followers(
     driver,
     db,
@@ -63,18 +735,137 @@ def store_followers(
     run_id: int = None,
     prev_run_started_at: Optional[datetime] = None,
     expected_total: Optional[int] = None,
+    stats: Optional[dict] = None,
+    incremental: bool = False,
+    verify_unchanged: bool = False,
 ) -> Set[str]:
-    """Scrape a followers/followings modal and update DB with run-aware timestamps."""
+    """
+    Scrape a followers/followings modal and update DB with run-aware timestamps.
+
+    SCRAPE_COLLECTOR selects how usernames are read from the modal: "script"
+    (default) parses every row in one execute_script call per iteration,
+    "observer" records rows in the page through a MutationObserver and only
+    drains new ones, "network" parses the list pages from the JSON responses in
+    Chrome's performance log, "dom" keeps the per-element get_attribute path.
+    "network" and "observer" fall back to "script" when they capture nothing.
+    SCRAPE_PACING=adaptive (default) waits after each scroll only until new rows
+    arrive, with a bounded backoff; "fixed" keeps the 1-1.5s sleep. When a stats
+    dict is passed it is filled with the collector used, iteration count,
+    WebDriver call count, per-iteration wait latency and the time.monotonic()
+    of the first scroll.
+
+    When expected_total (the header count) is known and SCRAPE_EARLY_EXIT is on,
+    scrolling ends SCRAPE_COMPLETE_CONFIRM_ITERATIONS iterations after the
+    collected set first reaches it instead of waiting for the end-of-list
+    detection; the estimated iterations and seconds saved are logged.
+
+    SCRAPE_DIFF_ENGINE=sql (default) applies the membership diff against a staging
+    table with one upsert and one lost-marking UPDATE; "orm" keeps the per-row ORM
+    path. The diff goes through db.write(), so inside Database.run_transaction()
+    it is applied (and logged) with the run's single commit.
+
+    With a run_id and SCRAPE_CHECKPOINT_EVERY > 0 (default 500), new usernames are
+    flushed to scrape_checkpoints in batches of that size as they are harvested,
+    committed immediately. A resumed run (same run_id) starts from those usernames.
+    The network collector also checkpoints its list cursor, and a resumed network
+    scrape fetches the rest of the list from it once the modal's first page has
+    shown the request to replay (stats "resumed_pages"). Other collectors have no
+    cursor and scroll the modal from the top again: their resume only avoids losing
+    the harvest, not the scroll. If the browser stops answering mid-scrape, the
+    unflushed tail is checkpointed too and stats gets "driver_lost" so the caller
+    can leave the run resumable.
+
+    SCRAPE_ROLLING_COVERAGE=true spreads lists too long for one pass over several
+    runs: after the head scroll, up to SCRAPE_ROLLING_SEGMENT_PAGES list pages are
+    fetched from the cursor the previous run stopped at. Partial runs only refresh
+    last_seen_run_at; lost-marking waits until a rotation reaches the end of the
+    list, then marks rows not confirmed since the rotation started.
+
+    incremental=True scrapes only the head of the list: scrolling stops after
+    SCRAPE_INCREMENTAL_KNOWN_STREAK consecutive usernames that are already active
+    in the DB, provided the header count equals the known active count plus the
+    new usernames found (within SCRAPE_INCREMENTAL_COUNT_TOLERANCE). Otherwise the
+    pass carries on as a full reconciliation. An incremental pass never marks
+    users lost. stats gets "scrape_mode" (incremental, full, or partial when the
+    iteration cap cut the pass short) and the estimated "seconds_saved".
+
+    verify_unchanged=True (the caller saw both header counts match the previous
+    run) checks the first harvested page: when every username on it is active in
+    the DB and the header count equals the active count, the scroll is skipped and
+    all active rows get this run's last_seen_run_at in one UPDATE (scrape_mode
+    "unchanged"). Any mismatch falls through to the normal scrape.
+    """
     print(f"Storing {list_type}...")
+    attach_call_counter(driver)
+    calls_at_start = webdriver_call_count(driver)
+    collector = os.getenv("SCRAPE_COLLECTOR", "script").strip().lower()
+    if collector not in {"script", "observer", "network", "dom"}:
+        print(f"Unknown SCRAPE_COLLECTOR '{collector}', using 'script'")
+        collector = "script"
+    if stats is None:
+        stats = {}
+    rolling = os.getenv("SCRAPE_ROLLING_COVERAGE", "false").lower() == "true"
+    if rolling and collector != "network":
+        print("SCRAPE_ROLLING_COVERAGE continues lists from API cursors; using the network collector")
+        collector = "network"
+    network = _NetworkCollector(list_type) if collector == "network" and list_type in _NETWORK_LIST_URLS else None
+    if collector == "network" and network is None:
+        collector = "script"
+    stats.pop("driver_lost", None)
+    checkpoint_every = 0
+    unflushed = set()
 
     try:
         modal_wait_seconds = int(os.getenv("SCRAPE_MODAL_WAIT_SECONDS", "10"))
         stall_timeout = int(os.getenv("SCRAPE_STALL_TIMEOUT_SECONDS", "15"))
         max_iterations = int(os.getenv("SCRAPE_MAX_ITERATIONS", "500"))
+        early_exit = os.getenv("SCRAPE_EARLY_EXIT", "true").lower() == "true"
+        confirm_iterations = int(os.getenv("SCRAPE_COMPLETE_CONFIRM_ITERATIONS", "1"))
+        pacing = os.getenv("SCRAPE_PACING", "adaptive").strip().lower()
+        pacer = _ScrollPacer(
+            poll_interval=float(os.getenv("SCRAPE_POLL_INTERVAL_SECONDS", "0.15")),
+            base_wait=float(os.getenv("SCRAPE_BACKOFF_BASE_SECONDS", "0.5")),
+            max_wait=float(os.getenv("SCRAPE_BACKOFF_MAX_SECONDS", "4.0")),
+        )
         now_utc = run_started_at if run_started_at else datetime.utcnow()
         target_id = target.id
-        is_follower = list_type == 'followers'
         current_items = set()
+        resume_cursor = None
+        checkpoint_every = int(os.getenv("SCRAPE_CHECKPOINT_EVERY", "500") or 0) if run_id else 0
+        if checkpoint_every > 0:
+            current_items.update(db.load_checkpoint(run_id, list_type))
+            if current_items:
+                print(f"Resuming {list_type} from checkpoint: {len(current_items)} usernames already harvested")
+                stats["resumed_from_checkpoint"] = len(current_items)
+                if network is not None:
+                    resume_cursor = db.load_checkpoint_cursor(run_id, list_type)
+        # Growth is judged on this pass alone: re-scrolling checkpointed rows is not a stall.
+        pass_items = set() if current_items else current_items
+        known_active = db.active_usernames(target_id, list_type) if incremental or verify_unchanged else set()
+        if (incremental or verify_unchanged) and not known_active:
+            print(f"No known {list_type} yet; running a full scrape")
+            incremental = verify_unchanged = False
+        known_streak_limit = max(int(os.getenv("SCRAPE_INCREMENTAL_KNOWN_STREAK", "50")), 1)
+        count_tolerance = int(os.getenv("SCRAPE_INCREMENTAL_COUNT_TOLERANCE", "0"))
+        known_streak = 0
+        stopped_incremental = False
+        unchanged = False
+
+        def collect(usernames):
+            nonlocal unflushed, known_streak
+            if incremental:
+                # Streak of already-known usernames, in list order, among rows first seen now
+                for name in dict.fromkeys(usernames):
+                    if name not in current_items:
+                        known_streak = known_streak + 1 if name in known_active else 0
+            if checkpoint_every > 0:
+                unflushed.update(name for name in usernames if name not in current_items)
+                if len(unflushed) >= checkpoint_every:
+                    db.save_checkpoint(run_id, list_type, unflushed, cursor=network.cursor if network else None)
+                    unflushed = set()
+            current_items.update(usernames)
+            if pass_items is not current_items:
+                pass_items.update(usernames)
 
         # Determine selectors based on list_type
         if list_type == 'followers':
@@ -142,143 +933,238 @@ def store_followers(
 
         last_height = 0
         stable_iterations = 0
+        stable_limit = 5
+        expected_count = int(expected_total or 0)
+        complete_at_loop = None
+        early_exit_saving = None
         last_count = 0
+        last_element_count = None
         last_change_ts = time.time()
         print("Starting to scroll and collect followers...")
 
+        scroll_started = time.monotonic()
+        capped = False
         loop = 0
         while loop < max_iterations:
             loop += 1
-            item_elements = driver.find_elements(By.CSS_SELECTOR, f'div[role="dialog"] a[role="link"]')
-            print(f"Found {len(item_elements)} elements in current view")
-            
-            for element in item_elements:
-                try:
-                    href = element.get_attribute('href')
-                    if href and '/' in href:
-                        username = href.split('/')[-2]
-                    if username and username != '':
-                        current_items.add(username)
-                except Exception as e:
-                    print(f"Error processing element: {e}")
-                    continue
+            collector, usernames = _harvest(driver, collector, network)
+            collect(usernames)
 
             print(f"Current total collected: {len(current_items)} {list_type}")
 
+            if verify_unchanged:
+                verify_unchanged = False
+                sample = list(dict.fromkeys(usernames))
+                if sample and len(known_active) == expected_count and all(name in known_active for name in sample):
+                    print(
+                        f"First page of {list_type} ({len(sample)} usernames) matches the DB and the header "
+                        f"count ({expected_count}) is unchanged; skipping the scroll"
+                    )
+                    unchanged = True
+                    break
+                print(f"First page of {list_type} does not match the DB; scraping normally")
+
+            if incremental and known_streak >= known_streak_limit:
+                new_found = len(current_items - known_active)
+                drift = expected_count - (len(known_active) + new_found)
+                if expected_count > 0 and abs(drift) <= count_tolerance:
+                    print(
+                        f"Incremental stop for {list_type}: {known_streak} known usernames in a row, "
+                        f"{new_found} new; header {expected_count} matches"
+                    )
+                    stopped_incremental = True
+                    break
+                print(
+                    f"Header count for {list_type} is {expected_count}, expected {len(known_active) + new_found} "
+                    f"({len(known_active)} known + {new_found} new); switching to a full reconciliation"
+                )
+                stats["incremental_fallback"] = {"header": expected_count, "known": len(known_active), "new": new_found}
+                incremental = False
+
+            # A resumed network scrape fetches the rest of the list once the first page shows the request
+            if resume_cursor and network.request is not None:
+                pages, reached_end = _resume_from_cursor(driver, network, resume_cursor, collect, max_iterations)
+                resume_cursor = None
+                stats["resumed_pages"] = pages
+                if reached_end:
+                    network.list_end = True
+                    print(f"Resumed {list_type} from the checkpointed cursor: {pages} pages, list complete")
+                    break
+                print(f"Resumed {list_type} from the checkpointed cursor did not finish; scrolling the rest")
+
+            # Stop once the header count is reached and a confirmation pass found nothing missing
+            if early_exit and expected_count > 0 and len(current_items) >= expected_count:
+                if complete_at_loop is None:
+                    complete_at_loop = loop
+                    print(f"Collected set reached expected total ({expected_count}); confirming...")
+                if loop - complete_at_loop >= confirm_iterations:
+                    remaining = max(stable_limit - stable_iterations, 0)
+                    if pacing == "adaptive":
+                        seconds_saved = pacer.projected_idle_seconds(remaining)
+                    else:
+                        seconds_saved = 1.25 * remaining
+                    seconds_saved = min(seconds_saved, max(stall_timeout - (time.time() - last_change_ts), 0.0))
+                    early_exit_saving = {"iterations_saved": remaining, "seconds_saved": round(seconds_saved, 2)}
+                    print(
+                        f"Early exit for {list_type}: {len(current_items)}/{expected_count} collected; "
+                        f"saved ~{remaining} iterations and ~{seconds_saved:.1f}s"
+                    )
+                    break
+            else:
+                complete_at_loop = None
+
             # Scroll down
+            stats.setdefault("first_scroll_monotonic", time.monotonic())
             try:
                 # full jump to bottom, then a small nudge to trigger lazy-load
-                driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight;", scroll_box)
-                driver.execute_script("arguments[0].scrollTop = arguments[0].scrollTop + arguments[0].clientHeight * 0.2;", scroll_box)
+                if collector != "dom":
+                    driver.execute_script(_SCROLL_SCRIPT, scroll_box)
+                else:
+                    driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight;", scroll_box)
+                    driver.execute_script("arguments[0].scrollTop = arguments[0].scrollTop + arguments[0].clientHeight * 0.2;", scroll_box)
             except Exception as e:
                 print(f"Error scrolling: {e}")
                 # Try alternative scrolling method
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             
-            time.sleep(1.0 + (time.time() % 0.5))
-
             try:
-                new_height = driver.execute_script('return arguments[0].scrollHeight', scroll_box)
+                if pacing == "adaptive":
+                    new_height = pacer.wait(driver, scroll_box)
+                else:
+                    wait_started = time.monotonic()
+                    time.sleep(1.0 + (time.time() % 0.5))
+                    pacer.samples.append(time.monotonic() - wait_started)
+                    new_height = driver.execute_script('return arguments[0].scrollHeight', scroll_box)
             except Exception as e:
                 print(f"Error getting scroll height: {e}")
                 # If we can't get scroll height, check if we have new elements
                 new_elements = driver.find_elements(By.CSS_SELECTOR, f'div[role="dialog"] a[role="link"]')
-                if len(new_elements) == len(item_elements):
+                if collector == "observer" and not usernames:
+                    print("No new usernames recorded, stopping scroll")
+                    break
+                # Raw modal links, several per row: compare with the previous failed iteration's link count
+                if collector != "observer" and len(new_elements) == last_element_count:
                     print("No new elements found, stopping scroll")
                     break
+                last_element_count = len(new_elements)
                 continue
 
-            if new_height == last_height and len(current_items) == last_count:
+            if new_height == last_height and len(pass_items) == last_count:
                 stable_iterations += 1
                 print(f"No growth detected (iteration {stable_iterations}); height={new_height}, count={len(current_items)}")
             else:
                 stable_iterations = 0
                 last_change_ts = time.time()
             last_height = new_height
-            last_count = len(current_items)
+            last_count = len(pass_items)
+            last_element_count = None
 
             # Stop after several iterations without growth or after stall timeout
-            if stable_iterations >= 5 or (time.time() - last_change_ts) > stall_timeout:
+            if stable_iterations >= stable_limit or (time.time() - last_change_ts) > stall_timeout:
                 print("Reached end of scroll, no more content")
                 break
         else:
             print("Reached max scroll iterations cap; stopping to avoid infinite loop.")
+            capped = True
 
-        print(f"Collected {len(current_items)} {list_type}")
+        if collector == "network":
+            # Pages requested by the last scroll may finish after the loop stops
+            collector, usernames = _harvest(driver, collector, network)
+            collect(usernames)
 
-        # Get the existing items from the database for comparison
-        existing_items = {
-            entry.follower_following_username: entry
-            for entry in db.session.query(FollowerFollowing)
-            .filter_by(target_id=target_id, is_follower=is_follower)
-            .all()
-        }
-        active_existing_count = sum(1 for entry in existing_items.values() if not entry.is_lost)
-
-        # Add new items or update existing ones
-        for username in current_items:
-            if username not in existing_items:
-                est_added = None
-                if prev_run_started_at:
-                    est_added = _midpoint_dt(prev_run_started_at, run_started_at)
-                ff = FollowerFollowing(
-                    target_id=target_id,
-                    follower_following_username=username,
-                    is_follower=is_follower,
-                    added_at=now_utc,
-                    first_seen_run_at=run_started_at,
-                    last_seen_run_at=run_started_at,
-                    estimated_added_at=est_added,
-                    is_lost=False,
-                )
-                db.session.add(ff)
+        mark_lost, lost_since, rotation = not (stopped_incremental or unchanged), None, None
+        seconds_saved = None
+        if stopped_incremental:
+            # Time the rest of the list would have taken at this pass's scroll rate
+            scroll_seconds = time.monotonic() - scroll_started
+            remaining = max(expected_count - len(current_items), 0)
+            seconds_saved = round(remaining * scroll_seconds / float(max(len(pass_items), 1)), 2)
+            print(f"Incremental {list_type} pass skipped ~{remaining} rows, saving ~{seconds_saved}s")
+        elif rolling and network is not None and not unchanged:
+            if collector != "network":
+                # After a fallback the log still holds the list requests and the cursor
+                collect(network.drain(driver))
+            if network.list_end or (expected_count > 0 and len(current_items) >= expected_count):
+                rotation = (run_started_at, None, 0)
+                stats["rolling"] = {"segment_pages": 0, "completed": True, "full_pass": True}
             else:
-                ff = existing_items[username]
-                if ff.first_seen_run_at is None:
-                    ff.first_seen_run_at = ff.added_at or run_started_at
-                ff.last_seen_run_at = run_started_at
-                ff.is_lost = False
-                ff.lost_at = None
-                ff.lost_at_run_at = None
-        db.session.commit()
-
-        min_coverage_for_lost = float(os.getenv("SCRAPE_MIN_COVERAGE_FOR_LOST", "0.9"))
-        min_reference_count = int(os.getenv("SCRAPE_MIN_REFERENCE_COUNT_FOR_LOST", "100"))
-        ref_expected = int(expected_total or 0)
-        reference_count = max(ref_expected, active_existing_count)
-        apply_lost = True
-
-        if reference_count >= min_reference_count:
-            if len(current_items) == 0:
-                apply_lost = False
-                print(
-                    f"Safety guard activated for {list_type}: scraped 0 while reference_count={reference_count}. "
-                    "Skipping lost marking for this run."
+                lost_since, rotation, stats["rolling"] = _rolling_segment(
+                    driver, db, network, target_id, list_type, run_started_at, collect,
+                    max_pages=int(os.getenv("SCRAPE_ROLLING_SEGMENT_PAGES", "200")),
                 )
-            else:
-                coverage = len(current_items) / float(reference_count)
-                if coverage < min_coverage_for_lost:
-                    apply_lost = False
-                    print(
-                        f"Safety guard activated for {list_type}: coverage={coverage:.3f} "
-                        f"(scraped={len(current_items)}, reference={reference_count}, threshold={min_coverage_for_lost}). "
-                        "Skipping lost marking for this run."
-                    )
+                mark_lost = lost_since is not None
 
-        # Mark items that are no longer present as lost (only when scrape coverage is trusted)
-        if apply_lost:
-            for username, entry in existing_items.items():
-                if username not in current_items and not entry.is_lost:
-                    entry.is_lost = True
-                    entry.lost_at = run_started_at
-                    entry.lost_at_run_at = run_started_at
-                    if entry.last_seen_run_at is None:
-                        entry.last_seen_run_at = run_started_at
-                    if entry.last_seen_run_at:
-                        entry.estimated_removed_at = _midpoint_dt(entry.last_seen_run_at, run_started_at)
-                    else:
-                        entry.estimated_removed_at = run_started_at
-            db.session.commit()
+        if collector == "observer":
+            try:
+                collector, usernames = _harvest(driver, collector)
+                collect(usernames)
+                driver.execute_script(_OBSERVER_TEARDOWN_SCRIPT)
+            except Exception as e:
+                print(f"Observer teardown failed: {e}")
+
+        if checkpoint_every > 0:
+            # The diff is only committed with the run; keep the tail safe until then.
+            db.save_checkpoint(run_id, list_type, unflushed, cursor=network.cursor if network else None)
+
+        print(f"Collected {len(current_items)} {list_type}")
+        scrape_calls = webdriver_call_count(driver) - calls_at_start
+        wait_latency = _latency_summary(pacer.samples)
+        stats.update({
+            "collector": collector,
+            "pacing": pacing,
+            "iterations": loop,
+            "collected": len(current_items),
+            "webdriver_calls": scrape_calls,
+            "wait_latency": wait_latency,
+            "early_exit": early_exit_saving,
+            "network_responses": network.responses if network else None,
+            "scrape_mode": (
+                "unchanged" if unchanged
+                else "incremental" if stopped_incremental
+                else "partial" if capped and len(current_items) < expected_count else "full"
+            ),
+            "seconds_saved": seconds_saved,
+        })
+        print(
+            f"Scroll wait latency for {list_type} (pacing={pacing}): "
+            f"n={wait_latency['count']} total={wait_latency['total']}s min={wait_latency['min']}s "
+            f"p50={wait_latency['p50']}s p95={wait_latency['p95']}s max={wait_latency['max']}s"
+        )
+        print(
+            f"WebDriver calls while scraping {list_type}: {scrape_calls} "
+            f"({scrape_calls / float(max(loop, 1)):.1f} per iteration, collector={collector})"
+        )
+
+        diff_engine = os.getenv("SCRAPE_DIFF_ENGINE", "sql").strip().lower()
+        persist = _persist_orm if diff_engine == "orm" else _persist_sql
+        if unchanged:
+            persist, diff_engine = _persist_unchanged, "unchanged"
+
+        def apply_diff():
+            persist_started = time.monotonic()
+            diff = persist(
+                db,
+                target_id=target_id,
+                list_type=list_type,
+                current_items=current_items,
+                run_started_at=run_started_at,
+                prev_run_started_at=prev_run_started_at,
+                expected_total=expected_total,
+                now_utc=now_utc,
+                mark_lost=mark_lost,
+                lost_since=lost_since,
+            )
+            diff["engine"] = diff_engine if diff_engine in ("orm", "unchanged") else "sql"
+            diff["seconds"] = round(time.monotonic() - persist_started, 3)
+            stats["diff"] = diff
+            print(
+                f"DB diff for {list_type} ({diff['engine']}): new={diff['new']} seen={diff['seen']} "
+                f"lost={diff['lost']} in {diff['seconds']}s"
+            )
+
+        db.write(apply_diff)
+        if rotation is not None:
+            db.save_rotation(target_id, list_type, *rotation)
 
         print(f"Successfully stored {len(current_items)} {list_type}")
         return current_items
@@ -287,4 +1173,12 @@ def store_followers(
         print(f"Error in store_followers: {str(e)}")
         import traceback
         traceback.print_exc()
+        if _driver_lost(driver):
+            # Chrome or ChromeDriver died: flush the harvest so the run can resume from it
+            stats["driver_lost"] = str(e)
+            if checkpoint_every > 0 and unflushed:
+                try:
+                    db.save_checkpoint(run_id, list_type, unflushed, cursor=network.cursor if network else None)
+                except Exception as flush_error:
+                    print(f"Could not checkpoint {list_type} after the browser died: {flush_error}")
         return set()
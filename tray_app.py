@@ -1,7 +1,6 @@
 import os
 import sys
 import time
-import sqlite3
 import threading
 import subprocess
 from datetime import datetime, timedelta, timezone
@@ -11,6 +10,8 @@ from dotenv import load_dotenv
 import pystray
 from PIL import Image, ImageDraw
 
+import db_connection
+
 
 if getattr(sys, "frozen", False):
     ROOT_DIR = Path(sys.executable).resolve().parent
@@ -363,7 +364,7 @@ def _read_last_run():
     if not DB_PATH.exists():
         return None
     try:
-        conn = sqlite3.connect(str(DB_PATH), timeout=1)
+        conn = db_connection.connect(DB_PATH, readonly=True, timeout=1)
         try:
             row = conn.execute(
                 "SELECT run_started_at, run_finished_at, status "
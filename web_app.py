@@ -8,7 +8,7 @@ import json
 import time
 from datetime import date, datetime, time as dt_time, timedelta, timezone, tzinfo
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 from urllib.parse import parse_qs
 from zoneinfo import ZoneInfo
 
@@ -19,6 +19,10 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 import pytz
 
+import db_connection
+from dashboard_queries import CHANGE_TIMES_SQL, CHANGE_TOTALS_SQL, DAY_CHANGES_SQL
+from phase_stats import average, ordered_phases, percentile
+
 
 ROOT_DIR = Path(__file__).resolve().parent
 WEB_DIR = ROOT_DIR / "web"
@@ -70,6 +74,15 @@ def _normalize_type(list_type: str) -> str:
     return value
 
 
+def _is_follower_values(list_type: str) -> Tuple[int, int]:
+    """Spell the type filter as `is_follower IN (?, ?)` so the time-range indexes are usable."""
+    if list_type == "followers":
+        return (1, 1)
+    if list_type == "followings":
+        return (0, 0)
+    return (1, 0)
+
+
 def _b64_encode(raw: bytes) -> str:
     return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
 
@@ -184,7 +197,7 @@ def _ensure_enabled():
 def _open_db() -> sqlite3.Connection:
     if not WEB_DB_PATH.exists():
         raise HTTPException(status_code=503, detail=f"Database not found: {WEB_DB_PATH}")
-    conn = sqlite3.connect(str(WEB_DB_PATH), timeout=2)
+    conn = db_connection.connect(WEB_DB_PATH, readonly=True, timeout=2)
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -383,43 +396,20 @@ def api_overview(
         ).fetchone()
 
         new_today = conn.execute(
-            """
-            SELECT
-              SUM(CASE WHEN ff.is_follower = 1 THEN 1 ELSE 0 END) AS new_today_followers,
-              SUM(CASE WHEN ff.is_follower = 0 THEN 1 ELSE 0 END) AS new_today_followings
-            FROM followers_followings ff
-            JOIN targets t ON t.id = ff.target_id
-            WHERE ff.first_seen_run_at IS NOT NULL
-              AND ff.first_seen_run_at >= ?
-              AND ff.first_seen_run_at <= ?
-              AND (? = '' OR t.username = ?)
-            """,
-            (start_utc, end_utc, target, target),
+            CHANGE_TOTALS_SQL["new"], (start_utc, end_utc, target, target, 1, 0)
         ).fetchone()
-
         lost_today = conn.execute(
-            """
-            SELECT
-              SUM(CASE WHEN ff.is_follower = 1 THEN 1 ELSE 0 END) AS lost_today_followers,
-              SUM(CASE WHEN ff.is_follower = 0 THEN 1 ELSE 0 END) AS lost_today_followings
-            FROM followers_followings ff
-            JOIN targets t ON t.id = ff.target_id
-            WHERE ff.lost_at_run_at IS NOT NULL
-              AND ff.lost_at_run_at >= ?
-              AND ff.lost_at_run_at <= ?
-              AND (? = '' OR t.username = ?)
-            """,
-            (start_utc, end_utc, target, target),
+            CHANGE_TOTALS_SQL["lost"], (start_utc, end_utc, target, target, 1, 0)
         ).fetchone()
 
     return {
         "target": target or None,
         "current_followers": int(current["current_followers"] or 0),
         "current_followings": int(current["current_followings"] or 0),
-        "new_today_followers": int(new_today["new_today_followers"] or 0),
-        "lost_today_followers": int(lost_today["lost_today_followers"] or 0),
-        "new_today_followings": int(new_today["new_today_followings"] or 0),
-        "lost_today_followings": int(lost_today["lost_today_followings"] or 0),
+        "new_today_followers": int(new_today["followers"] or 0),
+        "lost_today_followers": int(lost_today["followers"] or 0),
+        "new_today_followings": int(new_today["followings"] or 0),
+        "lost_today_followings": int(lost_today["followings"] or 0),
         "tz_used": str(tzinfo),
     }
 
@@ -436,6 +426,7 @@ def api_daily(
     tzinfo = _resolve_tz(tz)
     target = target.strip()
     list_type = _normalize_type(type)
+    follower_values = _is_follower_values(list_type)
 
     end_local_day = datetime.now(tzinfo).date()
     start_local_day = end_local_day - timedelta(days=days - 1)
@@ -443,40 +434,9 @@ def api_daily(
     _, end_utc = _day_bounds_utc_naive(end_local_day, tzinfo)
 
     with _open_db() as conn:
-        new_rows = conn.execute(
-            """
-            SELECT ff.first_seen_run_at, ff.is_follower
-            FROM followers_followings ff
-            JOIN targets t ON t.id = ff.target_id
-            WHERE ff.first_seen_run_at IS NOT NULL
-              AND ff.first_seen_run_at >= ?
-              AND ff.first_seen_run_at <= ?
-              AND (? = '' OR t.username = ?)
-              AND (
-                ? = 'both'
-                OR (? = 'followers' AND ff.is_follower = 1)
-                OR (? = 'followings' AND ff.is_follower = 0)
-              )
-            """,
-            (start_utc, end_utc, target, target, list_type, list_type, list_type),
-        ).fetchall()
-        lost_rows = conn.execute(
-            """
-            SELECT ff.lost_at_run_at, ff.is_follower
-            FROM followers_followings ff
-            JOIN targets t ON t.id = ff.target_id
-            WHERE ff.lost_at_run_at IS NOT NULL
-              AND ff.lost_at_run_at >= ?
-              AND ff.lost_at_run_at <= ?
-              AND (? = '' OR t.username = ?)
-              AND (
-                ? = 'both'
-                OR (? = 'followers' AND ff.is_follower = 1)
-                OR (? = 'followings' AND ff.is_follower = 0)
-              )
-            """,
-            (start_utc, end_utc, target, target, list_type, list_type, list_type),
-        ).fetchall()
+        params = (start_utc, end_utc, target, target, *follower_values)
+        new_rows = conn.execute(CHANGE_TIMES_SQL["new"], params).fetchall()
+        lost_rows = conn.execute(CHANGE_TIMES_SQL["lost"], params).fetchall()
 
     buckets = {}
     cursor_day = start_local_day
@@ -539,54 +499,14 @@ def api_day(
     tzinfo = _resolve_tz(tz)
     target = target.strip()
     list_type = _normalize_type(type)
+    follower_values = _is_follower_values(list_type)
     day_value = _ensure_iso_date(date)
     start_utc, end_utc = _day_bounds_utc_naive(day_value, tzinfo)
 
     with _open_db() as conn:
-        new_rows = conn.execute(
-            """
-            SELECT
-              t.username AS target_username,
-              ff.follower_following_username,
-              ff.is_follower,
-              ff.first_seen_run_at AS ts
-            FROM followers_followings ff
-            JOIN targets t ON t.id = ff.target_id
-            WHERE ff.first_seen_run_at IS NOT NULL
-              AND ff.first_seen_run_at >= ?
-              AND ff.first_seen_run_at <= ?
-              AND (? = '' OR t.username = ?)
-              AND (
-                ? = 'both'
-                OR (? = 'followers' AND ff.is_follower = 1)
-                OR (? = 'followings' AND ff.is_follower = 0)
-              )
-            ORDER BY ff.first_seen_run_at ASC, ff.follower_following_username ASC
-            """,
-            (start_utc, end_utc, target, target, list_type, list_type, list_type),
-        ).fetchall()
-        lost_rows = conn.execute(
-            """
-            SELECT
-              t.username AS target_username,
-              ff.follower_following_username,
-              ff.is_follower,
-              ff.lost_at_run_at AS ts
-            FROM followers_followings ff
-            JOIN targets t ON t.id = ff.target_id
-            WHERE ff.lost_at_run_at IS NOT NULL
-              AND ff.lost_at_run_at >= ?
-              AND ff.lost_at_run_at <= ?
-              AND (? = '' OR t.username = ?)
-              AND (
-                ? = 'both'
-                OR (? = 'followers' AND ff.is_follower = 1)
-                OR (? = 'followings' AND ff.is_follower = 0)
-              )
-            ORDER BY ff.lost_at_run_at ASC, ff.follower_following_username ASC
-            """,
-            (start_utc, end_utc, target, target, list_type, list_type, list_type),
-        ).fetchall()
+        params = (start_utc, end_utc, target, target, *follower_values)
+        new_rows = conn.execute(DAY_CHANGES_SQL["new"], params).fetchall()
+        lost_rows = conn.execute(DAY_CHANGES_SQL["lost"], params).fetchall()
 
     def _shape(rows):
         payload = []
@@ -671,6 +591,78 @@ def api_current(
     }
 
 
+def _phase_summary(durations: List[float]) -> dict:
+    ordered = sorted(durations)
+    return {
+        "runs": len(ordered),
+        "p50_seconds": round(percentile(ordered, 0.5), 3),
+        "p95_seconds": round(percentile(ordered, 0.95), 3),
+        "max_seconds": round(ordered[-1], 3),
+    }
+
+
+@app.get("/api/v1/phases")
+def api_phases(
+    days: int = Query(default=30, ge=1, le=365),
+    target: str = Query(default=""),
+    tz: Optional[str] = Query(default=None),
+    _enabled: None = Depends(_ensure_enabled),
+    _user: str = Depends(_require_api_user),
+):
+    tzinfo = _resolve_tz(tz)
+    target = target.strip()
+    end_local_day = datetime.now(tzinfo).date()
+    start_utc, _ = _day_bounds_utc_naive(end_local_day - timedelta(days=days - 1), tzinfo)
+
+    with _open_db() as conn:
+        has_table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'run_phases'"
+        ).fetchone()
+        rows = []
+        if has_table:
+            rows = conn.execute(
+                """
+                SELECT p.phase, p.duration_seconds, p.iterations, p.rows, p.webdriver_calls, r.run_started_at
+                FROM run_phases p
+                JOIN run_history r ON r.id = p.run_id
+                WHERE r.run_started_at >= ?
+                  AND r.target_id IN (SELECT id FROM targets WHERE ? = '' OR username = ?)
+                """,
+                (start_utc, target, target),
+            ).fetchall()
+
+    by_phase = {}
+    by_day = {}
+    for row in rows:
+        by_phase.setdefault(row["phase"], []).append(row)
+        day_key = _to_tz_day(row["run_started_at"], tzinfo)
+        by_day.setdefault((day_key, row["phase"]), []).append(row["duration_seconds"])
+
+    phases = []
+    for name in ordered_phases(by_phase):
+        phase_rows = by_phase[name]
+        phases.append({
+            "phase": name,
+            **_phase_summary([row["duration_seconds"] for row in phase_rows]),
+            "avg_iterations": average(row["iterations"] for row in phase_rows),
+            "avg_rows": average(row["rows"] for row in phase_rows),
+            "avg_webdriver_calls": average(row["webdriver_calls"] for row in phase_rows),
+        })
+
+    daily = [
+        {"day": day_key, "phase": name, **_phase_summary(durations)}
+        for (day_key, name), durations in sorted(by_day.items(), key=lambda item: (item[0][0] or "", item[0][1]))
+    ]
+
+    return {
+        "target": target or None,
+        "days": days,
+        "phases": phases,
+        "daily": daily,
+        "tz_used": str(tzinfo),
+    }
+
+
 @app.exception_handler(HTTPException)
 def http_exception_handler(_request: Request, exc: HTTPException):
     return JSONResponse(